@@ -1,79 +1,55 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
 
-# Функция для вычисления электрического поля от точечного заряда
-def electric_field(q, r0, x, y):
-    """
-    Вычисляет компоненты электрического поля (Ex, Ey) в точке (x, y)
-    от точечного заряда q, расположенного в r0 (x0, y0).
-
-    Параметры:
-    - q: величина заряда
-    - r0: координаты заряда (x0, y0)
-    - x, y: координаты расчетной точки
+from physicitmo import validation
+from physicitmo.electrostatics import SOLVERS, charge_grid, charges_to_arrays, compute_field, default_cache
 
-    Возвращает:
-    - Ex, Ey: компоненты электрического поля
-    """
-    rx = x - r0[0]
-    ry = y - r0[1]
-    r = np.sqrt(rx ** 2 + ry ** 2)
-    r3 = r ** 3 + 1e-12  # добавляем малую величину, чтобы избежать деления на 0
-    Ex = q * rx / r3
-    Ey = q * ry / r3
-    return Ex, Ey
+# Входные данные сценария: (имя, приглашение, проверка); с клавиатуры заряды вводятся get_user_input
+PARAMETERS = [("charges", None, validation.charges)]
 
 
 # Функция для получения и валидации пользовательского ввода
 def get_user_input():
     charges = []
-    try:
-        n = int(input("Введите количество зарядов: "))
-        if n <= 0:
-            raise ValueError("Количество зарядов должно быть больше нуля.")
-
-        for i in range(n):
-            print(f"Заряд {i + 1}:")
-            q = float(input("  Величина заряда (в Кл): "))
-            x = float(input("  Координата X: "))
-            y = float(input("  Координата Y: "))
-            charges.append((q, (x, y)))
-    except ValueError as e:
-        print(f"Ошибка ввода: {e}. Попробуйте снова.")
-        return get_user_input()
+    n = validation.ask("Введите количество зарядов: ", validation.charge_count)
 
-    return charges
+    for i in range(n):
+        print(f"Заряд {i + 1}:")
+        q = validation.ask("  Величина заряда (в Кл): ")
+        x = validation.ask("  Координата X: ")
+        y = validation.ask("  Координата Y: ")
+        charges.append((q, (x, y)))
 
+    return charges
 
-# Основная программа
-def main():
-    print("Программа визуализации электростатического поля точечных зарядов.")
-    charges = get_user_input()
-
-    # Определяем границы области на основе зарядов
-    x_coords = [pos[0] for _, pos in charges]
-    y_coords = [pos[1] for _, pos in charges]
-
-    x_min, x_max = min(x_coords) - 5, max(x_coords) + 5  # Добавляем отступы по X
-    y_min, y_max = min(y_coords) - 5, max(y_coords) + 5  # Добавляем отступы по Y
 
-    # Генерация сетки для расчетов
-    x = np.linspace(x_min, x_max, 200)
-    y = np.linspace(y_min, y_max, 200)
-    X, Y = np.meshgrid(x, y)
+# Расчет поля и построение линий напряженности
+# resolution: число узлов сетки по каждой оси
+# solver: метод расчета поля ("direct", "parallel" для очень подробных сеток, "tree", "mesh")
+def draw_field(charges, solver="direct", resolution=200):
+    """
+    Возвращает:
+    - results: границы сетки и наибольший модуль напряженности на ней
+    - fig: линии напряженности и заряды
+    """
+    # Генерация сетки для расчетов с отступами вокруг зарядов
+    q, cx, cy = charges_to_arrays(charges)
+    X, Y = charge_grid(cx, cy, resolution=resolution)
 
-    # Инициализация полей
-    Ex, Ey = np.zeros(X.shape), np.zeros(Y.shape)
+    # Поле всех зарядов за один проход (повторные конфигурации берутся из кэша)
+    Ex, Ey, _ = compute_field(q, cx, cy, X, Y, solver=solver, cache=default_cache())
 
-    # Суммируем вклад каждого заряда
-    for q, pos in charges:
-        ex, ey = electric_field(q, pos, X, Y)
-        Ex += ex
-        Ey += ey
+    E = np.hypot(Ex, Ey)
+    results = {"bounds": [float(X.min()), float(X.max()), float(Y.min()), float(Y.max())],
+               "max_field": float(E[np.isfinite(E)].max())}
 
     # Визуализация
-    plt.figure(figsize=(12, 8))  # Увеличен размер графика для удобства
+    fig = plt.figure(figsize=(12, 8))  # Увеличен размер графика для удобства
     plt.streamplot(X, Y, Ex, Ey, color='black', linewidth=1)
 
     # Добавляем заряды на график с фиксированным размером маркера
@@ -95,6 +71,24 @@ def main():
     plt.axvline(0, color='black', linewidth=0.5)
     plt.grid(color='gray', linestyle='--', linewidth=0.5)
     plt.tight_layout()  # Чтобы элементы не перекрывались
+    return results, fig
+
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios):
+# charges - список зарядов {q, x, y}
+def scenario(params):
+    checked = validation.validate_params(PARAMETERS, params, optional=[
+        ("solver", validation.choice(*SOLVERS), "direct"),
+        ("resolution", validation.positive_integer, 200),
+    ])
+    results, fig = draw_field(**checked)
+    return results, [fig]
+
+
+# Основная программа
+def main(solver="direct", resolution=200):
+    print("Программа визуализации электростатического поля точечных зарядов.")
+    draw_field(get_user_input(), solver, resolution)
     plt.show()
 
 
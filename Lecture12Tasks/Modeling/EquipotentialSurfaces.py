@@ -1,110 +1,79 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
 
-# Функция для вычисления электрического поля от точечного заряда
-def electric_field(q, r0, x, y):
-    """
-    Вычисляет компоненты электрического поля (Ex, Ey) в точке (x, y)
-    от точечного заряда q, расположенного в r0 (x0, y0).
-
-    Параметры:
-    - q: величина заряда
-    - r0: координаты заряда (x0, y0)
-    - x, y: координаты расчетной точки
-
-    Возвращает:
-    - Ex, Ey: компоненты электрического поля
-    """
-    rx = x - r0[0]
-    ry = y - r0[1]
-    r = np.sqrt(rx ** 2 + ry ** 2)
-    r3 = r ** 3 + 1e-12  # добавляем малую величину, чтобы избежать деления на 0
-    Ex = q * rx / r3
-    Ey = q * ry / r3
-    return Ex, Ey
+from physicitmo import validation
+from physicitmo.electrostatics import (
+    SOLVERS,
+    charge_grid,
+    charges_to_arrays,
+    compute_field,
+    default_cache,
+    equipotential_lines,
+    polylines,
+    trace_field_lines,
+)
 
-
-# Функция для вычисления потенциала от точечного заряда
-def electric_potential(q, r0, x, y):
-    """
-    Вычисляет электрический потенциал в точке (x, y)
-    от точечного заряда q, расположенного в r0 (x0, y0).
-
-    Параметры:
-    - q: величина заряда
-    - r0: координаты заряда (x0, y0)
-    - x, y: координаты расчетной точки
-
-    Возвращает:
-    - V: значение потенциала
-    """
-    rx = x - r0[0]
-    ry = y - r0[1]
-    r = np.sqrt(rx ** 2 + ry ** 2)
-    r = np.maximum(r, 1e-12)  # избегаем деления на 0
-    V = q / r
-    return V
+# Входные данные сценария: (имя, приглашение, проверка); с клавиатуры заряды вводятся get_user_input
+PARAMETERS = [("charges", None, validation.charges)]
 
 
 # Функция для получения и валидации пользовательского ввода
 def get_user_input():
     charges = []
-    try:
-        n = int(input("Введите количество зарядов: "))
-        if n <= 0:
-            raise ValueError("Количество зарядов должно быть больше нуля.")
-
-        for i in range(n):
-            print(f"Заряд {i + 1}:")
-            q = float(input("  Величина заряда (в Кл): "))
-            x = float(input("  Координата X: "))
-            y = float(input("  Координата Y: "))
-            charges.append((q, (x, y)))
-    except ValueError as e:
-        print(f"Ошибка ввода: {e}. Попробуйте снова.")
-        return get_user_input()
-
-    return charges
+    n = validation.ask("Введите количество зарядов: ", validation.charge_count)
 
+    for i in range(n):
+        print(f"Заряд {i + 1}:")
+        q = validation.ask("  Величина заряда (в Кл): ")
+        x = validation.ask("  Координата X: ")
+        y = validation.ask("  Координата Y: ")
+        charges.append((q, (x, y)))
 
-# Основная программа
-def main():
-    print("Программа визуализации электростатического поля точечных зарядов.")
-    charges = get_user_input()
-
-    # Определяем границы области на основе зарядов
-    x_coords = [pos[0] for _, pos in charges]
-    y_coords = [pos[1] for _, pos in charges]
-
-    x_min, x_max = min(x_coords) - 5, max(x_coords) + 5  # Добавляем отступы по X
-    y_min, y_max = min(y_coords) - 5, max(y_coords) + 5  # Добавляем отступы по Y
+    return charges
 
-    # Генерация сетки для расчетов
-    x = np.linspace(x_min, x_max, 200)
-    y = np.linspace(y_min, y_max, 200)
-    X, Y = np.meshgrid(x, y)
 
-    # Инициализация полей
-    Ex, Ey = np.zeros(X.shape), np.zeros(Y.shape)
-    V = np.zeros(X.shape)
+# Расчет потенциала и построение эквипотенциальных поверхностей и линий напряженности
+# resolution: число узлов сетки по каждой оси
+# solver: метод расчета поля ("direct", "parallel" для очень подробных сеток, "tree",
+# "mesh" для плотных облаков зарядов, "adaptive")
+def draw_equipotentials(charges, solver="direct", resolution=200):
+    """
+    Возвращает:
+    - results: границы сетки, наименьший и наибольший потенциал на ней,
+      число линий напряженности
+    - fig: эквипотенциальные поверхности, линии напряженности и заряды
+    """
+    # Генерация сетки для расчетов с отступами вокруг зарядов
+    q, cx, cy = charges_to_arrays(charges)
+    X, Y = charge_grid(cx, cy, resolution=resolution)
 
-    # Суммируем вклад каждого заряда
-    for q, pos in charges:
-        ex, ey = electric_field(q, pos, X, Y)
-        Ex += ex
-        Ey += ey
-        V += electric_potential(q, pos, X, Y)
+    # Поле и потенциал всех зарядов за один проход (повторные конфигурации берутся из кэша)
+    Ex, Ey, V = compute_field(q, cx, cy, X, Y, solver=solver, cache=default_cache())
 
     # Визуализация
-    plt.figure(figsize=(12, 8))  # Увеличен размер графика для удобства
+    fig = plt.figure(figsize=(12, 8))  # Увеличен размер графика для удобства
 
     # Визуализация эквипотенциальных поверхностей
     levels = np.linspace(V.min(), V.max(), 50)  # Уровни потенциала
-    plt.contour(X, Y, V, levels=levels, cmap='coolwarm', alpha=0.75)
+    segments, segment_levels = equipotential_lines(X, Y, V, levels)
+    contours = LineCollection(segments, array=segment_levels, cmap='coolwarm', alpha=0.75)
+    contours.set_clim(levels[0], levels[-1])
+    plt.gca().add_collection(contours)
 
     # Визуализация линий напряженности
-    plt.streamplot(X, Y, Ex, Ey, color='black', linewidth=1)
+    bounds = (X.min(), X.max(), Y.min(), Y.max())
+    vertices, offsets = trace_field_lines(q, cx, cy, bounds, grid=(X, Y, Ex, Ey))  # поле - с уже рассчитанной сетки
+    plt.gca().add_collection(LineCollection(polylines(vertices, offsets), colors='black', linewidths=1))
+    plt.xlim(bounds[0], bounds[1])
+    plt.ylim(bounds[2], bounds[3])
+    results = {"bounds": [float(b) for b in bounds], "v_min": float(V.min()), "v_max": float(V.max()),
+               "field_lines": len(offsets) - 1}
 
     # Добавляем заряды на график
     for q, pos in charges:
@@ -125,6 +94,24 @@ def main():
     plt.axvline(0, color='black', linewidth=0.5)
     plt.grid(color='gray', linestyle='--', linewidth=0.5)
     plt.tight_layout()  # Чтобы элементы не перекрывались
+    return results, fig
+
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios):
+# charges - список зарядов {q, x, y}
+def scenario(params):
+    checked = validation.validate_params(PARAMETERS, params, optional=[
+        ("solver", validation.choice(*SOLVERS), "direct"),
+        ("resolution", validation.positive_integer, 200),
+    ])
+    results, fig = draw_equipotentials(**checked)
+    return results, [fig]
+
+
+# Основная программа
+def main(solver="direct", resolution=200):
+    print("Программа визуализации электростатического поля точечных зарядов.")
+    draw_equipotentials(get_user_input(), solver, resolution)
     plt.show()
 
 
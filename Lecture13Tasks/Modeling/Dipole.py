@@ -1,115 +1,94 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
+
+from physicitmo import validation
+from physicitmo.electrostatics import (
+    charge_grid,
+    charges_to_arrays,
+    compute_field,
+    default_cache,
+    dipole_force_and_torque,
+    equipotential_lines,
+    polylines,
+    trace_field_lines,
+)
+
+# Параметры диполя: (имя, приглашение, проверка) - общие для ввода с клавиатуры и сценариев
+DIPOLE_PARAMETERS = [
+    ("p", "  Модуль дипольного момента p (Кл*м): ", validation.number),
+    ("theta", "  Угол theta (в градусах): ", validation.number),
+    ("x_dipole", "  Координата X диполя: ", validation.number),
+    ("y_dipole", "  Координата Y диполя: ", validation.number),
+]
+# Входные данные сценария; с клавиатуры заряды вводятся get_user_input
+PARAMETERS = [("charges", None, validation.charges)] + DIPOLE_PARAMETERS
 
-# Функция для вычисления электрического поля от точечного заряда
-def electric_field(q, r0, x, y):
-    rx = x - r0[0]
-    ry = y - r0[1]
-    r = np.sqrt(rx ** 2 + ry ** 2)
-    r3 = r ** 3 + 1e-12  # добавляем малую величину, чтобы избежать деления на 0
-    Ex = q * rx / r3
-    Ey = q * ry / r3
-    return Ex, Ey
-
-# Функция для вычисления потенциала от точечного заряда
-def electric_potential(q, r0, x, y):
-    rx = x - r0[0]
-    ry = y - r0[1]
-    r = np.sqrt(rx ** 2 + ry ** 2)
-    r = np.maximum(r, 1e-12)  # избегаем деления на 0
-    V = q / r
-    return V
-
-# Функция для расчета силы и момента силы, действующих на диполь
-def dipole_force_and_torque(p, theta, x_dipole, y_dipole, Ex, Ey):
-    E_dipole_x = np.interp(x_dipole, Ex[0, :], Ex[:, 0])
-    E_dipole_y = np.interp(y_dipole, Ey[:, 0], Ey[0, :])
-
-    force_x = p * np.cos(theta) * E_dipole_x
-    force_y = p * np.sin(theta) * E_dipole_y
-    force_magnitude = np.sqrt(force_x**2 + force_y**2)
-
-    torque = p * (E_dipole_y * np.cos(theta) - E_dipole_x * np.sin(theta))
-
-    return force_x, force_y, force_magnitude, torque
 
 # Функция для получения и валидации пользовательского ввода
 def get_user_input():
     charges = []
-    try:
-        n = int(input("Введите количество зарядов: "))
-        if n <= 0:
-            raise ValueError("Количество зарядов должно быть больше нуля.")
-
-        for i in range(n):
-            print(f"Заряд {i + 1}:")
-            q = float(input("  Величина заряда (в Кл): "))
-            x = float(input("  Координата X: "))
-            y = float(input("  Координата Y: "))
-            charges.append((q, (x, y)))
-    except ValueError as e:
-        print(f"Ошибка ввода: {e}. Попробуйте снова.")
-        return get_user_input()
+    n = validation.ask("Введите количество зарядов: ", validation.charge_count)
+
+    for i in range(n):
+        print(f"Заряд {i + 1}:")
+        q = validation.ask("  Величина заряда (в Кл): ")
+        x = validation.ask("  Координата X: ")
+        y = validation.ask("  Координата Y: ")
+        charges.append((q, (x, y)))
 
     # Ввод диполя
     print("Введите параметры диполя:")
-    try:
-        p = float(input("  Модуль дипольного момента p (Кл*м): "))
-        theta = float(input("  Угол theta (в градусах): "))
-        theta = np.radians(theta)  # Преобразование угла в радианы
-        x_dipole = float(input("  Координата X диполя: "))
-        y_dipole = float(input("  Координата Y диполя: "))
-    except ValueError as e:
-        print(f"Ошибка ввода: {e}. Попробуйте снова.")
-        return get_user_input()
-
-    return charges, (p, theta, (x_dipole, y_dipole))
-
-# Основная программа
-def main():
-    print("Программа визуализации электростатического поля точечных зарядов и диполя.")
-    charges, dipole = get_user_input()
-
-    # Определяем границы области на основе зарядов
-    x_coords = [pos[0] for _, pos in charges]
-    y_coords = [pos[1] for _, pos in charges]
+    dipole = validation.ask_params(DIPOLE_PARAMETERS)
 
-    x_min, x_max = min(x_coords) - 5, max(x_coords) + 5  # Добавляем отступы по X
-    y_min, y_max = min(y_coords) - 5, max(y_coords) + 5  # Добавляем отступы по Y
+    return charges, dipole_tuple(**dipole)
 
-    # Генерация сетки для расчетов
-    x = np.linspace(x_min, x_max, 200)
-    y = np.linspace(y_min, y_max, 200)
-    X, Y = np.meshgrid(x, y)
+# Диполь (p, theta в радианах, (x, y)) из параметров с углом в градусах
+def dipole_tuple(p, theta, x_dipole, y_dipole):
+    return p, np.radians(theta), (x_dipole, y_dipole)
 
-    # Инициализация полей
-    Ex, Ey = np.zeros(X.shape), np.zeros(Y.shape)
-    V = np.zeros(X.shape)
+# Расчет силы и момента, действующих на диполь, и построение поля
+def draw_dipole(charges, dipole):
+    """
+    Возвращает:
+    - results: проекции и модуль силы (Н) и момент силы (Н·м), действующие на диполь
+    - fig: эквипотенциальные поверхности, линии напряженности, заряды и диполь
+    """
+    # Генерация сетки для расчетов с отступами вокруг зарядов
+    q, cx, cy = charges_to_arrays(charges)
+    X, Y = charge_grid(cx, cy)
 
-    # Суммируем вклад каждого заряда
-    for q, pos in charges:
-        ex, ey = electric_field(q, pos, X, Y)
-        Ex += ex
-        Ey += ey
-        V += electric_potential(q, pos, X, Y)
+    # Поле и потенциал всех зарядов за один проход (повторные конфигурации берутся из кэша)
+    Ex, Ey, V = compute_field(q, cx, cy, X, Y, cache=default_cache())
 
-    # Расчет сил и момента для диполя
+    # Расчет сил и момента для диполя точно в его положении (без сетки)
     p, theta, (x_dipole, y_dipole) = dipole
-    force_x, force_y, force_magnitude, torque = dipole_force_and_torque(p, theta, x_dipole, y_dipole, Ex, Ey)
+    force_x, force_y, force_magnitude, torque = dipole_force_and_torque(p, theta, x_dipole, y_dipole, q, cx, cy)
 
-    print(f"Сила, действующая на диполь: Fx = {force_x:.2e} Н, Fy = {force_y:.2e} Н")
-    print(f"Модуль силы: {force_magnitude:.2e} Н")
-    print(f"Момент силы, действующий на диполь: {torque:.2e} Н·м")
+    results = {"force_x": float(force_x), "force_y": float(force_y), "force": float(force_magnitude),
+               "torque": float(torque)}
 
     # Визуализация
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
 
     # Визуализация эквипотенциальных поверхностей
-    levels = np.linspace(V.min(), V.max(), 50)
-    plt.contour(X, Y, V, levels=levels, cmap='coolwarm', alpha=0.75)
+    levels = np.linspace(V.min(), V.max(), 50)  # Уровни потенциала
+    segments, segment_levels = equipotential_lines(X, Y, V, levels)
+    contours = LineCollection(segments, array=segment_levels, cmap='coolwarm', alpha=0.75)
+    contours.set_clim(levels[0], levels[-1])
+    plt.gca().add_collection(contours)
 
     # Визуализация линий напряженности
-    plt.streamplot(X, Y, Ex, Ey, color='black', linewidth=1)
+    bounds = (X.min(), X.max(), Y.min(), Y.max())
+    vertices, offsets = trace_field_lines(q, cx, cy, bounds, grid=(X, Y, Ex, Ey))  # поле - с уже рассчитанной сетки
+    plt.gca().add_collection(LineCollection(polylines(vertices, offsets), colors='black', linewidths=1))
+    plt.xlim(bounds[0], bounds[1])
+    plt.ylim(bounds[2], bounds[3])
 
     # Добавляем заряды на график
     for q, pos in charges:
@@ -135,6 +114,24 @@ def main():
     plt.axvline(0, color='black', linewidth=0.5)
     plt.grid(color='gray', linestyle='--', linewidth=0.5)
     plt.tight_layout()  # Чтобы элементы не перекрывались
+    return results, fig
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios):
+# charges - список зарядов {q, x, y}, p, theta (градусы), x_dipole, y_dipole
+def scenario(params):
+    checked = validation.validate_params(PARAMETERS, params)
+    charges = checked.pop("charges")
+    results, fig = draw_dipole(charges, dipole_tuple(**checked))
+    return results, [fig]
+
+# Основная программа
+def main():
+    print("Программа визуализации электростатического поля точечных зарядов и диполя.")
+    results, _ = draw_dipole(*get_user_input())
+
+    print(f"Сила, действующая на диполь: Fx = {results['force_x']:.2e} Н, Fy = {results['force_y']:.2e} Н")
+    print(f"Модуль силы: {results['force']:.2e} Н")
+    print(f"Момент силы, действующий на диполь: {results['torque']:.2e} Н·м")
     plt.show()
 
 if __name__ == "__main__":
@@ -1,5 +1,19 @@
 import math
-import keyboard
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
+from physicitmo import validation
+
+# Входные данные для каждой системы координат: (имя, приглашение, проверка) -
+# общие для ввода с клавиатуры и сценариев
+PRECISION = ("precision", "Введите точность (количество знаков после запятой): ", validation.integer)
+PARAMETERS = {
+    "cartesian": [("x", "Введите координату X: ", validation.number),
+                  ("y", "Введите координату Y: ", validation.number), PRECISION],
+    "polar": [("r", "Введите радиус r: ", validation.number),
+              ("theta", "Введите угол theta (в радианах): ", validation.number), PRECISION],
+}
 
 def cartesian_to_polar(x, y, precision):
     r = round(math.sqrt(x ** 2 + y ** 2), precision)
@@ -13,34 +27,50 @@ def polar_to_cartesian(r, theta, precision):
 
     return x, y
 
+# Преобразование в другую систему координат: словарь с результатом
+def convert(system, params):
+    if system == "cartesian":
+        r, theta = cartesian_to_polar(**params)
+        return {"r": r, "theta": theta}
+    x, y = polar_to_cartesian(**params)
+    return {"x": x, "y": y}
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios): system и координаты
+def scenario(params):
+    params = dict(params)
+    try:
+        system = validation.choice(*PARAMETERS)(params.pop("system", None))
+    except ValueError as e:
+        raise ValueError(f"system: {e}") from None
+    return convert(system, validation.validate_params(PARAMETERS[system], params)), []
+
 def main():
     system = input("Введите тип системы координат для преобразования (cartesian/polar): ").strip().lower()
 
     if system == "cartesian":
-        x = float(input("Введите координату X: "))
-        y = float(input("Введите координату Y: "))
-        precision = int(input("Введите точность (количество знаков после запятой): "))
+        result = convert(system, validation.ask_params(PARAMETERS[system]))
 
-        r, theta = cartesian_to_polar(x, y, precision)
-
-        print(f"Полярные координаты: r = {r}, theta = {theta} (в радианах)")
+        print(f"Полярные координаты: r = {result['r']}, theta = {result['theta']} (в радианах)")
 
     elif system == "polar":
-        r = float(input("Введите радиус r: "))
-        theta = float(input("Введите угол theta (в радианах): "))
-        precision = int(input("Введите точность (количество знаков после запятой): "))
-
-        x, y = polar_to_cartesian(r, theta, precision)
+        result = convert(system, validation.ask_params(PARAMETERS[system]))
 
-        print(f"Декартовы координаты: x = {x}, y = {y}")
+        print(f"Декартовы координаты: x = {result['x']}, y = {result['y']}")
 
     else:
         print("Неверный ввод системы координат.")
 
-    print("Для выхода из программы нажмите enter")
-    while True:
-        if keyboard.is_pressed("enter"):
-            break
+    input("Для выхода из программы нажмите enter")
+
+# Преобразование файла точек: python CartesianOrPolar.py <исходный файл> <файл результата> [cartesian|polar]
+def main_file(src, dst, system="cartesian"):
+    from physicitmo.coordinates import convert_file  # numpy нужен только для файлов
+
+    n = convert_file(src, dst, source=system)
+    print(f"Преобразовано точек: {n}")
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 2:
+        main_file(*sys.argv[1:4])
+    else:
+        main()
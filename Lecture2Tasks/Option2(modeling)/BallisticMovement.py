@@ -1,6 +1,30 @@
+import sys
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-import keyboard
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
+from physicitmo import validation
+from physicitmo.ballistics import METRICS, launch_metrics, monte_carlo, normal_launches
+
+# Входные данные: (имя, приглашение, проверка) - общие для ввода с клавиатуры и сценариев
+PARAMETERS = [
+    ("h0", "Введите высоту (м): ", validation.number),
+    ("v0", "Введите начальную скорость (м/с): ", validation.number),
+    ("angle", "Введите угол броска (градусы): ", validation.number),
+]
+MONTE_CARLO_PARAMETERS = [
+    ("h0", "Введите среднюю высоту (м): ", validation.number),
+    ("sigma_h0", "Введите разброс высоты (м): ", validation.non_negative),
+    ("v0", "Введите среднюю начальную скорость (м/с): ", validation.number),
+    ("sigma_v0", "Введите разброс начальной скорости (м/с): ", validation.non_negative),
+    ("angle", "Введите средний угол броска (градусы): ", validation.number),
+    ("sigma_angle", "Введите разброс угла броска (градусы): ", validation.non_negative),
+    ("n", "Введите число бросков: ", validation.positive_integer),
+]
+
+TITLES = {"range": "Дальность полета (м)", "flight_time": "Время полета (с)",
+          "apex": "Наибольшая высота (м)", "impact_speed": "Скорость падения (м/с)"}
 
 g = 9.81  # ускорение свободного падения, м/с^2
 
@@ -20,7 +44,9 @@ def calculate_trajectory(h0, v0, angle_deg):
 
 
 def plot_results(t, x, y, vx, vy):
-    plt.figure(figsize=(12, 8))
+    import matplotlib.pyplot as plt  # графика загружается только при построении графиков
+
+    fig = plt.figure(figsize=(12, 8))
 
     # Траектория движения
     plt.subplot(2, 2, 1)
@@ -56,25 +82,84 @@ def plot_results(t, x, y, vx, vy):
     plt.grid(True)
 
     plt.tight_layout()
-    plt.show()
+    return fig
+
+
+# Разброс характеристик броска: статистика и гистограммы monte_carlo
+def simulate_monte_carlo(h0, sigma_h0, v0, sigma_v0, angle, sigma_angle, n):
+    """
+    Возвращает:
+    - results: для каждой характеристики из METRICS среднее, ст. откл. и
+      процентили 5, 50, 95, а также число бросков, не долетевших до земли
+    - fig: гистограммы характеристик
+    """
+    import matplotlib.pyplot as plt
+
+    stats = monte_carlo(normal_launches(h0, v0, angle, sigma_h0, sigma_v0, sigma_angle), n)
+
+    results = {"invalid": stats["range"].invalid}
+    fig = plt.figure(figsize=(12, 8))
+    for number, name in enumerate(METRICS, start=1):
+        hist = stats[name]
+        p5, p50, p95 = hist.percentile([5, 50, 95])
+        results[name] = {"mean": hist.mean, "std": hist.std, "p5": float(p5), "p50": float(p50),
+                         "p95": float(p95)}
+        plt.subplot(2, 2, number)
+        plt.stairs(hist.counts, hist.edges, fill=True)
+        plt.xlim(hist.min, hist.max)
+        plt.title(TITLES[name])
+        plt.grid(True)
+
+    plt.tight_layout()
+    return results, fig
+
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios): траектория
+# и характеристики броска, при заданном n - еще и разброс методом Монте-Карло
+def scenario(params):
+    names = {name for name, _, _ in PARAMETERS}
+    checked = validation.validate_params(PARAMETERS, params, optional=[
+        (name, check, 0) for name, _, check in MONTE_CARLO_PARAMETERS if name not in names])
+    h0, v0, angle = checked["h0"], checked["v0"], checked["angle"]
+    results = {name: float(value) for name, value in launch_metrics(h0, v0, angle).items()}
+    figures = [plot_results(*calculate_trajectory(h0, v0, angle))]
+    if checked["n"]:
+        results["monte_carlo"], fig = simulate_monte_carlo(**checked)
+        figures.append(fig)
+    return results, figures
 
 
 def main():
+    import matplotlib.pyplot as plt
+
     # Входные данные
-    h0 = float(input("Введите высоту (м): "))
-    v0 = float(input("Введите начальную скорость (м/с): "))
-    angle_deg = float(input("Введите угол броска (градусы): "))
+    params = validation.ask_params(PARAMETERS)
 
     # Рассчитать траекторию
-    t, x, y, vx, vy = calculate_trajectory(h0, v0, angle_deg)
+    t, x, y, vx, vy = calculate_trajectory(params["h0"], params["v0"], params["angle"])
 
     # Визуализация результатов
     plot_results(t, x, y, vx, vy)
+    plt.show()
+
+    input("Для выхода из программы нажмите enter")
+
+# Разброс характеристик броска методом Монте-Карло: python BallisticMovement.py monte-carlo
+def main_monte_carlo():
+    import matplotlib.pyplot as plt
+
+    results, _ = simulate_monte_carlo(**validation.ask_params(MONTE_CARLO_PARAMETERS))
+    for name in METRICS:
+        r = results[name]
+        print(f"{TITLES[name]}: среднее {r['mean']:.4g}, ст. откл. {r['std']:.3g}, "
+              f"5% {r['p5']:.4g}, медиана {r['p50']:.4g}, 95% {r['p95']:.4g}")
+    if results["invalid"]:
+        print(f"Бросков, не долетевших до земли: {results['invalid']}")
+    plt.show()
 
-    print("Для выхода из программы нажмите enter")
-    while True:
-        if keyboard.is_pressed("enter"):
-            break
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["monte-carlo"]:
+        main_monte_carlo()
+    else:
+        main()
@@ -1,132 +1,168 @@
+import sys
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
+from physicitmo import validation
+from physicitmo.collisions import Bodies, EventDrivenSimulation, step
+from physicitmo.recording import Recording, animate_recording, record
+from physicitmo.render import BodyRenderer, RealTimePlayer
+
+# Входные данные: (имя, приглашение, проверка) - общие для ввода с клавиатуры и сценариев;
+# начальные положения pos1, pos2 запрашиваются отдельно, после размеров оболочки
+PARAMETERS = [
+    ("m1", "Масса первого тела (положительное число): ", validation.positive),
+    ("m2", "Масса второго тела (положительное число): ", validation.positive),
+    ("v1_x", "Скорость по оси X первого тела: ", validation.number),
+    ("v1_y", "Скорость по оси Y первого тела: ", validation.number),
+    ("v2_x", "Скорость по оси X второго тела: ", validation.number),
+    ("v2_y", "Скорость по оси Y второго тела: ", validation.number),
+    ("s1", "Размер стороны квадрата первого тела (положительное число): ", validation.positive),
+    ("s2", "Размер стороны квадрата второго тела (положительное число): ", validation.positive),
+    ("W", "Ширина оболочки (положительное число): ", validation.positive),
+    ("H", "Высота оболочки (положительное число): ", validation.positive),
+]
 
-# Функция для проверки корректного ввода числа
-def get_float_input(prompt, condition=lambda x: True, error_message="Некорректный ввод, попробуйте снова."):
-    while True:
-        try:
-            value = float(input(prompt))
-            if condition(value):
-                return value
-            else:
-                print(error_message)
-        except ValueError:
-            print(error_message)
+# Время
+dt = 0.01
+
+# Режим: "events" - переход от столкновения к столкновению по точным моментам
+# ударов (тела не проскакивают друг сквозь друга), "steps" - шаги по dt
+mode = "events"
+
+# Расчет без графики с записью кадров в каталог (None - анимация во время расчета)
+record_to = None
+record_time = 60.0  # длительность записи, с
 
 
 # Проверка начальных позиций на пересечение и выход за границы
 def validate_positions(pos1, pos2, s1, s2, W, H):
-    # Проверка на выход за границы
-    def check_within_bounds(pos, s, W, H):
-        return (s / 2 <= pos[0] <= W - s / 2) and (s / 2 <= pos[1] <= H - s / 2)
-
-    # Проверка на пересечение: расстояние между центрами должно быть не меньше суммы половин сторон квадратов
-    def check_no_overlap(pos1, pos2, s1, s2):
-        distance = np.linalg.norm(pos1 - pos2)  # Расстояние между центрами квадратов
-        min_distance = (s1 / 2) + (s2 / 2)  # Сумма половин сторон квадратов
-        return distance >= min_distance  # Возвращает True, если квадраты не пересекаются
-
-    # Проверяем границы
-    if not check_within_bounds(pos1, s1, W, H):
-        print(f"Позиция первого квадрата выходит за границы оболочки! {pos1}")
+    try:
+        validation.positions(pos1, pos2, s1, s2, W, H)
+    except ValueError as e:
+        print(e)
         return False
-    if not check_within_bounds(pos2, s2, W, H):
-        print(f"Позиция второго квадрата выходит за границы оболочки! {pos2}")
-        return False
-
-    # Проверяем пересечение
-    if not check_no_overlap(pos1, pos2, s1, s2):
-        print("Квадраты пересекаются!")
-        return False
-
     return True
 
 
-# Ввод пользовательских данных с проверками
-print("Введите параметры симуляции:")
-m1 = get_float_input("Масса первого тела (положительное число): ", condition=lambda x: x > 0)
-m2 = get_float_input("Масса второго тела (положительное число): ", condition=lambda x: x > 0)
-v1_x = get_float_input("Скорость по оси X первого тела: ")
-v1_y = get_float_input("Скорость по оси Y первого тела: ")
-v2_x = get_float_input("Скорость по оси X второго тела: ")
-v2_y = get_float_input("Скорость по оси Y второго тела: ")
-s1 = get_float_input("Размер стороны квадрата первого тела (положительное число): ", condition=lambda x: x > 0)
-s2 = get_float_input("Размер стороны квадрата второго тела (положительное число): ", condition=lambda x: x > 0)
-W = get_float_input("Ширина оболочки (положительное число): ", condition=lambda x: x > 0)
-H = get_float_input("Высота оболочки (положительное число): ", condition=lambda x: x > 0)
-
-# Ввод начальных положений с проверками
-while True:
-    pos1 = np.array([get_float_input(f"Начальная позиция по оси X для первого тела (0 < X < {W}): "),
-                     get_float_input(f"Начальная позиция по оси Y для первого тела (0 < Y < {H}): ")])
-
-    pos2 = np.array([get_float_input(f"Начальная позиция по оси X для второго тела (0 < X < {W}): "),
-                     get_float_input(f"Начальная позиция по оси Y для второго тела (0 < Y < {H}): ")])
-
-    if validate_positions(pos1, pos2, s1, s2, W, H):
-        break
-    else:
-        print("Введите корректные начальные позиции тел.")
-
-# Начальные скорости
-v1 = np.array([v1_x, v1_y])  # начальная скорость тела 1
-v2 = np.array([v2_x, v2_y])  # начальная скорость тела 2
-
-# Время
-dt = 0.01
-
-
-# Функция для проверки столкновения с границами оболочки
-def check_collision_with_walls(pos, vel, s):
-    if pos[0] - s / 2 < 0 or pos[0] + s / 2 > W:
-        vel[0] = -vel[0]  # изменение направления по оси x
-    if pos[1] - s / 2 < 0 or pos[1] + s / 2 > H:
-        vel[1] = -vel[1]  # изменение направления по оси y
-    return vel
-
-
-# Функция для проверки столкновения между квадратами
-def check_collision_between_squares(pos1, pos2, vel1, vel2, s1, s2):
-    # Проверка пересечения границ квадратов
-    if (abs(pos1[0] - pos2[0]) < (s1 + s2) / 2) and (abs(pos1[1] - pos2[1]) < (s1 + s2) / 2):
-        # Расчет новых скоростей на основе закона сохранения импульса
-        v1_new = vel1 * (m1 - m2) / (m1 + m2) + vel2 * (2 * m2) / (m1 + m2)
-        v2_new = vel2 * (m2 - m1) / (m1 + m2) + vel1 * (2 * m1) / (m1 + m2)
-        return v1_new, v2_new
-    return vel1, vel2
+# Тела: центры, скорости, стороны и массы хранятся массивами
+def make_bodies(m1, m2, v1_x, v1_y, v2_x, v2_y, s1, s2, pos1, pos2):
+    return Bodies([pos1, pos2], [[v1_x, v1_y], [v2_x, v2_y]], [s1, s2], [m1, m2])
+
+
+# Импульс и кинетическая энергия системы
+def totals(bodies):
+    momentum = (bodies.mass[:, None] * bodies.vel).sum(axis=0)
+    energy = 0.5 * np.sum(bodies.mass * np.sum(bodies.vel ** 2, axis=1))
+    return momentum, energy
+
+
+# Расчет без графики до момента t_end (EventDrivenSimulation) и график путей тел
+def collide(bodies, W, H, t_end):
+    """
+    Возвращает:
+    - results: импульс и кинетическая энергия в начале и в конце, число
+      столкновений и ударов о стенки, положения и скорости тел в момент t_end
+    - fig: пути центров тел с кадрами через dt
+    """
+    import matplotlib.pyplot as plt
+
+    momentum_start, energy_start = totals(bodies)
+    simulation = EventDrivenSimulation(bodies, W, H)
+    paths = np.array(list(simulation.frames(np.arange(0, t_end + dt / 2, dt))))
+    momentum_end, energy_end = totals(bodies)
+    results = {
+        "t_end": t_end,
+        "events": simulation.n_events,
+        "momentum_start": momentum_start.tolist(),
+        "momentum_end": momentum_end.tolist(),
+        "energy_start": float(energy_start),
+        "energy_end": float(energy_end),
+        "positions": bodies.pos.tolist(),
+        "velocities": bodies.vel.tolist(),
+    }
+
+    fig, ax = plt.subplots()
+    for i, color in enumerate(['blue', 'red']):
+        ax.plot(paths[:, i, 0], paths[:, i, 1], color=color, label=f'Тело {i + 1}')
+    ax.set_xlim(0, W)
+    ax.set_ylim(0, H)
+    ax.set_aspect('equal')
+    ax.set_title(f'Пути центров тел за {t_end:g} с')
+    ax.legend()
+    return results, fig
+
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios)
+def scenario(params):
+    checked = validation.validate_params(PARAMETERS + [("pos1", None, validation.point),
+                                                       ("pos2", None, validation.point)], params,
+                                         optional=[("t_end", validation.positive, 10.0)])
+    try:
+        validation.positions(checked["pos1"], checked["pos2"], checked["s1"], checked["s2"],
+                             checked["W"], checked["H"])
+    except ValueError as e:
+        raise ValueError(f"pos1, pos2: {e}") from None
+    W, H, t_end = checked.pop("W"), checked.pop("H"), checked.pop("t_end")
+    results, fig = collide(make_bodies(**checked), W, H, t_end)
+    return results, [fig]
+
+
+def main():
+    # Воспроизведение готовой записи без расчета: python Impulse.py <каталог записи>
+    if len(sys.argv) > 1:
+        import matplotlib.pyplot as plt
+
+        replay = animate_recording(Recording(sys.argv[1]))
+        plt.show()
+        return
+
+    # Ввод пользовательских данных с проверками
+    print("Введите параметры симуляции:")
+    params = validation.ask_params(PARAMETERS)
+    W, H = params.pop("W"), params.pop("H")
+
+    # Ввод начальных положений с проверками
+    while True:
+        pos1 = np.array([validation.ask(f"Начальная позиция по оси X для первого тела (0 < X < {W}): "),
+                         validation.ask(f"Начальная позиция по оси Y для первого тела (0 < Y < {H}): ")])
 
+        pos2 = np.array([validation.ask(f"Начальная позиция по оси X для второго тела (0 < X < {W}): "),
+                         validation.ask(f"Начальная позиция по оси Y для второго тела (0 < Y < {H}): ")])
 
-# Инициализация графики
-fig, ax = plt.subplots()
-ax.set_xlim(0, W)
-ax.set_ylim(0, H)
-rect1 = plt.Rectangle(pos1 - np.array([s1 / 2, s1 / 2]), s1, s1, color='blue')
-rect2 = plt.Rectangle(pos2 - np.array([s2 / 2, s2 / 2]), s2, s2, color='red')
-ax.add_patch(rect1)
-ax.add_patch(rect2)
+        if validate_positions(pos1, pos2, params["s1"], params["s2"], W, H):
+            break
+        else:
+            print("Введите корректные начальные позиции тел.")
 
+    bodies = make_bodies(pos1=pos1, pos2=pos2, **params)
 
-def update(frame):
-    global pos1, pos2, v1, v2
+    if record_to is not None:
+        recording = record(bodies, W, H, record_time, record_to, frame_dt=dt, dt=dt, mode=mode)
+        print(f"Записано кадров: {len(recording)} в {record_to}")
+        return
 
-    # Проверка столкновения с оболочкой
-    v1 = check_collision_with_walls(pos1, v1, s1)
-    v2 = check_collision_with_walls(pos2, v2, s2)
+    if mode == "events":
+        simulation = EventDrivenSimulation(bodies, W, H)
 
-    # Проверка столкновения между квадратами
-    v1, v2 = check_collision_between_squares(pos1, pos2, v1, v2, s1, s2)
+        def advance(h):
+            simulation.advance(simulation.time + h)
+    else:
+        def advance(h):
+            # Отражение от оболочки, столкновения тел и перемещение - сразу для всех тел
+            step(bodies, h, W, H)
 
-    # Обновление позиций тел
-    pos1 += v1 * dt
-    pos2 += v2 * dt
+    # Инициализация графики: все тела - один объект, анимация в темпе реального времени
+    import matplotlib.pyplot as plt  # только здесь: расчету с записью графика не нужна
 
-    # Обновление графики
-    rect1.set_xy(pos1 - np.array([s1 / 2, s1 / 2]))
-    rect2.set_xy(pos2 - np.array([s2 / 2, s2 / 2]))
-    return rect1, rect2
+    fig, ax = plt.subplots()
+    ax.set_xlim(0, W)
+    ax.set_ylim(0, H)
+    renderer = BodyRenderer(ax, bodies.pos, bodies.size, colors=['blue', 'red'])
+    player = RealTimePlayer(fig, renderer, advance, lambda: bodies.pos, dt)
+    plt.show()
 
 
-ani = FuncAnimation(fig, update, frames=200, interval=10, blit=True)
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,102 @@
-import numpy as np
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # корень репозитория с пакетом physicitmo
+from physicitmo import validation
+from physicitmo.integrators import reduce_chunks
+from physicitmo.oscillator import EnergyDiagnostics, auto_dt, energies, energy_drift, oscillator_chunks, simulate
+
+# Метод решения: "exact" - аналитическое решение, "recurrence" - явный метод
+# Эйлера через степени матрицы шага, "euler" - явный метод Эйлера циклом (эталон),
+# "semi_implicit", "verlet", "exponential" - схемы, сохраняющие энергию
+solver = "exact"
 
-# Функция для ввода и проверки значений
-def get_positive_input(prompt):
-    while True:
-        try:
-            value = float(input(prompt))
-            if value <= 0:
-                print("Значение должно быть положительным.")
-            else:
-                return value
-        except ValueError:
-            print("Пожалуйста, введите числовое значение.")
-
-
-def get_non_negative_input(prompt):
-    while True:
-        try:
-            value = float(input(prompt))
-            if value < 0:
-                print("Значение не может быть отрицательным.")
-            else:
-                return value
-        except ValueError:
-            print("Пожалуйста, введите числовое значение.")
-
-
-# Ввод данных от пользователя с проверкой
-m = get_positive_input("Введите массу груза (кг, положительное число): ")
-k = get_positive_input("Введите коэффициент жесткости пружины (Н/м, положительное число): ")
-b = get_non_negative_input("Введите коэффициент сопротивления среды (Н·с/м, неотрицательное число): ")
-x0 = get_non_negative_input("Введите начальную координату (м, неотрицательное число): ")
-v0 = get_non_negative_input("Введите начальную скорость (м/с, неотрицательное число): ")
+
+# Входные данные: (имя, приглашение, проверка) - общие для ввода с клавиатуры и сценариев
+PARAMETERS = [
+    ("m", "Введите массу груза (кг, положительное число): ", validation.positive),
+    ("k", "Введите коэффициент жесткости пружины (Н/м, положительное число): ", validation.positive),
+    ("b", "Введите коэффициент сопротивления среды (Н·с/м, неотрицательное число): ", validation.non_negative),
+    ("x0", "Введите начальную координату (м, неотрицательное число): ", validation.non_negative),
+    ("v0", "Введите начальную скорость (м/с, неотрицательное число): ", validation.non_negative),
+    ("t_end", "Введите время колебаний (с, положительное число): ", validation.positive),
+]
 
 # Определение параметров численного решения
 t_start = 0
-t_end = get_positive_input("Введите время колебаний (с, положительное число): ")
-dt = 0.01
-num_steps = int((t_end - t_start) / dt)
-
-# Инициализация массивов для времени, координаты и скорости
-t = np.linspace(t_start, t_end, num_steps)
-x = np.zeros(num_steps)
-v = np.zeros(num_steps)
-
-# Начальные условия
-x[0] = x0
-v[0] = v0
-
-# Численное решение методом Эйлера
-for i in range(1, num_steps):
-    dxdt = v[i - 1]
-    dvdt = -(k / m) * x[i - 1] - (b / m) * v[i - 1]
-
-    x[i] = x[i - 1] + dxdt * dt
-    v[i] = v[i - 1] + dvdt * dt
-
-# Вычисление энергий
-kinetic_energy = 0.5 * m * v ** 2
-potential_energy = 0.5 * k * x ** 2
-total_energy = kinetic_energy + potential_energy
-
-# Построение графиков
-plt.figure(figsize=(10, 6))
-plt.plot(t, kinetic_energy, label='Кинетическая энергия', color='b')
-plt.plot(t, potential_energy, label='Потенциальная энергия', color='g')
-plt.plot(t, total_energy, label='Полная механическая энергия', color='r', linestyle='--')
-plt.title('Энергии в зависимости от времени')
-plt.xlabel('Время (с)')
-plt.ylabel('Энергия (Дж)')
-plt.legend()
-plt.grid(True)
-plt.show()
+dt = 0.01  # None - шаг подбирается автоматически по omega0 = sqrt(k / m)
+stream_steps = 10 ** 6  # при большем числе шагов расчет идет порциями, без хранения всех точек
+
+
+# Расчет энергий и построение графика
+def energy_model(m, k, b, x0, v0, t_end):
+    """
+    Возвращает:
+    - results: при числе шагов не больше stream_steps - оценка ошибки
+      полной энергии energy_drift, иначе - сводка EnergyDiagnostics.summary
+    - fig: график энергий от времени
+    """
+    step = auto_dt(m, k, b, solver, t_end=t_end - t_start) if dt is None else dt
+    num_steps = int((t_end - t_start) / step)
+
+    fig = plt.figure(figsize=(10, 6))
+    labels = ('Кинетическая энергия', 'Потенциальная энергия', 'Полная механическая энергия')
+    colors = ('b', 'g', 'r')
+
+    if num_steps <= stream_steps:
+        # Решение и вычисление энергий
+        t, x, v = simulate(m, k, b, x0, v0, t_end, step, solver=solver, t_start=t_start)
+        kinetic_energy, potential_energy, total_energy = energies(m, k, x, v)
+        results = energy_drift(m, k, b, x0, v0, t, x, v)
+
+        # Построение графиков
+        plt.plot(t, kinetic_energy, label=labels[0], color=colors[0])
+        plt.plot(t, potential_energy, label=labels[1], color=colors[1])
+        plt.plot(t, total_energy, label=labels[2], color=colors[2], linestyle='--')
+    else:
+        # Потоковый режим: статистика энергии и прореженный ряд (наименьшие и
+        # наибольшие значения по группам точек), память не зависит от t_end
+        diagnostics = EnergyDiagnostics(m, k, b, num_steps)
+        reduce_chunks(oscillator_chunks(m, k, b, x0, v0, t_end, step, solver=solver, t_start=t_start), diagnostics)
+        results = diagnostics.summary()
+
+        # Построение графиков: полоса между наименьшим и наибольшим значением в группе
+        t, lower, upper = diagnostics.series()
+        for row in range(3):
+            plt.fill_between(t, lower[row], upper[row], label=labels[row], color=colors[row], alpha=0.5)
+
+    plt.title('Энергии в зависимости от времени')
+    plt.xlabel('Время (с)')
+    plt.ylabel('Энергия (Дж)')
+    plt.legend()
+    plt.grid(True)
+    return results, fig
+
+
+# Запуск без терминала по параметрам сценария (physicitmo.scenarios)
+def scenario(params):
+    results, fig = energy_model(**validation.validate_params(PARAMETERS, params))
+    return results, [fig]
+
+
+def main():
+    # Ввод данных от пользователя с проверкой
+    results, _ = energy_model(**validation.ask_params(PARAMETERS))
+    if "max_rel_error" in results:
+        print(f"Ошибка полной энергии: наибольшая {results['max_rel_error']:.2e}, "
+              f"уход {results['drift_rate']:.2e} 1/с (в долях начальной энергии), шагов: {results['steps']}")
+    else:
+        print(f"Шагов: {results['steps']}, полная энергия: от {results['e_min']:.4g} до {results['e_max']:.4g} Дж, "
+              f"средняя {results['e_mean']:.4g} Дж")
+        print(f"Работа силы сопротивления: {results['dissipated_work']:.4g} Дж, уход баланса E + W: "
+              f"{results['relative_drift_rate']:.2e} 1/с (в долях начальной энергии)")
+        if results['periods']:
+            print(f"Период колебаний: {results['period_mean']:.6g} с "
+                  f"(от {results['period_min']:.6g} до {results['period_max']:.6g} с)")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
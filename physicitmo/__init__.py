@@ -0,0 +1,6 @@
+"""
+Общий код для заданий на моделирование к лекциям по физике.
+
+Скрипты из каталогов LectureNTasks подключают этот пакет, добавляя корень
+репозитория в sys.path.
+"""
@@ -0,0 +1,6 @@
+from .cli import main
+
+# Защита нужна пулу процессов batch: при запуске процессов методом spawn
+# модуль __main__ импортируется в каждом из них заново
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Движение тела, брошенного под углом к горизонту, без сопротивления
+воздуха (задание к лекции 2): характеристики броска в замкнутом виде
+для больших наборов бросков, их статистика и обратная задача - углы
+броска в заданные точки.
+"""
+
+import numpy as np
+
+g = 9.81  # ускорение свободного падения, м/с^2
+
+METRICS = ("range", "flight_time", "apex", "impact_speed")
+
+
+# Характеристики бросков в замкнутом виде
+def launch_metrics(h0, v0, angle_deg):
+    """
+    Та же модель, что calculate_trajectory из BallisticMovement.py, но без
+    массивов времени: только итоговые величины, сразу для массивов бросков.
+
+    Параметры:
+    - h0: начальная высота (м)
+    - v0: начальная скорость (м/с)
+    - angle_deg: угол броска (градусы)
+    (скаляры или массивы, согласуются по правилам broadcasting)
+
+    Возвращает словарь массивов (np.nan для бросков, не долетающих до
+    земли, например с h0 < 0 без достаточной вертикальной скорости):
+    - range: дальность полета (м)
+    - flight_time: время полета (с)
+    - apex: наибольшая высота (м)
+    - impact_speed: скорость в момент падения (м/с)
+    """
+    angle_rad = np.radians(angle_deg)
+    vx = v0 * np.cos(angle_rad)
+    vy = v0 * np.sin(angle_rad)
+    disc = vy ** 2 + 2 * g * np.asarray(h0, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        root = np.sqrt(np.where(disc >= 0, disc, np.nan))
+    t_flight = (vy + root) / g
+    t_flight = np.where(t_flight >= 0, t_flight, np.nan)
+    apex = h0 + np.maximum(vy, 0.0) ** 2 / (2 * g)
+    return {
+        "range": vx * t_flight,
+        "flight_time": t_flight,
+        "apex": np.where(np.isnan(t_flight), np.nan, apex),
+        "impact_speed": np.sqrt(vx ** 2 + root ** 2),  # |vy| при падении равна sqrt(vy^2 + 2 g h0)
+    }
+
+
+class StreamingHistogram:
+    """
+    Гистограмма и статистика выборки, пополняемой порциями, в памяти
+    фиксированного размера.
+
+    Границы интервалов задаются заранее (edges) или по первой порции:
+    ее размах, расширенный на margin с каждой стороны. Значения за
+    границами считаются в underflow и overflow. Среднее и дисперсия
+    объединяются по порциям устойчиво (Чан и др.), минимум и максимум
+    точные, процентили - по гистограмме с линейной интерполяцией внутри
+    интервала (погрешность не больше ширины интервала).
+
+    Параметры:
+    - bins: число интервалов
+    - edges: возрастающие границы интервалов, не обязательно равномерные
+      (если заданы, bins не используется)
+    - margin: запас по краям при выборе границ по первой порции
+    """
+
+    def __init__(self, bins=2048, edges=None, margin=0.25):
+        self.bins = bins
+        self.margin = margin
+        self.edges = self.counts = None
+        self._uniform = True  # равномерные границы: номер интервала считается без поиска
+        if edges is not None:
+            self.edges = np.asarray(edges, dtype=np.float64)
+            widths = np.diff(self.edges)
+            if self.edges.ndim != 1 or widths.size < 1 or not np.all(widths > 0):
+                raise ValueError("Границы интервалов edges должны строго возрастать.")
+            self.counts = np.zeros(widths.size, dtype=np.int64)
+            self._uniform = bool(np.allclose(widths, widths[0], rtol=1e-12, atol=0))
+        self.underflow = self.overflow = 0
+        self.n = 0
+        self.invalid = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min, self.max = np.inf, -np.inf
+
+    def update(self, values):
+        values = np.ravel(values)
+        finite = np.isfinite(values)
+        self.invalid += int(values.size - finite.sum())
+        values = values[finite]
+        if not values.size:
+            return
+        if self.edges is None:
+            lo, hi = float(values.min()), float(values.max())
+            pad = self.margin * (hi - lo) if hi > lo else max(abs(lo), 1.0) * self.margin
+            self.edges = np.linspace(lo - pad, hi + pad, self.bins + 1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+
+        lo, hi = self.edges[0], self.edges[-1]
+        self.underflow += int(np.count_nonzero(values < lo))
+        self.overflow += int(np.count_nonzero(values > hi))
+        inside = (values >= lo) & (values <= hi)
+        if self._uniform:
+            # Равномерные границы: номер интервала - арифметикой, без поиска
+            index = ((values - lo) * ((self.edges.size - 1) / (hi - lo))).astype(np.int64)
+        else:
+            index = np.searchsorted(self.edges, values, side="right") - 1
+        self.counts += np.bincount(np.minimum(index[inside], self.counts.size - 1), minlength=self.counts.size)
+
+        n_b = values.size
+        mean_b = float(values.mean())
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self._m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / self.n)) if self.n else np.nan
+
+    def percentile(self, q):
+        """Процентили q (0..100) по гистограмме; хвосты за границами - через min и max."""
+        q = np.asarray(q, dtype=np.float64)
+        if not self.n:
+            return np.full(q.shape, np.nan)
+        # Накопленные частоты в границах: хвосты считаем сосредоточенными в min и max
+        cum = np.concatenate(([self.underflow], self.underflow + np.cumsum(self.counts)))
+        rank = q / 100 * self.n
+        result = np.interp(rank, cum, self.edges)
+        result = np.where(rank <= self.underflow, self.min, result)
+        result = np.where(rank >= self.n - self.overflow, self.max, result)
+        return np.clip(result, self.min, self.max)
+
+
+# Метод Монте-Карло для разброса характеристик броска
+def monte_carlo(sample, n, chunk_size=1 << 20, bins=2048, seed=0):
+    """
+    Генерирует n бросков порциями по chunk_size, считает для каждой порции
+    характеристики launch_metrics и сразу сворачивает их в
+    StreamingHistogram, так что память не зависит от n.
+
+    Параметры:
+    - sample: функция sample(rng, size) -> (h0, v0, angle_deg), массивы
+      формы (size,) (см. normal_launches)
+    - n: число бросков
+    - chunk_size: размер порции
+    - bins: число интервалов гистограмм
+    - seed: зерно генератора случайных чисел
+
+    Возвращает:
+    - словарь {имя характеристики: StreamingHistogram} для METRICS
+    """
+    rng = np.random.default_rng(seed)
+    stats = {name: StreamingHistogram(bins) for name in METRICS}
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        metrics = launch_metrics(*sample(rng, size))
+        for name in METRICS:
+            stats[name].update(metrics[name])
+    return stats
+
+
+# Нормальный разброс параметров броска
+def normal_launches(h0, v0, angle_deg, sigma_h0=0.0, sigma_v0=0.0, sigma_angle=0.0):
+    """
+    Возвращает функцию sample(rng, size) для monte_carlo: h0, v0 и угол
+    распределены нормально со средними h0, v0, angle_deg и стандартными
+    отклонениями sigma_*.
+    """
+    def sample(rng, size):
+        return (rng.normal(h0, sigma_h0, size), rng.normal(v0, sigma_v0, size),
+                rng.normal(angle_deg, sigma_angle, size))
+
+    return sample
+
+
+# Углы броска в заданные точки (обратная задача)
+def aim(x, y, h0, v0):
+    """
+    Обратная задача для той же модели: под каким углом бросить тело с
+    высоты h0 со скоростью v0, чтобы траектория прошла через точку (x, y).
+    Из уравнения траектории y = h0 + x tg(a) - g x^2 / (2 v0^2 cos^2(a))
+    tg(a) = (v0^2 -+ sqrt(D)) / (g x), где D = v0^4 - g (g x^2 + 2 (y - h0) v0^2).
+    Наименьшая скорость, при которой точка достижима (больший корень
+    D = 0 как уравнения относительно v0^2), v_min^2 = g ((y - h0) + sqrt(x^2 + (y - h0)^2));
+    цель достижима при v0 >= v_min (D >= 0 выполняется и при малых v0
+    на меньшем корне, например при v0 = 0 и x = 0, поэтому одного D мало).
+    Вертикальные цели (x = 0) - броски вертикально: вверх (90) и, для цели
+    ниже точки броска, вниз (-90).
+
+    Параметры:
+    - x, y: координаты целей (м): x - по горизонтали от точки броска,
+      y - высота над землей (как в calculate_trajectory), массивы любой формы
+    - h0: начальная высота (м)
+    - v0: начальная скорость (м/с)
+    (все согласуются по правилам broadcasting)
+
+    Возвращает словарь массивов:
+    - low, high: настильный и навесной углы броска (градусы, как в
+      calculate_trajectory; при x < 0 углы больше 90), np.nan для
+      недостижимых целей
+    - reachable: True, если цель достижима со скоростью v0 (v0 >= v_min)
+    - v_min: наименьшая начальная скорость, при которой цель достижима (м/с),
+      np.nan для целей ниже земли (y < 0), недостижимых при любой скорости
+    - v_min_angle: угол броска при скорости v_min (градусы), np.nan для целей ниже земли
+    """
+    x = np.asarray(x, dtype=np.float64)
+    dy = np.asarray(y, dtype=np.float64) - h0
+    v0_sq = np.asarray(v0, dtype=np.float64) ** 2
+    disc = v0_sq ** 2 - g * (g * x ** 2 + 2 * dy * v0_sq)
+    # Тело падает на землю (y = 0), цели ниже земли недостижимы при любой скорости
+    above_ground = np.asarray(y) >= 0
+    v_min_sq = np.where(above_ground, g * (dy + np.hypot(x, dy)), np.nan)
+    with np.errstate(invalid="ignore"):
+        # Допуск на округление: при v0 = v_min, вычисленной как sqrt(v_min^2), цель достижима
+        reachable = above_ground & (v0_sq >= v_min_sq * (1 - 1e-12))
+    root = np.sqrt(np.where(reachable, np.maximum(disc, 0.0), np.nan))
+    gx = g * x
+
+    # Вертикальные цели: бросок вверх, а для цели ниже точки броска - и вниз
+    vertical = x == 0
+    down = np.where(dy < 0, -90.0, 90.0)
+    low = np.where(vertical, down, np.degrees(np.arctan2(v0_sq - root, gx)))
+    high = np.where(vertical, 90.0, np.degrees(np.arctan2(v0_sq + root, gx)))
+    return {
+        "low": np.where(reachable, low, np.nan),
+        "high": np.where(reachable, high, np.nan),
+        "reachable": reachable,
+        "v_min": np.sqrt(v_min_sq),
+        "v_min_angle": np.where(vertical & above_ground, down, np.degrees(np.arctan2(v_min_sq, gx))),
+    }
@@ -0,0 +1,90 @@
+"""
+Единая точка входа ко всем моделям: python -m physicitmo <модель> [аргументы],
+и пакетный запуск сценариев: python -m physicitmo batch <сценарии> <результаты>.
+
+Скрипт модели загружается только после выбора подкоманды и выполняется
+так же, как при прямом запуске (python <скрипт> [аргументы]), поэтому
+matplotlib и остальные тяжелые модули загружаются, только если их
+импортирует выбранная модель.
+"""
+
+import argparse
+import runpy
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория с каталогами LectureNTasks
+
+# Подкоманда: (скрипт относительно корня репозитория, описание)
+MODELS = {
+    "coordinates": ("Lecture1Tasks/Option2(modeling)/CartesianOrPolar.py",
+                    "декартовы и полярные координаты (аргументы: <файл> <результат> [cartesian|polar])"),
+    "ballistics": ("Lecture2Tasks/Option2(modeling)/BallisticMovement.py",
+                   "бросок под углом к горизонту (аргумент: monte-carlo)"),
+    "impulse": ("Lecture4Tasks/Option2(modeling)/Impulse.py",
+                "столкновения тел (аргумент: <каталог записи> для воспроизведения)"),
+    "thrown": ("Lecture567Tasks/Option2(Modeling)/TheThrownObject.py",
+               "бросок с сопротивлением воздуха"),
+    "energy": ("Lecture8Tasks/Option2(Modeling)/EnergyTransformations.py",
+               "превращения энергии при колебаниях"),
+    "field": ("Lecture10Tasks/Option2(Modeling)/ElectrostaticField.py",
+              "электростатическое поле точечных зарядов"),
+    "equipotential": ("Lecture12Tasks/Modeling/EquipotentialSurfaces.py",
+                      "эквипотенциальные поверхности"),
+    "dipole": ("Lecture13Tasks/Modeling/Dipole.py",
+               "диполь в поле точечных зарядов"),
+}
+
+
+# Разбор командной строки
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m physicitmo",
+                                     description="Модели к лекциям по физике")
+    subparsers = parser.add_subparsers(dest="model", required=True, metavar="модель")
+    for name, (_, help_text) in MODELS.items():
+        sub = subparsers.add_parser(name, help=help_text, description=help_text)
+        sub.add_argument("args", nargs=argparse.REMAINDER, help="аргументы скрипта модели")
+    batch = subparsers.add_parser("batch", help="пакетный запуск сценариев без терминала",
+                                  description="Выполняет сценарии *.json и *.toml в пуле процессов "
+                                              "и сохраняет графики PNG и результаты JSON")
+    batch.add_argument("source", help="файл сценария или каталог со сценариями")
+    batch.add_argument("out", help="каталог результатов")
+    batch.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию - число ядер)")
+    return parser
+
+
+# Запуск модели
+def run(model, args=()):
+    """
+    Выполняет скрипт модели как __main__ с аргументами командной строки args.
+
+    Возвращает:
+    - словарь глобальных имен скрипта после выполнения
+    """
+    path = ROOT / MODELS[model][0]
+    argv = sys.argv
+    sys.argv = [str(path), *args]
+    try:
+        return runpy.run_path(str(path), run_name="__main__")
+    finally:
+        sys.argv = argv
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.model != "batch":
+        run(options.model, options.args)
+        return
+
+    from .scenarios import ScenarioError, run_batch
+
+    try:
+        results = run_batch(options.source, options.out, options.workers)
+    except ScenarioError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    failed = [r for r in results if r["error"]]
+    for r in failed:
+        print(f"{r['scenario']}: {r['error']}", file=sys.stderr)
+    print(f"Сценариев: {len(results)}, с ошибками: {len(failed)}")
+    sys.exit(1 if failed else 0)
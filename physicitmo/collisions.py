@@ -0,0 +1,378 @@
+"""
+Упругие столкновения квадратных тел в прямоугольной оболочке
+(задание к лекции 4). Состояние хранится массивами: центры (N, 2),
+скорости (N, 2), стороны квадратов (N,) и массы (N,).
+"""
+
+import heapq
+
+import numpy as np
+
+
+class Bodies:
+    """
+    Набор тел в виде структуры массивов.
+
+    Атрибуты:
+    - pos: центры квадратов, форма (N, 2)
+    - vel: скорости, форма (N, 2)
+    - size: стороны квадратов, форма (N,)
+    - mass: массы, форма (N,)
+    """
+
+    def __init__(self, pos, vel, size, mass):
+        self.pos = np.array(pos, dtype=np.float64).reshape(-1, 2)
+        self.vel = np.array(vel, dtype=np.float64).reshape(-1, 2)
+        n = self.pos.shape[0]
+        self.size = np.array(np.broadcast_to(size, (n,)), dtype=np.float64)
+        self.mass = np.array(np.broadcast_to(mass, (n,)), dtype=np.float64)
+        if self.vel.shape != self.pos.shape:
+            raise ValueError("Число скоростей не совпадает с числом тел.")
+
+    def __len__(self):
+        return self.pos.shape[0]
+
+    def copy(self):
+        return Bodies(self.pos, self.vel, self.size, self.mass)
+
+
+# Случайный набор непересекающихся тел
+def random_bodies(n, W, H, size=1.0, speed=1.0, mass=(1.0, 1.0), seed=0):
+    """
+    Расставляет n квадратов со стороной size по узлам сетки внутри оболочки
+    W x H (со случайным сдвигом в пределах ячейки, без пересечений) и
+    задает скорости со случайным направлением и модулем до speed,
+    массы - равномерно в интервале mass.
+    """
+    rng = np.random.default_rng(seed)
+    cols = max(1, int(W // (size * 1.5)))
+    rows = max(1, int(H // (size * 1.5)))
+    if cols * rows < n:
+        raise ValueError(f"В оболочке {W} x {H} помещается не более {cols * rows} тел со стороной {size}.")
+    cell = rng.choice(cols * rows, size=n, replace=False)
+    cw, ch = W / cols, H / rows
+    slack = np.array([cw - size, ch - size])
+    pos = np.column_stack(((cell % cols) * cw, (cell // cols) * ch)) + size / 2 + rng.random((n, 2)) * slack
+    angle = rng.uniform(0, 2 * np.pi, n)
+    speed = speed * rng.random(n)
+    vel = np.column_stack((speed * np.cos(angle), speed * np.sin(angle)))
+    return Bodies(pos, vel, size, rng.uniform(mass[0], mass[1], n))
+
+
+# Отражение от стенок оболочки сразу для всех тел
+def reflect_from_walls(pos, vel, size, W, H):
+    """
+    Меняет знак компоненты скорости тел, вышедших за стенку оболочки
+    и движущихся наружу (движущиеся внутрь уже отразились и не
+    разворачиваются повторно). Изменяет vel на месте.
+
+    Возвращает:
+    - маску тел, отразившихся от стенки
+    """
+    half = size / 2
+    out_x = ((pos[:, 0] - half < 0) & (vel[:, 0] < 0)) | ((pos[:, 0] + half > W) & (vel[:, 0] > 0))
+    out_y = ((pos[:, 1] - half < 0) & (vel[:, 1] < 0)) | ((pos[:, 1] + half > H) & (vel[:, 1] > 0))
+    vel[out_x, 0] *= -1
+    vel[out_y, 1] *= -1
+    return out_x | out_y
+
+
+def _expand(first, starts, counts):
+    """Пары (first[r], starts[r] + s) для s = 0 .. counts[r] - 1, без цикла."""
+    total = int(counts.sum())
+    i = np.repeat(first, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return i, np.repeat(starts, counts) + offsets
+
+
+# Широкая фаза: пары тел из соседних ячеек равномерной сетки
+def candidate_pairs(pos, size, cell=None):
+    """
+    Раскладывает тела по ячейкам сетки со стороной cell (по умолчанию -
+    наибольшая сторона квадрата, тогда пересекающиеся квадраты лежат в одной
+    или соседних ячейках), сортирует их по номеру ячейки и находит соседей
+    поиском в отсортированном массиве. Просматривается половина окрестности
+    (своя ячейка и 4 соседние), поэтому каждая пара встречается один раз.
+    Число пар - O(N) при ограниченной плотности тел вместо N^2 / 2.
+
+    Возвращает:
+    - i, j: номера тел в парах-кандидатах (i != j)
+    """
+    n = pos.shape[0]
+    if n < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if cell is None:
+        cell = float(size.max())
+    lo = pos.min(axis=0)
+    ix = ((pos[:, 0] - lo[0]) // cell).astype(np.int64) + 1
+    iy = ((pos[:, 1] - lo[1]) // cell).astype(np.int64) + 1
+    stride = int(iy.max()) + 2  # поля по краям: соседние номера не переходят в другой столбец
+    key = ix * stride + iy
+
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    cell_end = np.searchsorted(sorted_key, sorted_key, side="right")
+
+    # Та же ячейка: пары с телами, стоящими дальше в отсортированном порядке
+    rank = np.arange(n)
+    parts = [_expand(rank, rank + 1, cell_end - rank - 1)]
+    # Соседние ячейки: (+1, -1), (+1, 0), (+1, +1), (0, +1)
+    for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+        target = sorted_key + dx * stride + dy
+        start = np.searchsorted(sorted_key, target, side="left")
+        end = np.searchsorted(sorted_key, target, side="right")
+        parts.append(_expand(rank, start, end - start))
+
+    i = np.concatenate([p[0] for p in parts])
+    j = np.concatenate([p[1] for p in parts])
+    return order[i], order[j]
+
+
+# Узкая фаза: пересекающиеся квадраты
+def overlapping_pairs(pos, size, cell=None):
+    """
+    Возвращает:
+    - i, j: номера пар тел, квадраты которых пересекаются
+    """
+    i, j = candidate_pairs(pos, size, cell)
+    reach = (size[i] + size[j]) / 2
+    hit = (np.abs(pos[i, 0] - pos[j, 0]) < reach) & (np.abs(pos[i, 1] - pos[j, 1]) < reach)
+    return i[hit], j[hit]
+
+
+# Обмен скоростями при столкновениях
+def resolve_collisions(pos, vel, mass, i, j):
+    """
+    Для пар пересекающихся тел, которые сближаются ((v_i - v_j) . (r_i - r_j) < 0),
+    пересчитывает скорости по закону сохранения импульса, как
+    check_collision_between_squares из Impulse.py:
+    v_i' = v_i (m_i - m_j) / (m_i + m_j) + v_j 2 m_j / (m_i + m_j) и симметрично.
+    Расходящиеся пары не трогаются, поэтому перекрывающиеся тела не
+    сталкиваются повторно на каждом шаге. Если тело участвует в нескольких
+    парах, пары обрабатываются раундами, в каждом раунде тело - не более
+    чем в одной паре. Изменяет vel на месте.
+
+    Возвращает:
+    - число обработанных столкновений
+    """
+    total = 0
+    while i.size:
+        approach = np.einsum("ij,ij->i", vel[i] - vel[j], pos[i] - pos[j]) < 0
+        i, j = i[approach], j[approach]
+        if not i.size:
+            break
+        # В раунд попадают пары, первые в списке для обоих своих тел
+        first = np.full(vel.shape[0], i.size)
+        np.minimum.at(first, i, np.arange(i.size))
+        np.minimum.at(first, j, np.arange(i.size))
+        now = (first[i] == np.arange(i.size)) & (first[j] == np.arange(i.size))
+
+        a, b = i[now], j[now]
+        ma, mb = mass[a, None], mass[b, None]
+        va, vb = vel[a], vel[b]
+        vel[a] = va * (ma - mb) / (ma + mb) + vb * (2 * mb) / (ma + mb)
+        vel[b] = vb * (mb - ma) / (ma + mb) + va * (2 * ma) / (ma + mb)
+        total += a.size
+        i, j = i[~now], j[~now]
+    return total
+
+
+# Один шаг моделирования
+def step(bodies, dt, W, H, cell=None):
+    """
+    Тот же порядок, что в update из Impulse.py: отражение от стенок,
+    столкновения тел, затем перемещение pos += vel * dt. Изменяет bodies.
+
+    Возвращает:
+    - число столкновений тел на этом шаге
+    """
+    reflect_from_walls(bodies.pos, bodies.vel, bodies.size, W, H)
+    i, j = overlapping_pairs(bodies.pos, bodies.size, cell)
+    count = resolve_collisions(bodies.pos, bodies.vel, bodies.mass, i, j)
+    bodies.pos += bodies.vel * dt
+    return count
+
+
+# Моменты касания пар квадратов при равномерном движении
+def contact_times(d, u, reach):
+    """
+    Находит момент (от текущего, t = 0), когда квадраты начнут
+    пересекаться: по каждой оси условие |d + u t| < R задает интервал
+    времени, столкновение - начало пересечения интервалов по обеим осям.
+    Уже пересекающиеся (например, касающиеся после предыдущего удара)
+    квадраты сталкиваются сразу (t = 0), если сближаются вдоль оси
+    касания - той, по которой перекрытие меньше.
+
+    Параметры:
+    - d: разность центров r_i - r_j, форма (..., 2)
+    - u: разность скоростей v_i - v_j, форма (..., 2)
+    - reach: полусумма сторон R = (s_i + s_j) / 2, форма (...)
+
+    Возвращает:
+    - моменты столкновения формы (...) (np.inf - столкновения нет)
+    """
+    reach = np.asarray(reach)[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (-reach - d) / u
+        t2 = (reach - d) / u
+    still = u == 0
+    inside = np.abs(d) < reach
+    enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2)).max(axis=-1)
+    leave = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2)).min(axis=-1)
+    # Ось касания - та, по которой перекрытие меньше
+    axis = (reach - np.abs(d)).argmin(axis=-1)[..., None]
+    approaching = (np.take_along_axis(d, axis, -1) * np.take_along_axis(u, axis, -1))[..., 0] < 0
+    hit = (enter < leave) & (leave > 0) & ((enter >= 0) | approaching)
+    return np.where(hit, np.maximum(enter, 0.0), np.inf)
+
+
+# Моменты касания стенок
+def wall_times(pos, vel, size, W, H):
+    """
+    Возвращает:
+    - моменты касания вертикальной и горизонтальной стенки, форма (N, 2)
+      (np.inf - тело не движется к стенке по этой оси)
+    """
+    half = size[:, None] / 2
+    limit = np.array([W, H], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(vel > 0, (limit - half - pos) / vel, np.where(vel < 0, (half - pos) / vel, np.inf))
+    return np.maximum(t, 0.0)
+
+
+class EventDrivenSimulation:
+    """
+    Моделирование от события к событию: вместо шагов dt вычисляются точные
+    моменты ближайших ударов о стенки и столкновений тел, и система
+    переходит прямо к ним, так что тела не проскакивают друг сквозь друга.
+
+    События хранятся в очереди с приоритетом (heapq). Для каждого тела
+    в очереди лежат его ближайший удар о стенку и ближайшее столкновение
+    с другим телом. Событие запоминает счетчики столкновений участников;
+    если к моменту извлечения счетчик тела изменился, событие устарело и
+    отбрасывается (ленивое удаление), а если изменился только счетчик
+    партнера - ближайшее столкновение тела пересчитывается. Каждое тело
+    хранит положение на момент своего последнего изменения скорости,
+    поэтому обработка события - это пересчет прогнозов для одного-двух тел
+    (O(N) векторизованных операций), а не шаг по всем телам.
+
+    Правило обмена скоростями - как в resolve_collisions, отражение от
+    стенок - как в reflect_from_walls.
+
+    Параметры:
+    - bodies: Bodies (изменяется: после advance содержит состояние на
+      текущий момент)
+    - W, H: размеры оболочки
+    - block: число строк при начальном расчете прогнозов для всех пар
+    """
+
+    def __init__(self, bodies, W, H, block=256):
+        self.bodies = bodies
+        self.W, self.H = W, H
+        n = len(bodies)
+        self.time = 0.0
+        self.stamp = np.zeros(n)  # момент, к которому относится bodies.pos[i]
+        self.counts = np.zeros(n, dtype=np.int64)
+        self.n_events = 0
+        self._queue = []
+        self._seq = 0
+
+        # Начальные прогнозы: ближайший партнер каждого тела, блоками строк
+        pos, vel, size = bodies.pos, bodies.vel, bodies.size
+        for i0 in range(0, n, block):
+            rows = np.arange(i0, min(i0 + block, n))
+            times = contact_times(pos[rows, None] - pos[None], vel[rows, None] - vel[None],
+                                  (size[rows, None] + size[None]) / 2)
+            times[np.arange(rows.size), rows] = np.inf
+            partner = times.argmin(axis=1)
+            for i, j, t in zip(rows, partner, times[np.arange(rows.size), partner]):
+                if np.isfinite(t):
+                    self._push(t, int(i), int(j))
+        for i in range(n):
+            self._predict_wall(i)
+
+    def _push(self, t, i, j):
+        """j >= 0 - партнер, -1 - вертикальная стенка, -2 - горизонтальная."""
+        count_j = self.counts[j] if j >= 0 else -1
+        heapq.heappush(self._queue, (t, self._seq, i, j, self.counts[i], count_j))
+        self._seq += 1
+
+    def _positions(self, t, idx=None):
+        b = self.bodies
+        if idx is None:
+            idx = slice(None)
+        return b.pos[idx] + b.vel[idx] * (t - self.stamp[idx])[:, None]
+
+    def _predict_wall(self, i):
+        b = self.bodies
+        times = wall_times(self._positions(self.time, [i]), b.vel[[i]], b.size[[i]], self.W, self.H)[0]
+        axis = int(times.argmin())
+        if np.isfinite(times[axis]):
+            self._push(self.time + times[axis], i, -1 - axis)
+
+    def _predict_pair(self, i):
+        b = self.bodies
+        pos = self._positions(self.time)
+        times = contact_times(pos[i] - pos, b.vel[i] - b.vel, (b.size[i] + b.size) / 2)
+        times[i] = np.inf
+        j = int(times.argmin())
+        if np.isfinite(times[j]):
+            self._push(self.time + times[j], i, j)
+
+    def _sync(self, idx, t):
+        """Переносит положения тел idx на момент t."""
+        b = self.bodies
+        b.pos[idx] = self._positions(t, idx)
+        self.stamp[idx] = t
+
+    def advance(self, t_end):
+        """
+        Обрабатывает все события до момента t_end и переводит все тела
+        в состояние на момент t_end.
+
+        Возвращает:
+        - число обработанных столкновений и ударов о стенки
+        """
+        b = self.bodies
+        processed = 0
+        while self._queue and self._queue[0][0] <= t_end:
+            t, _, i, j, count_i, count_j = heapq.heappop(self._queue)
+            if count_i != self.counts[i]:
+                continue
+            self.time = t
+            if j >= 0 and count_j != self.counts[j]:
+                # Партнер изменил движение: прогноз для тела i устарел
+                self._predict_pair(i)
+                continue
+
+            if j < 0:
+                self._sync([i], t)
+                b.vel[i, -1 - j] *= -1
+                involved = [i]
+            else:
+                self._sync([i, j], t)
+                mi, mj = b.mass[i], b.mass[j]
+                vi, vj = b.vel[i].copy(), b.vel[j].copy()
+                b.vel[i] = vi * (mi - mj) / (mi + mj) + vj * (2 * mj) / (mi + mj)
+                b.vel[j] = vj * (mj - mi) / (mi + mj) + vi * (2 * mi) / (mi + mj)
+                involved = [i, j]
+            for k in involved:
+                self.counts[k] += 1
+            for k in involved:
+                self._predict_wall(k)
+                self._predict_pair(k)
+            processed += 1
+
+        self.time = max(self.time, t_end)
+        self._sync(slice(None), self.time)
+        self.n_events += processed
+        return processed
+
+    def frames(self, times):
+        """
+        Генератор: для каждого момента из возрастающей последовательности
+        times выдает копию положений тел, формы (N, 2).
+        """
+        for t in times:
+            self.advance(t)
+            yield self.bodies.pos.copy()
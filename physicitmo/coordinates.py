@@ -0,0 +1,192 @@
+"""
+Переход между декартовыми и полярными координатами (задание к лекции 1)
+для массивов точек и для файлов точек, не помещающихся в память.
+
+Форматы файлов определяются по расширению:
+- .npy - массив формы (N, 2), читается отображением в память
+- .csv, .txt - текст, по точке в строке, столбцы через delimiter; пустые
+  строки и комментарии (от символа comments до конца строки) пропускаются
+- остальные - сырые числа dtype подряд, по два на точку
+"""
+
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+DIRECTIONS = ("cartesian", "polar")  # система координат исходных точек
+TEXT_SUFFIXES = (".csv", ".txt")
+
+
+# Выходные буферы, если они не пересекаются со входами (иначе считаем во временные массивы)
+def _targets(out, *inputs):
+    if out is None:
+        return None, None, False
+    if any(np.may_share_memory(o, a) for o in out for a in inputs):
+        return None, None, True
+    return out[0], out[1], False
+
+
+# Запись результата в out и округление как в исходной скалярной версии
+def _finish(first, second, out, copy, precision):
+    if copy:
+        out[0][...] = first
+        out[1][...] = second
+        first, second = out
+    if precision is not None:
+        first = np.round(first, precision, out=first if isinstance(first, np.ndarray) else None)
+        second = np.round(second, precision, out=second if isinstance(second, np.ndarray) else None)
+    return first, second
+
+
+# Декартовы координаты -> полярные
+def cartesian_to_polar(x, y, precision=None, out=None):
+    """
+    Параметры:
+    - x, y: координаты (скаляры или массивы)
+    - precision: число знаков после запятой (None - без округления)
+    - out: пара массивов (r, theta) для результата; может совпадать с (x, y),
+      тогда преобразование идет на месте
+
+    Возвращает:
+    - r, theta (угол в радианах, от -pi до pi)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    out_r, out_theta, copy = _targets(out, x, y)
+    r = np.hypot(x, y, out=out_r)
+    theta = np.arctan2(y, x, out=out_theta)
+    return _finish(r, theta, out, copy, precision)
+
+
+# Полярные координаты -> декартовы
+def polar_to_cartesian(r, theta, precision=None, out=None):
+    """
+    Параметры:
+    - r, theta: радиус и угол в радианах (скаляры или массивы)
+    - precision: число знаков после запятой (None - без округления)
+    - out: пара массивов (x, y) для результата; может совпадать с (r, theta)
+
+    Возвращает:
+    - x, y
+    """
+    r = np.asarray(r, dtype=np.float64)
+    theta = np.asarray(theta, dtype=np.float64)
+    out_x, out_y, copy = _targets(out, r, theta)
+    x = np.multiply(r, np.cos(theta), out=out_x)
+    y = np.multiply(r, np.sin(theta), out=out_y)
+    return _finish(x, y, out, copy, precision)
+
+
+# Строки текстового файла с точками: без skiprows строк заголовка, пустых строк и комментариев
+def _data_lines(f, skiprows, comments):
+    for _ in range(skiprows):
+        next(f, None)
+    for line in f:
+        if (line.split(comments, 1)[0] if comments else line).strip():
+            yield line
+
+
+# Чтение файла точек порциями
+def read_points(path, chunk_rows=1 << 20, delimiter=",", skiprows=0, dtype=np.float64, comments="#"):
+    """
+    Генератор: возвращает массивы формы (не больше chunk_rows, 2) по
+    порядку. Двоичные файлы отображаются в память, текстовые читаются
+    построчно, так что в памяти одновременно только одна порция.
+    """
+    path = Path(path)
+    if path.suffix in TEXT_SUFFIXES:
+        with open(path) as f:
+            lines = _data_lines(f, skiprows, comments)
+            while chunk := list(islice(lines, chunk_rows)):
+                yield np.loadtxt(chunk, delimiter=delimiter, comments=comments, dtype=np.float64, ndmin=2)
+    else:
+        points = _open_binary(path, dtype)
+        for start in range(0, points.shape[0], chunk_rows):
+            yield np.asarray(points[start:start + chunk_rows], dtype=np.float64)
+
+
+# Двоичный файл точек как массив (N, 2) в памяти
+def _open_binary(path, dtype):
+    """
+    .npy - массив формы (N, 2) или одномерный четной длины (x0, y0, x1, y1, ...),
+    сырой файл - пары чисел dtype подряд. Файл другой формы или длины
+    (например, обрезанный) - ValueError с именем файла, а не ошибка reshape.
+    """
+    if path.suffix == ".npy":
+        points = np.load(path, mmap_mode="r")
+        if not (points.ndim == 2 and points.shape[1] == 2 or points.ndim == 1 and points.size % 2 == 0):
+            raise ValueError(f"{path}: нужен массив точек формы (N, 2) или одномерный четной длины, "
+                             f"а не формы {points.shape}.")
+        return points.reshape(-1, 2)
+    itemsize = np.dtype(dtype).itemsize
+    size = path.stat().st_size
+    if size % (2 * itemsize):
+        raise ValueError(f"{path}: размер {size} байт не кратен размеру пары чисел {np.dtype(dtype).name} "
+                         f"({2 * itemsize} байт) - файл обрезан или записан с другим типом.")
+    if not size:
+        return np.empty((0, 2), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r").reshape(-1, 2)
+
+
+# Число точек в файле (для текста - число строк с данными по тем же правилам, что в read_points)
+def count_points(path, skiprows=0, dtype=np.float64, comments="#"):
+    path = Path(path)
+    if path.suffix not in TEXT_SUFFIXES:
+        return _open_binary(path, dtype).shape[0]
+    with open(path) as f:
+        return sum(1 for _ in _data_lines(f, skiprows, comments))
+
+
+# Преобразование файла точек порциями
+def convert_file(src, dst, source="cartesian", precision=None, chunk_rows=1 << 20, delimiter=",",
+                 skiprows=0, dtype=np.float64, fmt="%.17g", comments="#"):
+    """
+    Читает точки из src порциями по chunk_rows строк, преобразует каждую
+    порцию и сразу дописывает в dst, не загружая файл целиком.
+    Формат dst может отличаться от формата src.
+
+    Параметры:
+    - src, dst: пути к исходному файлу и к файлу результата
+    - source: система координат исходных точек ("cartesian" или "polar")
+    - precision: число знаков после запятой (None - без округления)
+    - chunk_rows: размер порции
+    - delimiter, skiprows, comments: разделитель столбцов, число строк заголовка
+      и символ комментария текстовых файлов
+    - dtype: тип чисел сырых двоичных файлов
+    - fmt: формат чисел при записи текста
+
+    Возвращает:
+    - число преобразованных точек
+    """
+    if source not in DIRECTIONS:
+        raise ValueError(f"Неизвестная система координат: {source}")
+    convert = cartesian_to_polar if source == "cartesian" else polar_to_cartesian
+    dst = Path(dst)
+
+    if dst.suffix == ".npy":
+        n = count_points(src, skiprows, dtype, comments)
+        out = np.lib.format.open_memmap(dst, mode="w+", dtype=np.float64, shape=(n, 2))
+        write = None
+    elif dst.suffix in TEXT_SUFFIXES:
+        out = open(dst, "w")
+        write = lambda chunk: np.savetxt(out, chunk, fmt=fmt, delimiter=delimiter)
+    else:
+        out = open(dst, "wb")
+        write = lambda chunk: out.write(chunk.astype(dtype, copy=False).tobytes())
+
+    done = 0
+    try:
+        for chunk in read_points(src, chunk_rows, delimiter, skiprows, dtype, comments):
+            # В .npy результат пишется сразу в отображенный файл, без промежуточной копии
+            result = out[done:done + chunk.shape[0]] if write is None else np.empty_like(chunk)
+            convert(chunk[:, 0], chunk[:, 1], precision, out=(result[:, 0], result[:, 1]))
+            if write is not None:
+                write(result)
+            done += chunk.shape[0]
+    finally:
+        if write is None:
+            out.flush()
+        else:
+            out.close()
+    return done
@@ -0,0 +1,51 @@
+"""
+Электростатика точечных зарядов: общие функции для заданий к лекциям 10, 12 и 13.
+"""
+
+from .accuracy import compare_with_direct, field_errors
+from .adaptive import AdaptiveField, adaptive_field, adaptive_solver
+from .cache import FieldCache, default_cache
+from .field import SOLVERS, compute_field
+from .kernel import (
+    charge_grid,
+    charges_to_arrays,
+    electric_field,
+    electric_potential,
+    field_and_potential,
+)
+from .lines import equipotential_lines, polylines, trace_field_lines
+from .mesh import far_field_mask, particle_mesh_accuracy, particle_mesh_field
+from .parallel import parallel_field
+from .query import dipole_force_and_torque, field_at, field_gradient_at
+from .state import FieldState
+from .tree import QuadTree, barnes_hut_field
+
+__all__ = [
+    "AdaptiveField",
+    "FieldCache",
+    "FieldState",
+    "QuadTree",
+    "SOLVERS",
+    "adaptive_field",
+    "adaptive_solver",
+    "barnes_hut_field",
+    "charge_grid",
+    "charges_to_arrays",
+    "compare_with_direct",
+    "compute_field",
+    "default_cache",
+    "dipole_force_and_torque",
+    "electric_field",
+    "electric_potential",
+    "equipotential_lines",
+    "field_and_potential",
+    "far_field_mask",
+    "field_at",
+    "field_errors",
+    "field_gradient_at",
+    "parallel_field",
+    "particle_mesh_accuracy",
+    "particle_mesh_field",
+    "polylines",
+    "trace_field_lines",
+]
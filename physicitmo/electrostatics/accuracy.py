@@ -0,0 +1,67 @@
+import numpy as np
+
+from .kernel import field_and_potential
+
+
+# Относительные ошибки приближенного поля
+def field_errors(reference, approximation, mask=None):
+    """
+    Сравнивает тройки (Ex, Ey, V) двух расчетов.
+
+    Параметры:
+    - reference: эталонные (Ex, Ey, V), например прямое суммирование
+    - approximation: проверяемые (Ex, Ey, V)
+    - mask: необязательная булева маска узлов, по которым ведется сравнение
+
+    Возвращает:
+    - словарь с относительной ошибкой в норме L2 и максимальной
+      относительной ошибкой для "E" (по модулю вектора) и "V"
+    """
+    ref_x, ref_y, ref_v = (np.asarray(a, dtype=np.float64) for a in reference)
+    app_x, app_y, app_v = (np.asarray(a, dtype=np.float64) for a in approximation)
+    if mask is None:
+        mask = np.ones(ref_v.shape, dtype=bool)
+
+    err_e = np.hypot(app_x - ref_x, app_y - ref_y)[mask]
+    norm_e = np.hypot(ref_x, ref_y)[mask]
+    err_v = np.abs(app_v - ref_v)[mask]
+    norm_v = np.abs(ref_v)[mask]
+
+    def ratio(a, b):
+        return float(a / b) if b > 0 else float(a)
+
+    return {
+        "E_l2": ratio(np.sqrt(np.sum(err_e ** 2)), np.sqrt(np.sum(norm_e ** 2))),
+        "E_max": ratio(err_e.max(initial=0.0), norm_e.max(initial=0.0)),
+        "V_l2": ratio(np.sqrt(np.sum(err_v ** 2)), np.sqrt(np.sum(norm_v ** 2))),
+        "V_max": ratio(err_v.max(initial=0.0), norm_v.max(initial=0.0)),
+        "points": int(np.count_nonzero(mask)),
+    }
+
+
+# Ошибка расчета относительно прямого суммирования
+def compare_with_direct(q, cx, cy, X, Y, fields, mask=None, sample=None, seed=0):
+    """
+    Считает эталон прямым суммированием и возвращает field_errors.
+
+    Параметры:
+    - q, cx, cy: заряды, для которых был получен fields
+    - X, Y: сетка, на которой был получен fields
+    - fields: проверяемые (Ex, Ey, V)
+    - mask: необязательная маска узлов для сравнения
+    - sample: если задано, эталон считается только в sample случайных узлах
+      (для больших сеток и большого числа зарядов)
+    - seed: зерно генератора для выбора узлов
+
+    Возвращает:
+    - словарь ошибок, как в field_errors
+    """
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    idx = np.flatnonzero(np.ones(X.shape, dtype=bool) if mask is None else mask)
+    if sample is not None and sample < idx.size:
+        idx = np.sort(np.random.default_rng(seed).choice(idx, size=sample, replace=False))
+
+    reference = field_and_potential(q, cx, cy, X.reshape(-1)[idx], Y.reshape(-1)[idx])
+    approximation = tuple(np.asarray(f).reshape(-1)[idx] for f in fields)
+    return field_errors(reference, approximation)
@@ -0,0 +1,191 @@
+import numpy as np
+
+from .kernel import field_and_potential
+from .mesh import grid_axes
+
+
+class AdaptiveField:
+    """
+    Поле, рассчитанное на адаптивной квадродревесной сетке.
+
+    Область bounds делится на base x base ячеек уровня 0; ячейка уровня l
+    делится на четыре ячейки уровня l + 1, пока на ней велика ошибка
+    билинейной интерполяции V или E (то есть велики их градиенты).
+    Все вершины ячеек лежат на общей решетке самого мелкого уровня
+    (base * 2^max_level ячеек по стороне), поэтому общие вершины соседних
+    ячеек вычисляются один раз.
+
+    Атрибуты:
+    - keys: номера вычисленных узлов решетки (j * (n + 1) + i), по возрастанию
+    - Ex, Ey, V: значения в этих узлах
+    - leaves: список (level, ci, cj) - листовые ячейки каждого уровня
+    """
+
+    def __init__(self, bounds, base, max_level):
+        self.bounds = tuple(float(b) for b in bounds)
+        x_min, x_max, y_min, y_max = self.bounds
+        if x_max <= x_min or y_max <= y_min:
+            raise ValueError("Границы области должны удовлетворять x_min < x_max и y_min < y_max.")
+        self.base = base
+        self.max_level = max_level
+        self.n = base << max_level  # ячеек самого мелкого уровня по стороне
+        self.hx = (x_max - x_min) / self.n
+        self.hy = (y_max - y_min) / self.n
+        self.keys = np.empty(0, dtype=np.int64)
+        self.Ex = self.Ey = self.V = np.empty(0)
+        self.leaves = []
+
+    @property
+    def n_evaluations(self):
+        """Сколько раз вычислялось поле (число узлов адаптивной сетки)."""
+        return self.keys.size
+
+    @property
+    def points(self):
+        """Координаты вычисленных узлов (x, y)."""
+        j, i = np.divmod(self.keys, self.n + 1)
+        return self.bounds[0] + i * self.hx, self.bounds[2] + j * self.hy
+
+    def _lookup(self, keys):
+        idx = np.searchsorted(self.keys, keys)
+        return self.Ex[idx], self.Ey[idx], self.V[idx]
+
+    def _evaluate(self, q, cx, cy, i, j, dtype):
+        """Досчитывает поле в еще не вычисленных узлах решетки (i, j)."""
+        keys = np.unique(j * (self.n + 1) + i)
+        new = keys[~np.isin(keys, self.keys, assume_unique=True)]
+        if new.size:
+            nj, ni = np.divmod(new, self.n + 1)
+            ex, ey, v = field_and_potential(q, cx, cy, self.bounds[0] + ni * self.hx,
+                                            self.bounds[2] + nj * self.hy, dtype=dtype)
+            keys = np.concatenate((self.keys, new))
+            order = np.argsort(keys, kind="stable")
+            self.keys = keys[order]
+            self.Ex = np.concatenate((self.Ex, ex))[order]
+            self.Ey = np.concatenate((self.Ey, ey))[order]
+            self.V = np.concatenate((self.V, v))[order]
+
+    def resample(self, X, Y):
+        """
+        Билинейная интерполяция поля в точки (X, Y) по листовым ячейкам
+        (для построения графиков на равномерной сетке).
+
+        Возвращает:
+        - Ex, Ey, V формы X.shape
+        """
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+        u = np.clip((X.reshape(-1) - self.bounds[0]) / self.hx, 0, self.n)
+        w = np.clip((Y.reshape(-1) - self.bounds[2]) / self.hy, 0, self.n)
+        fi = np.minimum(u.astype(np.int64), self.n - 1)
+        fj = np.minimum(w.astype(np.int64), self.n - 1)
+
+        # Для каждой точки ищем листовую ячейку, начиная с крупных уровней
+        level = np.full(u.size, -1)
+        for lv, ci, cj in self.leaves:
+            todo = np.flatnonzero(level < 0)
+            if not todo.size:
+                break
+            if not ci.size:
+                continue
+            side = self.base << lv
+            shift = self.max_level - lv
+            leaf_keys = np.sort(cj * side + ci)
+            k = (fj[todo] >> shift) * side + (fi[todo] >> shift)
+            pos = np.minimum(np.searchsorted(leaf_keys, k), leaf_keys.size - 1)
+            level[todo[leaf_keys[pos] == k]] = lv
+
+        s = 1 << (self.max_level - level)
+        i0 = (fi // s) * s
+        j0 = (fj // s) * s
+        tx = ((u - i0) / s)[:, None]
+        ty = ((w - j0) / s)[:, None]
+
+        def corner(i, j):
+            return np.stack(self._lookup(j * (self.n + 1) + i), axis=1)
+
+        result = (corner(i0, j0) * (1 - tx) * (1 - ty) + corner(i0 + s, j0) * tx * (1 - ty)
+                  + corner(i0, j0 + s) * (1 - tx) * ty + corner(i0 + s, j0 + s) * tx * ty)
+        return tuple(result[:, c].reshape(X.shape) for c in range(3))
+
+
+# Поле на адаптивной сетке
+def adaptive_field(q, cx, cy, bounds, base=16, max_level=6, tol=0.02, dtype=np.float64):
+    """
+    Строит адаптивную сетку и вычисляет на ней Ex, Ey и V.
+
+    Ячейка делится, если в ее центре значение V отличается от среднего по
+    вершинам больше чем на tol от характерного масштаба V (95-й перцентиль
+    |V| на начальной сетке) или вектор E отличается от среднего по вершинам
+    больше чем на tol от |E| в центре. Вблизи зарядов ячейки мельчают до
+    max_level, вдали остаются крупными.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - bounds: (x_min, x_max, y_min, y_max)
+    - base: число ячеек уровня 0 по стороне
+    - max_level: максимальная глубина деления
+    - tol: допустимая ошибка интерполяции
+    - dtype: тип элементов результата
+
+    Возвращает:
+    - AdaptiveField
+    """
+    q = np.ravel(np.asarray(q, dtype=np.float64))
+    cx = np.ravel(np.asarray(cx, dtype=np.float64))
+    cy = np.ravel(np.asarray(cy, dtype=np.float64))
+    result = AdaptiveField(bounds, base, max_level)
+
+    cj, ci = np.divmod(np.arange(base * base), base)
+    v_scale = None
+    for level in range(max_level + 1):
+        if not ci.size:
+            break
+        s = 1 << (max_level - level)
+        i0, j0 = ci * s, cj * s
+        ii = np.stack((i0, i0 + s, i0, i0 + s))
+        jj = np.stack((j0, j0, j0 + s, j0 + s))
+        if level == max_level:
+            result._evaluate(q, cx, cy, ii.ravel(), jj.ravel(), dtype)
+            result.leaves.append((level, ci, cj))
+            break
+
+        mi, mj = i0 + s // 2, j0 + s // 2
+        result._evaluate(q, cx, cy, np.concatenate((ii.ravel(), mi)), np.concatenate((jj.ravel(), mj)), dtype)
+        ex, ey, v = result._lookup(jj * (result.n + 1) + ii)
+        mex, mey, mv = result._lookup(mj * (result.n + 1) + mi)
+
+        if v_scale is None:
+            v_scale = np.percentile(np.abs(v), 95) or 1.0
+        err_v = np.abs(mv - v.mean(axis=0)) / v_scale
+        err_e = np.hypot(mex - ex.mean(axis=0), mey - ey.mean(axis=0)) / (np.hypot(mex, mey) + 1e-300)
+        refine = (err_v > tol) | (err_e > tol)
+
+        result.leaves.append((level, ci[~refine], cj[~refine]))
+        ci = (2 * ci[refine][:, None] + np.array([0, 1, 0, 1])).ravel()
+        cj = (2 * cj[refine][:, None] + np.array([0, 0, 1, 1])).ravel()
+
+    return result
+
+
+# Адаптивный метод в интерфейсе compute_field
+def adaptive_solver(q, cx, cy, X, Y, dtype=np.float64, out=None, base=16, tol=0.02, max_level=None):
+    """
+    Считает поле на адаптивной сетке в границах равномерной сетки (X, Y)
+    и интерполирует его в ее узлы. По умолчанию max_level подбирается так,
+    чтобы самые мелкие ячейки были не крупнее шага (X, Y).
+
+    Возвращает:
+    - Ex, Ey, V формы X.shape
+    """
+    x, y, _, _ = grid_axes(X, Y)
+    if max_level is None:
+        max_level = max(0, int(np.ceil(np.log2(max(x.size, y.size) / base))))
+    field = adaptive_field(q, cx, cy, (x[0], x[-1], y[0], y[-1]), base=base,
+                           max_level=max_level, tol=tol, dtype=dtype)
+    fields = field.resample(X, Y)
+    if out is None:
+        return tuple(f.astype(dtype, copy=False) for f in fields)
+    for acc, f in zip(out, fields):
+        acc += f
+    return out
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 ГиБ
+
+
+class FieldCache:
+    """
+    Дисковый кэш рассчитанных сеток (Ex, Ey, V).
+
+    Ключ - хэш SHA-256 от зарядов, осей сетки (границы и разрешение),
+    метода расчета, типа данных и параметров метода (None, bool, числа,
+    строки и числовые массивы и скаляры numpy с типом и формой; с
+    параметрами других типов ключ не строится и расчет идет мимо кэша).
+    Каждая запись - один файл <ключ>.npy с массивом формы (3, ny, nx), который
+    читается через np.load(mmap_mode="r"), то есть без копирования в память.
+
+    Суммарный размер ограничен max_bytes: при превышении удаляются записи,
+    к которым дольше всего не обращались (время обращения хранится в mtime
+    файла). Запись больше max_bytes целиком не сохраняется.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get("PHYSICITMO_CACHE") or Path.home() / ".cache" / "physicitmo" / "fields"
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(q, cx, cy, X, Y, solver, dtype, options=None):
+        """
+        Строит ключ записи для расчета compute_field с этими аргументами.
+        Возвращает None, если какой-либо параметр из options нельзя
+        однозначно записать в ключ (такой расчет не кэшируется).
+        """
+        h = hashlib.sha256()
+
+        def feed(arr):
+            arr = np.ascontiguousarray(arr, dtype=np.float64)
+            h.update(str(arr.shape).encode())
+            h.update(arr.tobytes())
+
+        for arr in (q, cx, cy):
+            feed(np.ravel(arr))
+        X = np.asarray(X)
+        Y = np.asarray(Y)
+        if X.ndim == 2 and np.array_equal(X, np.broadcast_to(X[0, :], X.shape)) \
+                and np.array_equal(Y, np.broadcast_to(Y[:, :1], Y.shape)):
+            # Сетка np.meshgrid полностью задается своими осями
+            feed(X[0, :])
+            feed(Y[:, 0])
+        else:
+            feed(X)
+            feed(Y)
+        h.update(str(X.shape).encode())
+        h.update(str(solver).encode())
+        h.update(np.dtype(dtype).str.encode())
+        for name, value in sorted((options or {}).items()):
+            if value is None or type(value) in (bool, int, float, str):
+                h.update(f"{name}={value!r};".encode())
+                continue
+            if not isinstance(value, (np.ndarray, np.generic)):
+                return None
+            arr = np.ascontiguousarray(value)
+            if arr.dtype.kind not in "biufc":
+                return None
+            # Тип и форма входят в ключ: np.float32(0.3) и 0.3 - разные параметры
+            h.update(f"{name}:{arr.dtype.str}{arr.shape}=".encode())
+            h.update(arr.tobytes())
+            h.update(b";")
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def get(self, key):
+        """Возвращает (Ex, Ey, V) только для чтения из файла или None, если записи нет."""
+        path = self._path(key)
+        try:
+            data = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        try:
+            os.utime(path)  # отмечаем обращение для вытеснения LRU
+        except OSError:
+            pass
+        return data[0], data[1], data[2]
+
+    def put(self, key, fields):
+        """
+        Сохраняет (Ex, Ey, V) и при необходимости вытесняет старые записи.
+        Запись больше max_bytes не сохраняется (иначе она вытеснила бы все
+        остальные записи, а затем и саму себя).
+        """
+        Ex, Ey, V = (np.asarray(f) for f in fields)
+        if 3 * Ex.nbytes > self.max_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            data = np.lib.format.open_memmap(tmp, mode="w+", dtype=Ex.dtype, shape=(3,) + Ex.shape)
+            data[0], data[1], data[2] = Ex, Ey, V
+            data.flush()
+            del data
+            os.replace(tmp, self._path(key))  # атомарная запись
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Список (mtime, размер, путь) всех записей."""
+        result = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            result.append((st.st_mtime, st.st_size, path))
+        return result
+
+    def size(self):
+        """Суммарный размер записей в байтах."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Удаляет давно не использованные записи, пока размер кэша больше max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Удаляет все записи."""
+        for _, _, path in self.entries():
+            path.unlink(missing_ok=True)
+
+
+_default_cache = None
+
+
+# Общий кэш для скриптов
+def default_cache():
+    """
+    Кэш в каталоге из переменной окружения PHYSICITMO_CACHE
+    (по умолчанию ~/.cache/physicitmo/fields). Если каталог недоступен
+    для записи, возвращает None и расчеты идут без кэша.
+    """
+    global _default_cache
+    if _default_cache is None:
+        try:
+            _default_cache = FieldCache()
+        except OSError:
+            return None
+    return _default_cache
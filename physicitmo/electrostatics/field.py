@@ -0,0 +1,61 @@
+import numpy as np
+
+from .adaptive import adaptive_solver
+from .kernel import field_and_potential
+from .mesh import particle_mesh_field
+from .parallel import parallel_field
+from .tree import barnes_hut_field
+
+# Доступные методы расчета; у всех одинаковая сигнатура
+# solver(q, cx, cy, X, Y, dtype=..., **options) -> (Ex, Ey, V)
+SOLVERS = {
+    "direct": field_and_potential,
+    "parallel": parallel_field,
+    "tree": barnes_hut_field,
+    "mesh": particle_mesh_field,
+    "adaptive": adaptive_solver,
+}
+
+
+# Поле и потенциал системы зарядов выбранным методом
+def compute_field(q, cx, cy, X, Y, solver="direct", dtype=np.float64, cache=None, **options):
+    """
+    Единая точка входа для расчета (Ex, Ey, V) на сетке.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - X, Y: координаты расчетных точек
+    - solver: имя метода из SOLVERS ("direct" - прямое суммирование,
+      "parallel" - то же на нескольких ядрах, "tree" - метод Барнса-Хата, "mesh" - метод частица-сетка через БПФ,
+      "adaptive" - адаптивная сетка с интерполяцией в узлы; последние два
+      только для равномерной сетки)
+    - dtype: тип элементов результата
+    - cache: необязательный FieldCache; при попадании результат читается
+      с диска без копирования (массивы только для чтения), при промахе
+      рассчитывается и сохраняется. С параметром out и с параметрами
+      метода, которые нельзя записать в ключ (см. FieldCache.key), кэш
+      не используется
+    - options: параметры конкретного метода (например, theta для "tree")
+
+    Возвращает:
+    - Ex, Ey, V: компоненты поля и потенциал
+    """
+    try:
+        method = SOLVERS[solver]
+    except KeyError:
+        raise ValueError(f"Неизвестный метод расчета поля: {solver}. Доступны: {', '.join(SOLVERS)}.") from None
+
+    key = None
+    if cache is not None and options.get("out") is None:
+        key = cache.key(q, cx, cy, X, Y, solver, dtype, options)
+    if key is None:
+        return method(q, cx, cy, X, Y, dtype=dtype, **options)
+
+    fields = cache.get(key)
+    if fields is None:
+        fields = method(q, cx, cy, X, Y, dtype=dtype, **options)
+        try:
+            cache.put(key, fields)
+        except OSError:
+            pass  # кэш только ускоряет повторные расчеты, ошибка записи не мешает результату
+    return fields
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+# Функция для вычисления электрического поля от точечного заряда
+def electric_field(q, r0, x, y):
+    """
+    Вычисляет компоненты электрического поля (Ex, Ey) в точке (x, y)
+    от точечного заряда q, расположенного в r0 (x0, y0).
+
+    Параметры:
+    - q: величина заряда
+    - r0: координаты заряда (x0, y0)
+    - x, y: координаты расчетной точки
+
+    Возвращает:
+    - Ex, Ey: компоненты электрического поля
+    """
+    rx = x - r0[0]
+    ry = y - r0[1]
+    r = np.sqrt(rx ** 2 + ry ** 2)
+    r3 = r ** 3 + 1e-12  # добавляем малую величину, чтобы избежать деления на 0
+    Ex = q * rx / r3
+    Ey = q * ry / r3
+    return Ex, Ey
+
+
+# Функция для вычисления потенциала от точечного заряда
+def electric_potential(q, r0, x, y):
+    """
+    Вычисляет электрический потенциал в точке (x, y)
+    от точечного заряда q, расположенного в r0 (x0, y0).
+
+    Параметры:
+    - q: величина заряда
+    - r0: координаты заряда (x0, y0)
+    - x, y: координаты расчетной точки
+
+    Возвращает:
+    - V: значение потенциала
+    """
+    rx = x - r0[0]
+    ry = y - r0[1]
+    r = np.sqrt(rx ** 2 + ry ** 2)
+    r = np.maximum(r, 1e-12)  # избегаем деления на 0
+    V = q / r
+    return V
+
+
+# Перевод списка зарядов [(q, (x, y)), ...] в массивы
+def charges_to_arrays(charges, dtype=np.float64):
+    """
+    Преобразует список зарядов в формате get_user_input() в три массива.
+
+    Параметры:
+    - charges: список пар (q, (x, y))
+    - dtype: тип элементов результирующих массивов
+
+    Возвращает:
+    - q, cx, cy: величины зарядов и их координаты
+    """
+    data = np.asarray([(q, pos[0], pos[1]) for q, pos in charges], dtype=dtype).reshape(-1, 3)
+    return data[:, 0].copy(), data[:, 1].copy(), data[:, 2].copy()
+
+
+# Границы области и сетка для расчетов по расположению зарядов
+def charge_grid(cx, cy, padding=5, resolution=200):
+    """
+    Строит равномерную сетку, охватывающую все заряды с отступом padding.
+
+    Возвращает:
+    - X, Y: узлы сетки (результат np.meshgrid)
+    """
+    x_min, x_max = np.min(cx) - padding, np.max(cx) + padding  # Добавляем отступы по X
+    y_min, y_max = np.min(cy) - padding, np.max(cy) + padding  # Добавляем отступы по Y
+
+    x = np.linspace(x_min, x_max, resolution)
+    y = np.linspace(y_min, y_max, resolution)
+    return np.meshgrid(x, y)
+
+
+# Выходные массивы (Ex, Ey, V): новые нулевые или проверенные переданные
+def output_arrays(out, shape, dtype):
+    if out is None:
+        return tuple(np.zeros(shape, dtype=dtype) for _ in range(3))
+    if len(out) != 3:
+        raise ValueError("out должен быть тройкой массивов (Ex, Ey, V).")
+    for arr in out:
+        if arr.shape != tuple(shape) or arr.dtype != dtype or not arr.flags.c_contiguous:
+            raise ValueError("Выходные массивы должны быть непрерывными и совпадать с X по форме и типу.")
+    return tuple(out)
+
+
+# Поле и потенциал системы зарядов за один проход
+def field_and_potential(q, cx, cy, X, Y, dtype=np.float64, out=None,
+                        charge_chunk=256, tile_size=4096):
+    """
+    Вычисляет Ex, Ey и V от всех зарядов сразу, используя broadcasting.
+
+    Заряды обрабатываются блоками по charge_chunk штук, узлы сетки -
+    плитками по tile_size узлов, поэтому пиковая дополнительная память
+    ограничена четырьмя буферами размера charge_chunk * tile_size и не
+    зависит ни от числа зарядов, ни от размера сетки. Результат накапливается
+    на месте. Регуляризация на заряде та же, что в electric_field и
+    electric_potential.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - X, Y: координаты расчетных точек (массивы одинаковой формы)
+    - dtype: np.float64 или np.float32 (экономия памяти и времени)
+    - out: необязательная тройка массивов (Ex, Ey, V) формы X.shape;
+      вклад зарядов прибавляется к их содержимому
+    - charge_chunk, tile_size: размеры блоков по зарядам и по узлам
+
+    Возвращает:
+    - Ex, Ey, V: компоненты поля и потенциал
+    """
+    dtype = np.dtype(dtype)
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    if X.shape != Y.shape:
+        raise ValueError("Массивы X и Y должны иметь одинаковую форму.")
+
+    Ex, Ey, V = output_arrays(out, X.shape, dtype)
+
+    q = np.ravel(np.asarray(q, dtype=dtype))
+    cx = np.ravel(np.asarray(cx, dtype=dtype))
+    cy = np.ravel(np.asarray(cy, dtype=dtype))
+    n_charges, n_points = q.size, X.size
+    if n_charges == 0 or n_points == 0:
+        return Ex, Ey, V
+
+    xs, ys = X.reshape(-1), Y.reshape(-1)
+    ex, ey, v = Ex.reshape(-1), Ey.reshape(-1), V.reshape(-1)
+
+    chunk = min(charge_chunk, n_charges)
+    tile = min(tile_size, n_points)
+    rx = np.empty((chunk, tile), dtype=dtype)
+    ry = np.empty_like(rx)
+    r = np.empty_like(rx)
+    s = np.empty_like(rx)
+
+    for p0 in range(0, n_points, tile):
+        p1 = min(p0 + tile, n_points)
+        xt = xs[p0:p1].astype(dtype, copy=False)
+        yt = ys[p0:p1].astype(dtype, copy=False)
+        for c0 in range(0, n_charges, chunk):
+            c1 = min(c0 + chunk, n_charges)
+            qc = q[c0:c1]
+            bx, by, br, bs = (buf[:c1 - c0, :p1 - p0] for buf in (rx, ry, r, s))
+
+            np.subtract(xt, cx[c0:c1, None], out=bx)
+            np.subtract(yt, cy[c0:c1, None], out=by)
+            np.multiply(bx, bx, out=br)
+            np.multiply(by, by, out=bs)
+            br += bs
+            np.sqrt(br, out=br)
+
+            # 1 / (r^3 + eps) для поля
+            np.multiply(br, br, out=bs)
+            bs *= br
+            bs += 1e-12  # добавляем малую величину, чтобы избежать деления на 0
+            np.reciprocal(bs, out=bs)
+
+            # 1 / max(r, eps) для потенциала
+            np.maximum(br, 1e-12, out=br)  # избегаем деления на 0
+            np.reciprocal(br, out=br)
+
+            bx *= bs
+            by *= bs
+            ex[p0:p1] += qc @ bx
+            ey[p0:p1] += qc @ by
+            v[p0:p1] += qc @ br
+
+    return Ex, Ey, V
@@ -0,0 +1,253 @@
+import numpy as np
+
+from .query import field_at
+
+# Таблица марширующих квадратов. Вершины ячейки: 0 - (i, j), 1 - (i+1, j),
+# 2 - (i+1, j+1), 3 - (i, j+1); бит k номера случая - вершина k выше уровня.
+# Ребра: 0 - нижнее (0-1), 1 - правое (1-2), 2 - верхнее (2-3), 3 - левое (3-0).
+# Для каждого случая - до двух отрезков (пары ребер), -1 - отрезка нет.
+# Неоднозначные случаи 5 и 10 здесь записаны для центра ниже уровня.
+_CASES = np.full((16, 2, 2), -1, dtype=np.int64)
+for _case, _segments in {
+    1: [(3, 0)], 2: [(0, 1)], 3: [(3, 1)], 4: [(1, 2)], 5: [(3, 0), (1, 2)],
+    6: [(0, 2)], 7: [(3, 2)], 8: [(2, 3)], 9: [(0, 2)], 10: [(0, 1), (2, 3)],
+    11: [(1, 2)], 12: [(3, 1)], 13: [(0, 1)], 14: [(3, 0)],
+}.items():
+    _CASES[_case, :len(_segments)] = _segments
+_CASES_CENTER_ABOVE = _CASES.copy()
+_CASES_CENTER_ABOVE[5] = [(0, 1), (2, 3)]
+_CASES_CENTER_ABOVE[10] = [(3, 0), (1, 2)]
+
+
+# Эквипотенциальные линии методом марширующих квадратов
+def equipotential_lines(X, Y, V, levels):
+    """
+    Находит изолинии V на сетке np.meshgrid без matplotlib.
+
+    Параметры:
+    - X, Y: узлы сетки
+    - V: значения потенциала в узлах
+    - levels: уровни потенциала (число - количество равномерных уровней
+      между V.min() и V.max())
+
+    Возвращает:
+    - segments: массив отрезков формы (M, 2, 2) - пары точек (x, y),
+      его можно сразу передать в matplotlib.collections.LineCollection
+    - segment_levels: уровень потенциала каждого отрезка, форма (M,)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    V = np.asarray(V, dtype=np.float64)
+    if np.ndim(levels) == 0:
+        levels = np.linspace(V.min(), V.max(), int(levels))
+    levels = np.asarray(levels, dtype=np.float64)
+
+    # Значения и координаты в вершинах всех ячеек: порядок 0, 1, 2, 3
+    corner = (np.s_[:-1, :-1], np.s_[:-1, 1:], np.s_[1:, 1:], np.s_[1:, :-1])
+    cv = np.stack([V[c].ravel() for c in corner])
+    cxs = np.stack([X[c].ravel() for c in corner])
+    cys = np.stack([Y[c].ravel() for c in corner])
+    center = cv.mean(axis=0)
+    edge_a = np.array([0, 1, 2, 3])
+    edge_b = np.array([1, 2, 3, 0])
+
+    all_segments = []
+    all_levels = []
+    for level in levels:
+        above = cv > level
+        case = above[0] * 1 + above[1] * 2 + above[2] * 4 + above[3] * 8
+        cells = np.flatnonzero((case != 0) & (case != 15))
+        if not cells.size:
+            continue
+        table = np.where((center[cells] > level)[:, None, None], _CASES_CENTER_ABOVE[case[cells]], _CASES[case[cells]])
+
+        # Точки пересечения уровня со всеми четырьмя ребрами выбранных ячеек
+        va, vb = cv[edge_a][:, cells], cv[edge_b][:, cells]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(np.where(vb != va, (level - va) / (vb - va), 0.5), 0.0, 1.0)
+        ex = cxs[edge_a][:, cells] + t * (cxs[edge_b][:, cells] - cxs[edge_a][:, cells])
+        ey = cys[edge_a][:, cells] + t * (cys[edge_b][:, cells] - cys[edge_a][:, cells])
+
+        for k in range(2):
+            valid = table[:, k, 0] >= 0
+            idx = np.flatnonzero(valid)
+            e0, e1 = table[idx, k, 0], table[idx, k, 1]
+            seg = np.empty((idx.size, 2, 2))
+            seg[:, 0, 0], seg[:, 0, 1] = ex[e0, idx], ey[e0, idx]
+            seg[:, 1, 0], seg[:, 1, 1] = ex[e1, idx], ey[e1, idx]
+            all_segments.append(seg)
+            all_levels.append(np.full(idx.size, level))
+
+    if not all_segments:
+        return np.empty((0, 2, 2)), np.empty(0)
+    return np.concatenate(all_segments), np.concatenate(all_levels)
+
+
+# Силовые линии, начинающиеся у зарядов
+def trace_field_lines(q, cx, cy, bounds, seeds_per_charge=16, seed_radius=None, step=None, max_steps=2000,
+                      charge_chunk=256, max_lines=512, grid=None):
+    """
+    Строит силовые линии, выпуская seeds_per_charge линий по окружности
+    радиуса seed_radius вокруг каждого заряда: от положительных зарядов -
+    по полю, от отрицательных - против поля. Все линии продвигаются
+    одновременно одним массивом (метод Рунге-Кутты 4-го порядка по длине
+    дуги с шагом step); линия останавливается, выйдя за границы bounds,
+    подойдя к другому заряду ближе seed_radius / 2 или попав в точку,
+    где поле обращается в ноль.
+
+    Без grid поле в точках линий суммируется по всем зарядам (field_at),
+    то есть шаг стоит O(линии * заряды). С grid поле берется билинейной
+    интерполяцией из уже рассчитанной сетки, а линия останавливается,
+    войдя в ячейку сетки с другим зарядом: шаг стоит O(линии) при любом
+    числе зарядов.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - bounds: (x_min, x_max, y_min, y_max)
+    - seeds_per_charge: число линий от каждого заряда
+    - seed_radius: радиус окружности затравок (по умолчанию 1% размера области)
+    - step: шаг по длине дуги (по умолчанию половина seed_radius)
+    - max_steps: максимальное число шагов каждой линии
+    - charge_chunk: по сколько зарядов проверять расстояние до линий за раз
+      (память проверки - число линий * charge_chunk, как в field_and_potential)
+    - max_lines: наибольшее общее число линий; если зарядов больше, чем
+      max_lines // seeds_per_charge, линии выпускаются только от зарядов
+      с наибольшими |q|
+    - grid: необязательная тройка (X, Y, Ex, Ey) - поле на сетке np.meshgrid
+      (например, из compute_field)
+
+    Возвращает:
+    - vertices: массив точек всех линий подряд, форма (N, 2)
+    - offsets: линия k - это vertices[offsets[k]:offsets[k + 1]]
+    """
+    q = np.ravel(np.asarray(q, dtype=np.float64))
+    cx = np.ravel(np.asarray(cx, dtype=np.float64))
+    cy = np.ravel(np.asarray(cy, dtype=np.float64))
+    x_min, x_max, y_min, y_max = bounds
+    if seed_radius is None:
+        seed_radius = 0.01 * max(x_max - x_min, y_max - y_min)
+    if step is None:
+        step = seed_radius / 2
+
+    # Затравки на окружностях вокруг заряженных точек (не больше max_lines линий)
+    charged = np.flatnonzero(q != 0)
+    limit = max(1, max_lines // seeds_per_charge)
+    if charged.size > limit:
+        charged = np.sort(charged[np.argsort(-np.abs(q[charged]), kind="stable")[:limit]])
+    angles = 2 * np.pi * np.arange(seeds_per_charge) / seeds_per_charge
+    px = (cx[charged, None] + seed_radius * np.cos(angles)).ravel()
+    py = (cy[charged, None] + seed_radius * np.sin(angles)).ravel()
+    sign = np.repeat(np.sign(q[charged]), seeds_per_charge)
+    n = px.size
+
+    # Точки пишутся порциями по шагам: номера линий и координаты
+    line_ids, xs, ys = [np.arange(n)], [px.copy()], [py.copy()]
+    active = np.arange(n)
+    stop2 = (seed_radius / 2) ** 2
+
+    if grid is None:
+        def field(x, y):
+            return field_at(q, cx, cy, x, y)[:2]
+
+        def near_charge(x, y):
+            return _nearest_charge2(x, y, cx, cy, charge_chunk) <= stop2
+    else:
+        interpolator = _GridField(*grid)
+        charged_cells = interpolator.charged_cells(cx[q != 0], cy[q != 0])
+        own = np.repeat(interpolator.cell(cx[charged], cy[charged]), seeds_per_charge)
+
+        def field(x, y):
+            return interpolator(x, y)
+
+        def near_charge(x, y):
+            cell = interpolator.cell(x, y)
+            return charged_cells[cell] & (cell != own[active])
+
+    def direction(x, y, s):
+        ex, ey = field(x, y)
+        norm = np.hypot(ex, ey)
+        safe = np.where(norm > 0, norm, 1.0)
+        return s * ex / safe, s * ey / safe, norm
+
+    for _ in range(max_steps):
+        if not active.size:
+            break
+        x, y, s = px[active], py[active], sign[active]
+        k1x, k1y, norm = direction(x, y, s)
+        k2x, k2y, _ = direction(x + step / 2 * k1x, y + step / 2 * k1y, s)
+        k3x, k3y, _ = direction(x + step / 2 * k2x, y + step / 2 * k2y, s)
+        k4x, k4y, _ = direction(x + step * k3x, y + step * k3y, s)
+        x = x + step / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+        y = y + step / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+
+        px[active], py[active] = x, y
+        line_ids.append(active)
+        xs.append(x)
+        ys.append(y)
+
+        # Досрочная остановка: граница, заряд или нулевое поле
+        inside = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+        alive = inside & ~near_charge(x, y) & (norm > 0)
+        active = active[alive]
+
+    # Устойчивая сортировка по номеру линии сохраняет порядок шагов внутри линии
+    line_ids = np.concatenate(line_ids)
+    order = np.argsort(line_ids, kind="stable")
+    vertices = np.column_stack((np.concatenate(xs)[order], np.concatenate(ys)[order]))
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(line_ids, minlength=n))))
+    return vertices, offsets
+
+
+class _GridField:
+    """Билинейная интерполяция (Ex, Ey) с прямоугольной сетки np.meshgrid."""
+
+    def __init__(self, X, Y, Ex, Ey):
+        self.xa = np.asarray(X, dtype=np.float64)[0, :]
+        self.ya = np.asarray(Y, dtype=np.float64)[:, 0]
+        self.Ex = np.asarray(Ex, dtype=np.float64)
+        self.Ey = np.asarray(Ey, dtype=np.float64)
+        self.shape = (self.ya.size - 1, self.xa.size - 1)  # число ячеек
+
+    def _locate(self, x, y):
+        ix = np.clip(np.searchsorted(self.xa, x, side="right") - 1, 0, self.shape[1] - 1)
+        iy = np.clip(np.searchsorted(self.ya, y, side="right") - 1, 0, self.shape[0] - 1)
+        return ix, iy
+
+    def cell(self, x, y):
+        """Номер ячейки (по строкам) для каждой точки; точки снаружи - в крайних ячейках."""
+        ix, iy = self._locate(x, y)
+        return iy * self.shape[1] + ix
+
+    def charged_cells(self, cx, cy):
+        """Булев массив по номерам ячеек: True, если в ячейке есть заряд из (cx, cy)."""
+        inside = (cx >= self.xa[0]) & (cx <= self.xa[-1]) & (cy >= self.ya[0]) & (cy <= self.ya[-1])
+        mask = np.zeros(self.shape[0] * self.shape[1], dtype=bool)
+        mask[self.cell(cx[inside], cy[inside])] = True
+        return mask
+
+    def __call__(self, x, y):
+        ix, iy = self._locate(x, y)
+        tx = np.clip((x - self.xa[ix]) / (self.xa[ix + 1] - self.xa[ix]), 0.0, 1.0)
+        ty = np.clip((y - self.ya[iy]) / (self.ya[iy + 1] - self.ya[iy]), 0.0, 1.0)
+        result = []
+        for F in (self.Ex, self.Ey):
+            bottom = F[iy, ix] * (1 - tx) + F[iy, ix + 1] * tx
+            top = F[iy + 1, ix] * (1 - tx) + F[iy + 1, ix + 1] * tx
+            result.append(bottom * (1 - ty) + top * ty)
+        return result
+
+
+# Квадрат расстояния от каждой точки до ближайшего заряда, по блокам зарядов
+def _nearest_charge2(x, y, cx, cy, charge_chunk):
+    nearest = np.full(x.shape, np.inf)
+    for c0 in range(0, cx.size, charge_chunk):
+        bx = x[:, None] - cx[None, c0:c0 + charge_chunk]
+        by = y[:, None] - cy[None, c0:c0 + charge_chunk]
+        np.minimum(nearest, (bx * bx + by * by).min(axis=1), out=nearest)
+    return nearest
+
+
+# Разбиение результата trace_field_lines на отдельные линии
+def polylines(vertices, offsets):
+    """Список массивов (n_k, 2) - по одному на линию (представления без копирования)."""
+    return [vertices[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
@@ -0,0 +1,174 @@
+import numpy as np
+
+from .accuracy import compare_with_direct
+from .kernel import output_arrays
+
+
+# Шаги равномерной сетки, построенной np.meshgrid
+def grid_axes(X, Y):
+    """
+    Извлекает оси x, y и шаги hx, hy из равномерной сетки np.meshgrid.
+
+    Возвращает:
+    - x, y, hx, hy
+    """
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    if X.ndim != 2 or X.shape != Y.shape or min(X.shape) < 2:
+        raise ValueError("Нужна двумерная сетка np.meshgrid размером не меньше 2x2.")
+    x = X[0, :].astype(np.float64)
+    y = Y[:, 0].astype(np.float64)
+    hx = (x[-1] - x[0]) / (x.size - 1)
+    hy = (y[-1] - y[0]) / (y.size - 1)
+    if hx <= 0 or hy <= 0 or not (np.allclose(np.diff(x), hx) and np.allclose(np.diff(y), hy)):
+        raise ValueError("Сетка должна быть равномерной и возрастающей по обеим осям.")
+    return x, y, hx, hy
+
+
+# Распределение зарядов по узлам сетки методом cloud-in-cell
+def deposit_cic(q, cx, cy, x, y):
+    """
+    Раздает каждый заряд четырем узлам окружающей ячейки с билинейными весами.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - x, y: оси равномерной сетки
+
+    Возвращает:
+    - rho: заряд в узлах, массив формы (len(y), len(x))
+    """
+    q = np.ravel(np.asarray(q, dtype=np.float64))
+    nx, ny = x.size, y.size
+    hx = (x[-1] - x[0]) / (nx - 1)
+    hy = (y[-1] - y[0]) / (ny - 1)
+    fx = (np.ravel(cx) - x[0]) / hx
+    fy = (np.ravel(cy) - y[0]) / hy
+    tol = 1e-9
+    if np.any((fx < -tol) | (fx > nx - 1 + tol) | (fy < -tol) | (fy > ny - 1 + tol)):
+        raise ValueError("Все заряды должны лежать внутри сетки.")
+
+    i = np.clip(np.floor(fx).astype(np.int64), 0, nx - 2)
+    j = np.clip(np.floor(fy).astype(np.int64), 0, ny - 2)
+    tx = np.clip(fx - i, 0.0, 1.0)
+    ty = np.clip(fy - j, 0.0, 1.0)
+
+    flat = j * nx + i
+    rho = np.bincount(flat, q * (1 - tx) * (1 - ty), minlength=nx * ny)
+    rho += np.bincount(flat + 1, q * tx * (1 - ty), minlength=nx * ny)
+    rho += np.bincount(flat + nx, q * (1 - tx) * ty, minlength=nx * ny)
+    rho += np.bincount(flat + nx + 1, q * tx * ty, minlength=nx * ny)
+    return rho.reshape(ny, nx)
+
+
+# Функция Грина 1/r на удвоенной (периодической) сетке
+def coulomb_green(nx, ny, hx, hy):
+    """
+    Значения 1/r для всех смещений между узлами сетки nx x ny,
+    уложенные в массив (2*ny, 2*nx) для свертки без периодических образов.
+
+    В нулевом смещении стоит среднее 1/r по ячейке hx x hy вокруг узла,
+    то есть собственный вклад размазанного заряда.
+    """
+    ox = np.arange(2 * nx)
+    oy = np.arange(2 * ny)
+    ox = np.where(ox <= nx, ox, ox - 2 * nx) * hx
+    oy = np.where(oy <= ny, oy, oy - 2 * ny) * hy
+    r = np.hypot(ox[None, :], oy[:, None])
+    r[0, 0] = 1.0
+    G = 1.0 / r
+
+    a, b = hx / 2, hy / 2
+    G[0, 0] = (a * np.arcsinh(b / a) + b * np.arcsinh(a / b)) / (a * b)
+    return G
+
+
+# Поле и потенциал методом частица-сетка
+def particle_mesh_field(q, cx, cy, X, Y, dtype=np.float64, out=None):
+    """
+    Вычисляет Ex, Ey и V на равномерной сетке за O(G log G), где G - число
+    узлов, независимо от количества зарядов.
+
+    Заряды раздаются узлам методом cloud-in-cell, потенциал находится
+    сверткой с функцией Грина 1/r через БПФ (с дополнением нулями до
+    удвоенного размера, чтобы не было периодических образов), а поле -
+    как E = -grad V конечными разностями.
+
+    Потенциал тот же, что у electric_potential (q / r), поэтому результат
+    сравним с прямым суммированием. Вблизи зарядов (в пределах нескольких
+    ячеек) поле сглажено - метод предназначен для плотных облаков зарядов,
+    где важно гладкое дальнее поле.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат (внутри сетки)
+    - X, Y: равномерная сетка np.meshgrid
+    - dtype, out: как в field_and_potential
+
+    Возвращает:
+    - Ex, Ey, V: компоненты поля и потенциал
+    """
+    dtype = np.dtype(dtype)
+    x, y, hx, hy = grid_axes(X, Y)
+    ny, nx = np.shape(X)
+    Ex, Ey, V = output_arrays(out, (ny, nx), dtype)
+    if np.size(q) == 0:
+        return Ex, Ey, V
+
+    rho = deposit_cic(q, cx, cy, x, y)
+    shape = (2 * ny, 2 * nx)
+    potential = np.fft.irfft2(np.fft.rfft2(rho, shape) * np.fft.rfft2(coulomb_green(nx, ny, hx, hy)), shape)
+    potential = potential[:ny, :nx]
+
+    dV_dy, dV_dx = np.gradient(potential, hy, hx)
+    Ex -= dV_dx
+    Ey -= dV_dy
+    V += potential
+    return Ex, Ey, V
+
+
+# Маска узлов, удаленных от всех зарядов
+def far_field_mask(cx, cy, X, Y, cells=4):
+    """
+    Отмечает узлы сетки, отстоящие от ближайшего заряда больше чем на cells
+    ячеек по каждой из осей (там сглаживание сеточного метода пренебрежимо).
+
+    Возвращает:
+    - булев массив формы X.shape
+    """
+    x, y, hx, hy = grid_axes(X, Y)
+    ny, nx = np.shape(X)
+    i = np.clip(np.rint((np.ravel(cx) - x[0]) / hx).astype(np.int64), 0, nx - 1)
+    j = np.clip(np.rint((np.ravel(cy) - y[0]) / hy).astype(np.int64), 0, ny - 1)
+    near = np.zeros((ny, nx), dtype=bool)
+    near[j, i] = True
+
+    # Расширяем отмеченные узлы квадратом (2*cells+1) x (2*cells+1) через префиксные суммы
+    s = np.zeros((ny + 1, nx + 1), dtype=np.int64)
+    s[1:, 1:] = np.cumsum(np.cumsum(near, axis=0), axis=1)
+    r0 = np.clip(np.arange(ny) - cells, 0, ny)
+    r1 = np.clip(np.arange(ny) + cells + 1, 0, ny)
+    c0 = np.clip(np.arange(nx) - cells, 0, nx)
+    c1 = np.clip(np.arange(nx) + cells + 1, 0, nx)
+    count = s[r1][:, c1] - s[r0][:, c1] - s[r1][:, c0] + s[r0][:, c0]
+    return count == 0
+
+
+# Точность сеточного метода относительно прямого суммирования
+def particle_mesh_accuracy(q, cx, cy, X, Y, cells=4, sample=20000, fields=None):
+    """
+    Сравнивает particle_mesh_field с прямым суммированием потенциала
+    (electric_potential) и поля в узлах вдали от зарядов (см. far_field_mask).
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - X, Y: равномерная сетка
+    - cells: ширина исключаемой окрестности зарядов в ячейках
+    - sample: число случайных узлов для эталона (None - все узлы)
+    - fields: уже посчитанные particle_mesh_field (Ex, Ey, V), если есть
+
+    Возвращает:
+    - словарь ошибок, как в field_errors
+    """
+    if fields is None:
+        fields = particle_mesh_field(q, cx, cy, X, Y)
+    mask = far_field_mask(cx, cy, X, Y, cells=cells)
+    return compare_with_direct(q, cx, cy, X, Y, fields, mask=mask, sample=sample)
@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .kernel import field_and_potential, output_arrays
+
+# Состояние процесса-исполнителя: заряды, оси сетки и выходной массив
+_worker = {}
+
+
+def _init_worker(q, cx, cy, x, y, dtype, tile_size, shm_name, path):
+    _worker.update(q=q, cx=cx, cy=cy, x=x, y=y, dtype=np.dtype(dtype), tile_size=tile_size)
+    shape = (3, y.size, x.size)
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker["shm"] = shm  # держим ссылку, пока жив процесс
+        _worker["out"] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    else:
+        _worker["out"] = np.load(path, mmap_mode="r+")
+
+
+def _compute_points(p0, p1):
+    """Считает узлы p0:p1 сетки (по строкам) и пишет их прямо в общий выходной массив."""
+    w = _worker
+    index = np.arange(p0, p1)
+    nx = w["x"].size
+    X, Y = w["x"][index % nx], w["y"][index // nx]
+    out = w["out"]
+    flat = out.reshape(3, -1)
+    field_and_potential(w["q"], w["cx"], w["cy"], X, Y, dtype=w["dtype"], tile_size=w["tile_size"],
+                        out=(flat[0, p0:p1], flat[1, p0:p1], flat[2, p0:p1]))
+    if isinstance(out, np.memmap):
+        out.flush()
+    return p1 - p0
+
+
+# Прямое суммирование на нескольких ядрах
+def parallel_field(q, cx, cy, X, Y, dtype=np.float64, out=None, workers=None,
+                   tile_points=1 << 18, path=None, tile_size=4096):
+    """
+    Вычисляет Ex, Ey и V прямым суммированием, разбивая узлы сетки (по
+    строкам) на полосы и считая их в пуле процессов.
+
+    Каждый процесс строит узлы своей полосы сам (по осям сетки) и пишет
+    результат прямо в общий массив формы (3, ny, nx): в разделяемой памяти
+    или, если задан path, в отображаемом в память файле .npy. Дополнительная
+    память на процесс ограничена размером полосы (около tile_points узлов).
+    Полосы начинаются с узлов, кратных tile_size, и их длина кратна
+    tile_size, поэтому ядро field_and_potential делит их на те же плитки,
+    что и при последовательном расчете с тем же tile_size: порядок
+    суммирования по зарядам в каждом узле тот же, и результат совпадает
+    с последовательным бит в бит при любом tile_points.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - X, Y: сетка np.meshgrid (оси могут быть неравномерными)
+    - dtype, out: как в field_and_potential
+    - workers: число процессов (по умолчанию os.cpu_count())
+    - tile_points: примерное число узлов в одной полосе (округляется вверх
+      до кратного tile_size)
+    - tile_size: размер плитки узлов в field_and_potential
+    - path: файл .npy для результата; тогда возвращаются представления
+      отображенного в память массива без копирования
+
+    Возвращает:
+    - Ex, Ey, V: компоненты поля и потенциал
+    """
+    dtype = np.dtype(dtype)
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    if X.ndim != 2 or X.shape != Y.shape:
+        raise ValueError("Нужна двумерная сетка np.meshgrid.")
+    x = X[0, :].copy()
+    y = Y[:, 0].copy()
+    if not (np.array_equal(X, np.broadcast_to(x, X.shape))
+            and np.array_equal(Y, np.broadcast_to(y[:, None], Y.shape))):
+        raise ValueError("Параллельный расчет поддерживает только сетки np.meshgrid.")
+    q = np.ravel(np.asarray(q, dtype=dtype))
+    cx = np.ravel(np.asarray(cx, dtype=dtype))
+    cy = np.ravel(np.asarray(cy, dtype=dtype))
+
+    ny, nx = X.shape
+    if out is not None:
+        out = output_arrays(out, X.shape, dtype)
+    n_points = ny * nx
+    strip = max(1, -(-tile_points // tile_size)) * tile_size
+    tiles = [(p0, min(p0 + strip, n_points)) for p0 in range(0, n_points, strip)]
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tiles)))
+    shape = (3, ny, nx)
+
+    shm = None
+    if path is not None:
+        result = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        result.flush()
+        init = (q, cx, cy, x, y, dtype.str, tile_size, None, str(path))
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        result = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        result.fill(0)
+        init = (q, cx, cy, x, y, dtype.str, tile_size, shm.name, None)
+
+    try:
+        if tiles:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init) as pool:
+                list(pool.map(_compute_points, *zip(*tiles)))
+
+        if out is not None:
+            for acc, f in zip(out, result):
+                acc += f
+            return out
+        if path is not None:
+            return result[0], result[1], result[2]
+        return result[0].copy(), result[1].copy(), result[2].copy()
+    finally:
+        if shm is not None:
+            del result
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,234 @@
+import numpy as np
+
+from .kernel import output_arrays
+
+MAX_DEPTH = 16  # глубина дерева; ячейка самого мелкого уровня - 1/2^16 корневой
+
+
+class QuadTree:
+    """
+    Квадродерево зарядов для метода Барнса-Хата.
+
+    Узлы хранятся в плоских массивах. Заряды отсортированы по коду Мортона,
+    поэтому заряды любого узла занимают непрерывный отрезок [start, end),
+    а дети одного узла идут в массивах подряд: child_start, child_count.
+
+    Для каждого узла хранится мультипольное разложение относительно центра
+    |q|-взвешенной массы: полный заряд Q и дипольный момент (px, py).
+    """
+
+    def __init__(self, q, cx, cy, leaf_size=8):
+        q = np.ravel(np.asarray(q, dtype=np.float64))
+        cx = np.ravel(np.asarray(cx, dtype=np.float64))
+        cy = np.ravel(np.asarray(cy, dtype=np.float64))
+        if q.size == 0:
+            raise ValueError("Для построения дерева нужен хотя бы один заряд.")
+
+        # Корневой квадрат, охватывающий все заряды
+        x_min, x_max = cx.min(), cx.max()
+        y_min, y_max = cy.min(), cy.max()
+        half = max(x_max - x_min, y_max - y_min, 1e-12) / 2 * (1 + 1e-9)
+        x0 = (x_min + x_max) / 2 - half
+        y0 = (y_min + y_max) / 2 - half
+
+        # Коды Мортона на решетке 2^MAX_DEPTH x 2^MAX_DEPTH
+        cells = 1 << MAX_DEPTH
+        ix = np.clip(((cx - x0) / (2 * half) * cells).astype(np.int64), 0, cells - 1)
+        iy = np.clip(((cy - y0) / (2 * half) * cells).astype(np.int64), 0, cells - 1)
+        codes = _interleave(ix) | (_interleave(iy) << 1)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+
+        self.order = order
+        self.q = q[order]
+        self.x = cx[order]
+        self.y = cy[order]
+
+        # Уровень за уровнем делим узлы, в которых больше leaf_size зарядов
+        starts, ends, levels, prefixes, parents = [np.array([0])], [np.array([q.size])], [0], [np.array([0])], []
+        level_nodes = [np.array([0])]
+        n_nodes = 1
+        child_start = [np.array([-1])]
+        child_count = [np.array([0])]
+        split = np.array([q.size > leaf_size])
+        level = 0
+        while split.any() and level < MAX_DEPTH:
+            level += 1
+            p_idx = level_nodes[-1][split]
+            p_start = starts[-1][split]
+            p_end = ends[-1][split]
+
+            # Все заряды делимых узлов и номер родителя для каждого из них
+            counts = p_end - p_start
+            owner = np.repeat(np.arange(p_idx.size), counts)
+            pos = np.repeat(p_start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            prefix = codes[pos] >> (2 * (MAX_DEPTH - level))
+
+            # Новый ребенок начинается там, где меняется родитель или префикс
+            first = np.ones(pos.size, dtype=bool)
+            first[1:] = (owner[1:] != owner[:-1]) | (prefix[1:] != prefix[:-1])
+            c_start = pos[first]
+            c_owner = owner[first]
+            c_end = np.empty_like(c_start)
+            c_end[:-1] = c_start[1:]
+            last_of_owner = np.ones(c_start.size, dtype=bool)
+            last_of_owner[:-1] = c_owner[1:] != c_owner[:-1]
+            c_end[last_of_owner] = p_end[c_owner[last_of_owner]]
+
+            c_idx = n_nodes + np.arange(c_start.size)
+            n_nodes += c_start.size
+
+            # Ссылки родителей на непрерывный блок детей
+            first_child = np.searchsorted(c_owner, np.arange(p_idx.size))
+            n_children = np.bincount(c_owner, minlength=p_idx.size)
+            child_start[-1] = child_start[-1].copy()
+            child_count[-1] = child_count[-1].copy()
+            child_start[-1][split] = c_idx[first_child]
+            child_count[-1][split] = n_children
+
+            starts.append(c_start)
+            ends.append(c_end)
+            levels.append(level)
+            prefixes.append(prefix[first])
+            level_nodes.append(c_idx)
+            child_start.append(np.full(c_start.size, -1))
+            child_count.append(np.zeros(c_start.size, dtype=np.int64))
+            split = (c_end - c_start) > leaf_size
+
+        self.start = np.concatenate(starts)
+        self.end = np.concatenate(ends)
+        self.child_start = np.concatenate(child_start)
+        self.child_count = np.concatenate(child_count)
+        self.size = np.concatenate([np.full(s.size, 2 * half / (1 << lv)) for s, lv in zip(starts, levels)])
+
+        # Мультипольные моменты через префиксные суммы по отсортированным зарядам
+        def segment_sum(values):
+            c = np.concatenate(([0.0], np.cumsum(values)))
+            return c[self.end] - c[self.start]
+
+        aq = np.abs(self.q)
+        self.charge = segment_sum(self.q)
+        weight = segment_sum(aq)
+        safe = np.where(weight > 0, weight, 1.0)
+        n = self.end - self.start
+        self.cx = np.where(weight > 0, segment_sum(aq * self.x) / safe, segment_sum(self.x) / n)
+        self.cy = np.where(weight > 0, segment_sum(aq * self.y) / safe, segment_sum(self.y) / n)
+        self.px = segment_sum(self.q * self.x) - self.charge * self.cx
+        self.py = segment_sum(self.q * self.y) - self.charge * self.cy
+
+    @property
+    def n_nodes(self):
+        return self.start.size
+
+
+def _interleave(v):
+    """Раздвигает биты 16-битного числа: b15..b0 -> 0b15..0b0."""
+    v = v & 0xFFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+# Поле и потенциал системы зарядов методом Барнса-Хата
+def barnes_hut_field(q, cx, cy, X, Y, dtype=np.float64, out=None, theta=0.5,
+                     leaf_size=8, target_chunk=4096, tree=None):
+    """
+    Вычисляет Ex, Ey и V приближенно за O(узлы сетки * log(заряды)).
+
+    Узел дерева размера s, видимый из расчетной точки на расстоянии d,
+    заменяется своим монопольным и дипольным вкладом, если s / d < theta.
+    Иначе он раскрывается, а в листьях заряды суммируются напрямую с той же
+    регуляризацией, что в field_and_potential. При theta -> 0 результат
+    совпадает с прямым суммированием.
+
+    Параметры:
+    - q, cx, cy: массивы величин зарядов и их координат
+    - X, Y: координаты расчетных точек
+    - dtype, out: как в field_and_potential
+    - theta: угол раскрытия (точность против скорости)
+    - leaf_size: максимальное число зарядов в листе
+    - target_chunk: сколько расчетных точек обходят дерево одновременно
+    - tree: готовое QuadTree для этих зарядов (чтобы не строить повторно)
+
+    Возвращает:
+    - Ex, Ey, V: компоненты поля и потенциал
+    """
+    dtype = np.dtype(dtype)
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    if X.shape != Y.shape:
+        raise ValueError("Массивы X и Y должны иметь одинаковую форму.")
+    if theta < 0:
+        raise ValueError("Угол раскрытия theta должен быть неотрицательным.")
+    Ex, Ey, V = output_arrays(out, X.shape, dtype)
+    if np.size(q) == 0 or X.size == 0:
+        return Ex, Ey, V
+    if tree is None:
+        tree = QuadTree(q, cx, cy, leaf_size=leaf_size)
+
+    xs = X.reshape(-1)
+    ys = Y.reshape(-1)
+    ex, ey, v = Ex.reshape(-1), Ey.reshape(-1), V.reshape(-1)
+    for t0 in range(0, xs.size, target_chunk):
+        t1 = min(t0 + target_chunk, xs.size)
+        fx, fy, fv = _traverse(tree, xs[t0:t1].astype(np.float64), ys[t0:t1].astype(np.float64), theta)
+        ex[t0:t1] += fx
+        ey[t0:t1] += fy
+        v[t0:t1] += fv
+    return Ex, Ey, V
+
+
+def _traverse(tree, xt, yt, theta):
+    """Обход дерева всеми точками порции одновременно по парам (точка, узел)."""
+    n = xt.size
+    fx = np.zeros(n)
+    fy = np.zeros(n)
+    fv = np.zeros(n)
+
+    targets = np.arange(n)
+    nodes = np.zeros(n, dtype=np.int64)
+    while targets.size:
+        dx = xt[targets] - tree.cx[nodes]
+        dy = yt[targets] - tree.cy[nodes]
+        d2 = dx * dx + dy * dy
+        accept = tree.size[nodes] ** 2 < theta * theta * d2
+
+        # Дальние узлы: монополь + диполь
+        if accept.any():
+            t, ddx, ddy, dd2 = targets[accept], dx[accept], dy[accept], d2[accept]
+            k = nodes[accept]
+            inv_d = 1.0 / np.sqrt(dd2)
+            inv_d3 = inv_d / dd2
+            p_dot_d = tree.px[k] * ddx + tree.py[k] * ddy
+            dip = 3.0 * p_dot_d * inv_d3 / dd2
+            fx += np.bincount(t, tree.charge[k] * ddx * inv_d3 + dip * ddx - tree.px[k] * inv_d3, minlength=n)
+            fy += np.bincount(t, tree.charge[k] * ddy * inv_d3 + dip * ddy - tree.py[k] * inv_d3, minlength=n)
+            fv += np.bincount(t, tree.charge[k] * inv_d + p_dot_d * inv_d3, minlength=n)
+
+        rest = ~accept
+        targets, nodes = targets[rest], nodes[rest]
+        leaf = tree.child_count[nodes] == 0
+
+        # Ближние листья: прямое суммирование по их зарядам
+        if leaf.any():
+            t, k = targets[leaf], nodes[leaf]
+            counts = tree.end[k] - tree.start[k]
+            t = np.repeat(t, counts)
+            j = np.repeat(tree.start[k] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            rx = xt[t] - tree.x[j]
+            ry = yt[t] - tree.y[j]
+            r = np.sqrt(rx * rx + ry * ry)
+            w = tree.q[j] / (r ** 3 + 1e-12)  # добавляем малую величину, чтобы избежать деления на 0
+            fx += np.bincount(t, w * rx, minlength=n)
+            fy += np.bincount(t, w * ry, minlength=n)
+            fv += np.bincount(t, tree.q[j] / np.maximum(r, 1e-12), minlength=n)  # избегаем деления на 0
+
+        # Близкие внутренние узлы раскрываем в детей
+        targets, nodes = targets[~leaf], nodes[~leaf]
+        counts = tree.child_count[nodes]
+        targets = np.repeat(targets, counts)
+        nodes = np.repeat(tree.child_start[nodes] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    return fx, fy, fv
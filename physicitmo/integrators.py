@@ -0,0 +1,295 @@
+"""
+Численные методы интегрирования обыкновенных дифференциальных уравнений
+вида dy/dt = f(t, y), общие для заданий на моделирование.
+"""
+
+import numpy as np
+
+# Коэффициенты метода Дормана-Принса 5(4)
+_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+_B4 = np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+_E = _B - _B4
+# Коэффициенты плотной выдачи 4-го порядка (Hairer, Wanner, DOPRI5)
+_D = np.array([-12715105075 / 11282082432, 0, 87487479700 / 32700410799, -10690763975 / 1880347072,
+               701980252875 / 199316789632, -1453857185 / 822651844, 69997945 / 29380423])
+
+
+class DenseSolution:
+    """
+    Результат solve_dopri5.
+
+    Атрибуты:
+    - t, y: принятые шаги (моменты времени и состояния)
+    - t_event, y_event: момент и состояние события (None, если его не было)
+    - nfev: число вычислений правой части
+
+    Вызов sol(t) возвращает состояние в любые моменты из [t[0], t[-1]]
+    по плотной выдаче метода (интерполяция 4-го порядка внутри шага).
+    """
+
+    def __init__(self, t, y, coeffs, t_event, y_event, nfev):
+        self.t = t
+        self.y = y
+        self._coeffs = coeffs
+        self.t_event = t_event
+        self.y_event = y_event
+        self.nfev = nfev
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        if self._coeffs is None:
+            raise ValueError("Плотная выдача не сохранялась (dense=False).")
+        if not self._coeffs.shape[0]:
+            return np.broadcast_to(self.y[0], t.shape + self.y[0].shape).copy()
+        seg = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, self.t.size - 2)
+        h = self.t[seg + 1] - self.t[seg]
+        theta = ((t - self.t[seg]) / h)[..., None]
+        theta1 = 1 - theta
+        r = self._coeffs[seg]
+        return r[..., 0, :] + theta * (r[..., 1, :] + theta1 * (r[..., 2, :] + theta * (r[..., 3, :] + theta1 * r[..., 4, :])))
+
+
+def _rms(v):
+    return np.sqrt(np.mean(v * v))
+
+
+# Адаптивный метод Дормана-Принса 5(4) с поиском события
+def solve_dopri5(fun, t_span, y0, rtol=1e-6, atol=1e-9, event=None, direction=-1, dense=True,
+                 max_steps=100000):
+    """
+    Интегрирует dy/dt = fun(t, y) вложенным методом Дормана-Принса 5(4)
+    с автоматическим выбором шага по допускам rtol, atol.
+
+    Если задано событие event(t, y), интегрирование останавливается, когда
+    event меняет знак в направлении direction (-1 - с плюса на минус,
+    +1 - с минуса на плюс, 0 - в любом). Момент события уточняется
+    методом Иллинойса по плотной выдаче внутри шага, а не с точностью
+    до шага.
+
+    Параметры:
+    - fun: правая часть fun(t, y), возвращает список или массив
+    - t_span: (t_start, t_end)
+    - y0: начальное состояние
+    - rtol, atol: относительный и абсолютный допуски
+    - event, direction: функция события и направление пересечения нуля
+    - dense: сохранять ли коэффициенты плотной выдачи
+    - max_steps: предельное число шагов
+
+    Возвращает:
+    - DenseSolution
+    """
+    t0, t_end = float(t_span[0]), float(t_span[1])
+    y = np.array(y0, dtype=np.float64)
+    f = np.asarray(fun(t0, y), dtype=np.float64)
+    nfev = 1
+
+    # Начальный шаг (Hairer, Norsett, Wanner, II.4)
+    scale = atol + rtol * np.abs(y)
+    d0, d1 = _rms(y / scale), _rms(f / scale)
+    h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = np.asarray(fun(t0 + h, y + h * f), dtype=np.float64)
+    nfev += 1
+    d2 = _rms((f1 - f) / scale) / h
+    h1 = max(1e-6, h * 1e-3) if max(d1, d2) <= 1e-15 else (0.01 / max(d1, d2)) ** (1 / 5)
+    h = min(100 * h, h1, t_end - t0) if t_end > t0 else 0.0
+
+    ts, ys, coeffs = [t0], [y.copy()], []
+    t = t0
+    g = event(t, y) if event is not None else None
+    t_event = y_event = None
+    k = np.empty((7, y.size))
+    steps = 0
+    while t < t_end and steps < max_steps:
+        h = min(h, t_end - t)
+        k[0] = f
+        for i in range(1, 7):
+            k[i] = fun(t + _C[i] * h, y + h * np.dot(_A[i], k[:i]))
+        nfev += 6
+        y_new = y + h * (_B @ k)
+        err = _rms(h * (_E @ k) / (atol + rtol * np.maximum(np.abs(y), np.abs(y_new))))
+        steps += 1
+
+        if err > 1:
+            h *= max(0.2, 0.9 * err ** -0.2)
+            continue
+
+        # Шаг принят: коэффициенты плотной выдачи
+        ydiff = y_new - y
+        bspl = h * k[0] - ydiff
+        rc = np.stack((y, ydiff, bspl, ydiff - h * k[6] - bspl, h * (_D @ k)))
+        t_new = t + h
+
+        if event is not None:
+            g_new = event(t_new, y_new)
+            crossed = (g >= 0 > g_new) if direction < 0 else (g <= 0 < g_new) if direction > 0 \
+                else (g_new == 0 or np.sign(g) * np.sign(g_new) < 0)
+            if crossed:
+                theta = _find_root(lambda s: event(t + s * h, _dense_eval(rc, s)), g, g_new)
+                t_event = t + theta * h
+                y_event = _dense_eval(rc, theta)
+                if theta > 0:
+                    ts.append(t_event)
+                    ys.append(y_event)
+                    if dense:
+                        # Укорачиваем последний отрезок до события, сохраняя ту же интерполяцию
+                        coeffs.append(_restrict(rc, theta))
+                break
+            g = g_new
+
+        ts.append(t_new)
+        ys.append(y_new)
+        if dense:
+            coeffs.append(rc)
+        t, y, f = t_new, y_new, k[6].copy()
+        h *= min(5.0, max(0.2, 0.9 * err ** -0.2)) if err > 0 else 5.0
+
+    return DenseSolution(np.array(ts), np.array(ys), np.array(coeffs).reshape(-1, 5, y.size) if dense else None,
+                         t_event, y_event, nfev)
+
+
+def _dense_eval(rc, theta):
+    theta1 = 1 - theta
+    return rc[0] + theta * (rc[1] + theta1 * (rc[2] + theta * (rc[3] + theta1 * rc[4])))
+
+
+def _restrict(rc, s):
+    """
+    Коэффициенты плотной выдачи на укороченном отрезке [0, s] исходного шага:
+    пересчитываем интерполяционный многочлен в переменной theta' = theta / s.
+    """
+    # Многочлен 4-й степени однозначно задается значениями в 5 узлах
+    nodes = np.linspace(0, 1, 5)
+    values = np.stack([_dense_eval(rc, s * u) for u in nodes])
+    basis = np.stack([np.ones(5), nodes, nodes * (1 - nodes), nodes ** 2 * (1 - nodes),
+                      nodes ** 2 * (1 - nodes) ** 2], axis=1)
+    return np.linalg.solve(basis, values)
+
+
+def _find_root(func, g0, g1, tol=1e-12, max_iter=100):
+    """Корень func на [0, 1] по значениям на концах g0, g1 (метод Иллинойса)."""
+    a, b = 0.0, 1.0
+    fa, fb = g0, g1
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    side = 0
+    c = prev = 0.5
+    for _ in range(max_iter):
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = func(c)
+        if fc == 0 or abs(c - prev) < tol:
+            return c
+        prev = c
+        if np.sign(fc) == np.sign(fb):
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+    return c
+
+
+# Один шаг классического метода Рунге-Кутты 4-го порядка
+def rk4_step(fun, t, y, dt):
+    k1 = np.asarray(fun(t, y), dtype=np.float64)
+    k2 = np.asarray(fun(t + dt / 2, y + dt / 2 * k1), dtype=np.float64)
+    k3 = np.asarray(fun(t + dt / 2, y + dt / 2 * k2), dtype=np.float64)
+    k4 = np.asarray(fun(t + dt, y + dt * k3), dtype=np.float64)
+    return y + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+# Потоковое интегрирование порциями
+def rk4_chunks(fun, y0, dt, t0=0.0, stop=None, t_max=np.inf, chunk_size=1024):
+    """
+    Генератор: интегрирует dy/dt = fun(t, y) методом Рунге-Кутты 4-го
+    порядка с шагом dt и выдает траекторию порциями по мере расчета,
+    не выделяя память под весь интервал времени заранее.
+
+    Параметры:
+    - fun, y0: правая часть и начальное состояние
+    - dt, t0: шаг и начальный момент
+    - stop: условие остановки stop(t, y); шаг, на котором оно выполнилось,
+      выдается последним (как касание земли в runge_kutta_4th)
+    - t_max: предельное время
+    - chunk_size: число точек в одной порции
+
+    Выдает:
+    - пары (t, y): массивы формы (m,) и (m, len(y0)); каждая порция -
+      новый массив, его можно хранить или сразу отбросить
+    """
+    if chunk_size < 1:
+        raise ValueError("Размер порции chunk_size должен быть положительным.")
+    y = np.array(y0, dtype=np.float64)
+    t_buf = np.empty(chunk_size)
+    y_buf = np.empty((chunk_size, y.size))
+    t_buf[0], y_buf[0] = t0, y
+    m = 1
+    step = 0
+    n_steps = np.inf if np.isinf(t_max) else int(np.ceil((t_max - t0) / dt - 1e-9))
+    while step < n_steps:
+        step += 1
+        t = t0 + step * dt
+        y = rk4_step(fun, t - dt, y, dt)
+        # Заполненная порция выдается перед записью новой точки
+        if m == chunk_size:
+            yield t_buf, y_buf
+            t_buf = np.empty(chunk_size)
+            y_buf = np.empty((chunk_size, y.size))
+            m = 0
+        t_buf[m], y_buf[m] = t, y
+        m += 1
+        if stop is not None and stop(t, y):
+            break
+    yield t_buf[:m], y_buf[:m]
+
+
+# Свертка потока порций без хранения траектории
+def reduce_chunks(chunks, *reducers, keep=False, decimate=1):
+    """
+    Передает каждую порцию (t, y) всем свертывающим объектам
+    (reducer.update(t, y)) и, если нужно, сохраняет прореженную траекторию.
+    Свертки видят все шаги, прореживание касается только сохранения.
+
+    Параметры:
+    - chunks: поток порций, например rk4_chunks(...)
+    - reducers: объекты с методом update(t, y)
+    - keep: если True, сохранить траекторию
+    - decimate: сохранять каждую decimate-ю точку (последняя точка
+      сохраняется всегда)
+
+    Возвращает:
+    - (t, y) сохраненной траектории при keep=True, иначе None
+    """
+    kept = []
+    offset = 0  # номер первой точки текущей порции
+    last = None
+    for t, y in chunks:
+        for reducer in reducers:
+            reducer.update(t, y)
+        if keep:
+            first = (-offset) % decimate
+            kept.append((t[first::decimate], y[first::decimate]))
+            offset += len(t)
+            last = (offset - 1, t[-1:], y[-1:])
+    if not keep:
+        return None
+    if last is None:
+        return np.empty(0), np.empty((0, 0))
+    if last[0] % decimate:
+        kept.append(last[1:])
+    return np.concatenate([t for t, _ in kept]), np.concatenate([y for _, y in kept])
@@ -0,0 +1,597 @@
+"""
+Затухающие колебания груза на пружине m x'' + b x' + k x = 0
+(задание к лекции 8). Состояние - (x, v).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SOLVERS = ("exact", "recurrence", "euler", "semi_implicit", "verlet", "exponential")
+
+
+# Энергии груза на пружине
+def energies(m, k, x, v):
+    """
+    Возвращает:
+    - kinetic_energy, potential_energy, total_energy
+    """
+    kinetic_energy = 0.5 * m * v ** 2
+    potential_energy = 0.5 * k * x ** 2
+    return kinetic_energy, potential_energy, kinetic_energy + potential_energy
+
+
+# Моменты времени расчетной сетки
+def time_grid(t_end, dt=0.01, t_start=0.0):
+    """Узлы t_start + i * dt, i = 0 .. int((t_end - t_start) / dt) - 1."""
+    num_steps = int((t_end - t_start) / dt)
+    return t_start + dt * np.arange(num_steps)
+
+
+# Точное решение уравнения затухающих колебаний
+def exact_solution(m, k, b, x0, v0, t):
+    """
+    Вычисляет x(t) и v(t) по аналитическим формулам сразу для всего
+    массива t (без цикла по шагам). Все аргументы согласуются по правилам
+    broadcasting, так что можно считать и набор грузов сразу
+    (например, параметры формы (N, 1) и t формы (n,)).
+
+    С gamma = b / (2m), omega0^2 = k / m решение имеет вид
+    x = x0 C(t) + (v0 + gamma x0) S(t), v = v0 C(t) - (omega0^2 x0 + gamma v0) S(t), где
+    - слабое затухание (gamma < omega0): C = e^(-gamma t) cos(w t), S = e^(-gamma t) sin(w t) / w;
+    - критическое (gamma = omega0): C = e^(-gamma t), S = t e^(-gamma t);
+    - сильное (gamma > omega0): C = e^(-gamma t) ch(w t), S = e^(-gamma t) sh(w t) / w,
+    w = sqrt(|gamma^2 - omega0^2|). Для сильного затухания экспоненты
+    перемножаются заранее, чтобы не было переполнения на больших t.
+
+    Возвращает:
+    - x, v
+    """
+    m, k, b, x0, v0 = (np.asarray(a, dtype=np.float64) for a in (m, k, b, x0, v0))
+    t = np.asarray(t, dtype=np.float64)
+    gamma = b / (2 * m)
+    omega0_sq = k / m
+    disc = gamma ** 2 - omega0_sq
+    w = np.sqrt(np.abs(disc))
+    w_safe = np.where(w > 0, w, 1.0)
+    under = disc < 0
+
+    # Ветви считаются только для тех режимов, что встречаются в параметрах
+    C = S = 0.0
+    with np.errstate(over="ignore", invalid="ignore"):
+        if under.any():
+            decay = np.exp(-gamma * t)
+            phase = w * t
+            C = np.where(under, decay * np.cos(phase), C)
+            S = np.where(under, decay * np.sin(phase) / w_safe, S)
+        if not under.all():
+            grow = np.exp((w - gamma) * t)
+            tail = np.expm1(-2 * w * t)
+            c_over = grow * (1 + 0.5 * tail)
+            s_over = np.where(w > 0, -grow * tail / (2 * w_safe), t * np.exp(-gamma * t))
+            C = np.where(under, C, c_over)
+            S = np.where(under, S, s_over)
+    x = x0 * C + (v0 + gamma * x0) * S
+    v = v0 * C - (omega0_sq * x0 + gamma * v0) * S
+    return x, v
+
+
+# Матрица одного шага явного метода Эйлера
+def euler_matrix(m, k, b, dt):
+    """(x, v)_{i+1} = A (x, v)_i, A = [[1, dt], [-k/m dt, 1 - b/m dt]]."""
+    return _matrix(1.0, dt, -k / m * dt, 1.0 - b / m * dt)
+
+
+def _matrix(a11, a12, a21, a22):
+    """Матрицы 2x2 из поэлементных коэффициентов, форма (..., 2, 2)."""
+    a11, a12, a21, a22 = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (a11, a12, a21, a22)))
+    return np.stack((np.stack((a11, a12), axis=-1), np.stack((a21, a22), axis=-1)), axis=-2)
+
+
+# Состояния линейной рекуррентной схемы во всех узлах
+def linear_recurrence(A, state0, num_steps):
+    """
+    Вычисляет s_i = A^i s_0 для i = 0 .. num_steps - 1 удвоением: если
+    состояния 0 .. n-1 уже известны, то состояния n .. 2n-1 получаются
+    одним матричным умножением на A^n. Число итераций - log2(num_steps),
+    каждая векторизована.
+
+    Возвращает:
+    - массив состояний формы (num_steps, 2)
+    """
+    states = np.empty((max(num_steps, 1), 2))
+    states[0] = state0
+    n = 1
+    power = np.asarray(A, dtype=np.float64)
+    while n < num_steps:
+        count = min(n, num_steps - n)
+        states[n:n + count] = states[:count] @ power.T
+        power = power @ power
+        n += count
+    return states[:num_steps]
+
+
+# Матрица одного шага схемы для линейного уравнения x'' = -omega0^2 x - 2 gamma v
+def step_matrix(m, k, b, dt, method):
+    """
+    Для этого уравнения каждая из схем - линейное отображение
+    (x, v)_{i+1} = A (x, v)_i. Методы:
+    - "euler": явный метод Эйлера;
+    - "semi_implicit": полунеявный (симплектический) метод Эйлера -
+      сначала скорость, затем координата по новой скорости;
+    - "verlet": скоростной метод Верле; сила сопротивления зависит от
+      скорости, поэтому второе полусложение скорости решается явно
+      (для линейной силы это одно деление);
+    - "exponential": расщепление по Стренгу - полшага затухания
+      v *= exp(-gamma dt) точно, шаг Верле без затухания, еще полшага
+      затухания. Затухание не ограничивает шаг.
+
+    Параметры m, k, b, dt могут быть массивами - тогда строится набор матриц.
+
+    Возвращает:
+    - матрицу A формы (2, 2) (или (..., 2, 2) для массивов параметров)
+    """
+    w2 = k / m
+    gamma = b / (2 * m)
+    if method == "euler":
+        return euler_matrix(m, k, b, dt)
+    if method == "semi_implicit":
+        kv = 1.0 - 2 * gamma * dt
+        return _matrix(1.0 - w2 * dt ** 2, dt * kv, -w2 * dt, kv)
+    if method == "verlet":
+        # x1 = x + dt v + dt^2/2 a0, a0 = -w2 x - 2 gamma v,
+        # v1 = (v + dt/2 (a0 - w2 x1)) / (1 + gamma dt)
+        xx = 1.0 - w2 * dt ** 2 / 2
+        xv = dt - gamma * dt ** 2
+        scale = 1.0 / (1.0 + gamma * dt)
+        return _matrix(xx, xv, -w2 * dt / 2 * (1.0 + xx) * scale,
+                       (1.0 - gamma * dt - w2 * dt / 2 * xv) * scale)
+    if method == "exponential":
+        # diag(1, e) A diag(1, e), e = exp(-gamma dt), A - шаг Верле без затухания
+        e = np.exp(-gamma * dt)
+        a = step_matrix(m, k, 0.0 * b, dt, "verlet")
+        return _matrix(a[..., 0, 0], a[..., 0, 1] * e, a[..., 1, 0] * e, a[..., 1, 1] * e * e)
+    raise ValueError(f"Неизвестная схема: {method!r}.")
+
+
+# Шаг по времени, подобранный по собственной частоте
+def auto_dt(m, k, b, method, tol=1e-3, t_end=None):
+    """
+    Оценивает наибольший шаг, при котором относительная ошибка полной
+    энергии схемы method остается порядка tol, по omega0 = sqrt(k / m)
+    и gamma = b / (2m):
+    - "semi_implicit": сохраняется E - k x v dt / 2, поэтому ошибка энергии
+      не накапливается, но колеблется с размахом до omega0 dt (при x0 v0 != 0
+      отклонение от начальной энергии доходит до суммы двух амплитуд
+      omega0 dt / 2), dt = tol / omega0;
+    - "verlet", "exponential": амплитуда ~ (omega0 dt)^2 / 4,
+      dt = 2 sqrt(tol) / omega0;
+    - "euler", "recurrence" (та же матрица явного метода Эйлера): энергия
+      растет как exp(omega0^2 dt t), поэтому шаг зависит от длины расчета
+      t_end: dt = ln(1 + tol) / (omega0^2 t_end);
+    - "exact": как для "verlet" (шаг задает только подробность графика).
+    Для схем, где затухание считается приближенно, шаг дополнительно
+    ограничен условием gamma dt <= sqrt(tol) (tol для полунеявной схемы и метода Эйлера),
+    а для всех схем - устойчивостью omega0 dt < 2.
+
+    m, k, b могут быть массивами - тогда шаг подбирается для каждого набора.
+    """
+    omega0 = np.sqrt(np.asarray(k, dtype=np.float64) / m)
+    gamma = np.asarray(b, dtype=np.float64) / (2 * m)
+    if method == "semi_implicit":
+        dt = tol / omega0
+        damping_limit = tol
+    elif method in ("euler", "recurrence"):
+        if t_end is None:
+            raise ValueError("Для явного метода Эйлера нужна длина расчета t_end.")
+        dt = np.log1p(tol) / (omega0 ** 2 * t_end)
+        damping_limit = tol
+    elif method in ("verlet", "exponential", "exact"):
+        dt = 2 * np.sqrt(tol) / omega0
+        damping_limit = None if method == "exponential" else np.sqrt(tol)
+    else:
+        raise ValueError(f"Неизвестный метод: {method!r}.")
+    if damping_limit is not None:
+        with np.errstate(divide="ignore"):
+            dt = np.minimum(dt, np.where(gamma > 0, damping_limit / gamma, np.inf))
+    dt = np.minimum(dt, 1.0 / omega0)
+    return float(dt) if dt.ndim == 0 else dt
+
+
+# Отчет об ошибке полной энергии
+def energy_drift(m, k, b, x0, v0, t, x, v):
+    """
+    Сравнивает полную энергию численного решения с энергией точного
+    решения в те же моменты времени.
+
+    Возвращает словарь:
+    - max_rel_error: наибольшая ошибка энергии, в долях начальной энергии
+    - final_rel_error: ошибка в последней точке
+    - drift_rate: скорость систематического ухода энергии (наклон
+      прямой, приближающей ошибку по методу наименьших квадратов), в долях
+      начальной энергии в секунду
+    - steps: число точек
+    """
+    t = np.asarray(t, dtype=np.float64)
+    x_exact, v_exact = exact_solution(m, k, b, x0, v0, t - t[0])
+    e_num = energies(m, k, x, v)[2]
+    e_exact = energies(m, k, x_exact, v_exact)[2]
+    e0 = e_exact[0] if e_exact[0] > 0 else 1.0
+    error = (e_num - e_exact) / e0
+    drift_rate = np.polyfit(t, error, 1)[0] if t.size > 1 else 0.0
+    return {
+        "max_rel_error": float(np.abs(error).max()),
+        "final_rel_error": float(error[-1]),
+        "drift_rate": float(drift_rate),
+        "steps": int(t.size),
+    }
+
+
+# Явный метод Эйлера в виде линейной рекурсии
+def euler_recurrence(m, k, b, x0, v0, dt, num_steps):
+    """
+    Те же значения, что дает цикл euler (с точностью до округления),
+    но без цикла по шагам.
+
+    Возвращает:
+    - x, v
+    """
+    states = linear_recurrence(euler_matrix(m, k, b, dt), (x0, v0), num_steps)
+    return states[:, 0], states[:, 1]
+
+
+# Явный метод Эйлера (эталонный цикл из EnergyTransformations.py)
+def euler(m, k, b, x0, v0, dt, num_steps):
+    """
+    Возвращает:
+    - x, v
+    """
+    x = np.zeros(num_steps)
+    v = np.zeros(num_steps)
+    x[0] = x0
+    v[0] = v0
+    for i in range(1, num_steps):
+        dxdt = v[i - 1]
+        dvdt = -(k / m) * x[i - 1] - (b / m) * v[i - 1]
+
+        x[i] = x[i - 1] + dxdt * dt
+        v[i] = v[i - 1] + dvdt * dt
+    return x, v
+
+
+# Колебания груза выбранным методом
+def simulate(m, k, b, x0, v0, t_end, dt=0.01, solver="exact", t_start=0.0, tol=1e-3):
+    """
+    Параметры:
+    - m, k, b: масса, жесткость пружины, коэффициент сопротивления
+    - x0, v0: начальные координата и скорость
+    - t_end, dt, t_start: интервал времени и шаг; dt=None - шаг
+      подбирается auto_dt по допуску tol на ошибку энергии
+    - solver: "exact" - аналитическое решение, "recurrence" - метод Эйлера
+      через степени матрицы шага, "euler" - метод Эйлера циклом,
+      "semi_implicit", "verlet", "exponential" - схемы из step_matrix
+      (считаются через степени матрицы шага)
+
+    Возвращает:
+    - t, x, v
+    """
+    if dt is None:
+        dt = auto_dt(m, k, b, solver, tol=tol, t_end=t_end - t_start)
+    t = time_grid(t_end, dt, t_start)
+    if solver == "exact":
+        x, v = exact_solution(m, k, b, x0, v0, t - t_start)
+    elif solver == "recurrence":
+        x, v = euler_recurrence(m, k, b, x0, v0, dt, t.size)
+    elif solver == "euler":
+        x, v = euler(m, k, b, x0, v0, dt, t.size)
+    elif solver in ("semi_implicit", "verlet", "exponential"):
+        states = linear_recurrence(step_matrix(m, k, b, dt, solver), (x0, v0), t.size)
+        x, v = states[:, 0], states[:, 1]
+    else:
+        raise ValueError(f"Неизвестный метод: {solver!r}. Доступны: {', '.join(SOLVERS)}.")
+    return t, x, v
+
+
+REGIMES = ("underdamped", "critical", "overdamped")
+
+
+# Режим затухания по параметрам
+def damping_regime(m, k, b, rtol=1e-9):
+    """
+    Возвращает:
+    - коды режимов: 0 - слабое затухание, 1 - критическое (|gamma^2 - omega0^2|
+      не больше rtol * omega0^2), 2 - сильное; названия - REGIMES[код]
+    """
+    gamma = np.asarray(b, dtype=np.float64) / (2 * np.asarray(m, dtype=np.float64))
+    omega0_sq = np.asarray(k, dtype=np.float64) / m
+    disc = gamma ** 2 - omega0_sq
+    return np.where(np.abs(disc) <= rtol * omega0_sq, 1, np.where(disc < 0, 0, 2)).astype(np.int8)
+
+
+def _sweep_block(m, k, b, x0, v0, t_end, tol, method, check_every):
+    """Интегрирует один блок наборов параметров (массивы формы (n,)), см. sweep."""
+    n = m.size
+    dt = np.broadcast_to(auto_dt(m, k, b, method, tol=tol, t_end=t_end), (n,))
+    A = step_matrix(m, k, b, dt, method)
+    a11, a12, a21, a22 = (A[:, i, j].copy() for i in range(2) for j in range(2))
+    half_m, half_k = m / 2, k / 2
+    limit = np.ceil(t_end / dt)
+
+    x, v = x0.copy(), v0.copy()
+    e0 = half_m * v * v + half_k * x * x
+    e_prev = e0.copy()
+    peak = half_m * v * v
+    half = np.where(e0 > 0, np.nan, 0.0)
+    decay = half.copy()
+
+    decay_time = np.empty(n)
+    half_life = np.empty(n)
+    peak_ke = np.empty(n)
+    steps = np.empty(n, dtype=np.int64)
+    ids = np.arange(n)
+
+    step = 0
+    while ids.size:
+        if step % check_every == 0:
+            # Набор закончен, если энергия упала в e^2 раз и уже не выше пика
+            # кинетической энергии (при b >= 0 энергия не растет), или вышло время
+            done = (~np.isnan(decay) & (e_prev <= peak)) | (step >= limit)
+            if done.any():
+                out = ids[done]
+                decay_time[out], half_life[out], peak_ke[out], steps[out] = decay[done], half[done], peak[done], step
+                keep = ~done
+                ids = ids[keep]
+                x, v, e0, e_prev, peak, half, decay = x[keep], v[keep], e0[keep], e_prev[keep], peak[keep], half[keep], decay[keep]
+                a11, a12, a21, a22 = a11[keep], a12[keep], a21[keep], a22[keep]
+                half_m, half_k, dt, limit = half_m[keep], half_k[keep], dt[keep], limit[keep]
+                continue
+        step += 1
+        x, v = a11 * x + a12 * v, a21 * x + a22 * v
+        ke = half_m * v * v
+        e = ke + half_k * x * x
+        np.maximum(peak, ke, out=peak)
+
+        # Моменты пересечения уровней энергии - линейной интерполяцией внутри шага
+        for target, level in ((half, 0.5), (decay, np.exp(-2.0))):
+            threshold = level * e0
+            crossed = (e <= threshold) & np.isnan(target)
+            if crossed.any():
+                frac = (e_prev[crossed] - threshold[crossed]) / (e_prev[crossed] - e[crossed])
+                target[crossed] = (step - 1 + frac) * dt[crossed]
+        e_prev = e
+    return decay_time, half_life, peak_ke, steps
+
+
+def _sweep_task(args):
+    return _sweep_block(*args)
+
+
+# Расчет большого набора грузов одним массивом состояний
+def sweep(m, k, b, x0, v0, t_end, tol=1e-3, method="exponential", workers=1, block_size=1 << 16,
+          check_every=16):
+    """
+    Интегрирует N наборов параметров (m, k, b, x0, v0) одновременно:
+    состояние - пара массивов x, v формы (N,), шаг схемы method - одно
+    поэлементное умножение на коэффициенты матриц step_matrix. Шаг dt
+    подбирается для каждого набора по auto_dt, каждый набор считается до
+    t_end или пока его характеристики не перестанут меняться, после чего
+    выбывает из массива.
+
+    Параметры:
+    - m, k, b, x0, v0: параметры (скаляры или массивы, приводятся к общей форме)
+    - t_end: предельное время расчета
+    - tol: допуск на ошибку энергии для auto_dt
+    - method: схема из step_matrix ("exponential" устойчива при любом затухании)
+    - workers: число процессов; наборы делятся на блоки по block_size
+    - check_every: как часто (в шагах) убирать завершенные наборы
+
+    Возвращает словарь массивов формы np.broadcast(m, k, b, x0, v0).shape:
+    - regime: код режима затухания (см. damping_regime, REGIMES)
+    - decay_time: время уменьшения энергии в e^2 раз (амплитуды - в e раз)
+    - energy_half_life: время уменьшения энергии вдвое
+      (np.nan, если не достигнуто до t_end)
+    - peak_kinetic_energy: наибольшая кинетическая энергия
+    - steps: число сделанных шагов
+    """
+    shape = np.broadcast(m, k, b, x0, v0).shape
+    m, k, b, x0, v0 = (np.ravel(np.broadcast_to(np.asarray(a, dtype=np.float64), shape)) for a in (m, k, b, x0, v0))
+    blocks = [(m[i:i + block_size], k[i:i + block_size], b[i:i + block_size], x0[i:i + block_size],
+               v0[i:i + block_size], t_end, tol, method, check_every) for i in range(0, m.size, block_size)]
+
+    if workers == 1 or len(blocks) <= 1:
+        results = [_sweep_block(*block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(blocks))) as pool:
+            results = list(pool.map(_sweep_task, blocks))
+
+    if results:
+        decay_time, half_life, peak_ke, steps = (np.concatenate(column) for column in zip(*results))
+    else:
+        decay_time = half_life = peak_ke = np.empty(0)
+        steps = np.empty(0, dtype=np.int64)
+    return {
+        "regime": damping_regime(m, k, b).reshape(shape),
+        "decay_time": decay_time.reshape(shape),
+        "energy_half_life": half_life.reshape(shape),
+        "peak_kinetic_energy": peak_ke.reshape(shape),
+        "steps": steps.reshape(shape),
+    }
+
+
+# Колебания порциями фиксированного размера
+def oscillator_chunks(m, k, b, x0, v0, t_end, dt=0.01, solver="exact", t_start=0.0, chunk_size=1 << 16):
+    """
+    Генератор: выдает решение на тех же узлах, что и simulate, порциями
+    по chunk_size точек, так что память не зависит от длины расчета.
+    "exact" вычисляет каждую порцию по аналитическим формулам от
+    абсолютного времени (ошибка не накапливается); остальные методы
+    продолжают состояние конца предыдущей порции степенями матрицы шага
+    ("euler" и "recurrence" - одна и та же матрица явного метода Эйлера).
+
+    Выдает:
+    - пары (t, y): t формы (n,), y формы (n, 2) со столбцами x, v
+      (совместимо с physicitmo.integrators.reduce_chunks)
+    """
+    num_steps = int((t_end - t_start) / dt)
+    if solver != "exact":
+        if solver not in SOLVERS:
+            raise ValueError(f"Неизвестный метод: {solver!r}. Доступны: {', '.join(SOLVERS)}.")
+        A = step_matrix(m, k, b, dt, "euler" if solver == "recurrence" else solver)
+    state = np.array([x0, v0], dtype=np.float64)
+    for i0 in range(0, num_steps, chunk_size):
+        count = min(chunk_size, num_steps - i0)
+        t = t_start + dt * np.arange(i0, i0 + count)
+        if solver == "exact":
+            x, v = exact_solution(m, k, b, x0, v0, t - t_start)
+            y = np.column_stack((x, v))
+        else:
+            # Первая точка порции - продолжение последней точки предыдущей
+            y = linear_recurrence(A, state, count + 1)[1:] if i0 else linear_recurrence(A, state, count)
+            state = y[-1]
+        yield t, y
+
+
+class EnergyDiagnostics:
+    """
+    Свертка для reduce_chunks: энергетические характеристики колебаний
+    по ходу расчета, память не зависит от длины расчета.
+
+    Накапливает:
+    - наименьшую, наибольшую и среднюю полную энергию;
+    - работу силы сопротивления W = integral(b v^2 dt) (по трапециям);
+    - скорость ухода баланса E + W (для точного решения он постоянен,
+      так что наклон - ошибка метода), методом наименьших квадратов
+      с устойчивым объединением сумм по порциям;
+    - периоды между последовательными переходами x через ноль снизу вверх
+      (момент перехода - линейной интерполяцией);
+    - прореженный ряд для графиков: узлы разбиты на не более max_points
+      групп подряд, для каждой хранятся наименьшие и наибольшие значения
+      кинетической, потенциальной и полной энергии, так что пики не теряются.
+
+    Параметры:
+    - m, k, b: параметры груза
+    - num_steps: полное число точек (нужно, чтобы заранее выбрать размер групп)
+    - max_points: наибольшее число точек прореженного ряда
+    """
+
+    def __init__(self, m, k, b, num_steps, max_points=4000):
+        self.m, self.k, self.b = m, k, b
+        self.n = 0
+        self.e_min, self.e_max = np.inf, -np.inf
+        self.e0 = None
+        # Средние и суммы квадратов отклонений для прямой (t, E + W)
+        self.mean_t = self.mean_e = self.mean_balance = 0.0
+        self.m2_t = self.c_t_balance = 0.0
+        self.work = 0.0
+        self.last = None  # (t, v^2, x) последней точки предыдущей порции
+        self.crossings = 0
+        self.last_crossing = None
+        self.period_sum = 0.0
+        self.period_min, self.period_max = np.inf, -np.inf
+
+        self.group = max(1, -(-int(num_steps) // int(max_points)))
+        n_groups = max(1, -(-int(num_steps) // self.group))
+        self.series_t = np.full(n_groups, np.nan)
+        self.series_min = np.full((3, n_groups), np.inf)
+        self.series_max = np.full((3, n_groups), -np.inf)
+
+    def update(self, t, y):
+        if not len(t):
+            return
+        x, v = y[:, 0], y[:, 1]
+        ke, pe, e = energies(self.m, self.k, x, v)
+        if self.e0 is None:
+            self.e0 = float(e[0])
+
+        # Работа силы сопротивления нарастающим итогом (трапеции, со стыком порций)
+        power = self.b * v * v
+        t_all, p_all, x_all = t, power, x
+        if self.last is not None:
+            t_all = np.concatenate(([self.last[0]], t))
+            p_all = np.concatenate(([self.last[1]], power))
+            x_all = np.concatenate(([self.last[2]], x))
+        steps = np.diff(t_all) * (p_all[1:] + p_all[:-1]) / 2
+        work = self.work + np.cumsum(steps)
+        if self.last is None:
+            work = np.concatenate(([0.0], work))
+        self.work = float(work[-1])
+        balance = e + work
+
+        # Объединение статистик (Чан и др.) для среднего и наклона
+        n_b = t.size
+        mean_t_b, mean_e_b, mean_bal_b = t.mean(), e.mean(), balance.mean()
+        m2_t_b = np.sum((t - mean_t_b) ** 2)
+        c_b = np.sum((t - mean_t_b) * (balance - mean_bal_b))
+        n = self.n + n_b
+        dt_mean = mean_t_b - self.mean_t
+        dbal_mean = mean_bal_b - self.mean_balance
+        self.m2_t += m2_t_b + dt_mean ** 2 * self.n * n_b / n
+        self.c_t_balance += c_b + dt_mean * dbal_mean * self.n * n_b / n
+        self.mean_t += dt_mean * n_b / n
+        self.mean_e += (mean_e_b - self.mean_e) * n_b / n
+        self.mean_balance += dbal_mean * n_b / n
+        self.n = n
+        self.e_min = min(self.e_min, float(e.min()))
+        self.e_max = max(self.e_max, float(e.max()))
+
+        # Переходы x через ноль снизу вверх
+        up = np.flatnonzero((x_all[:-1] < 0) & (x_all[1:] >= 0))
+        if up.size:
+            frac = -x_all[up] / (x_all[up + 1] - x_all[up])
+            times = t_all[up] + frac * (t_all[up + 1] - t_all[up])
+            if self.last_crossing is not None:
+                times = np.concatenate(([self.last_crossing], times))
+            periods = np.diff(times)
+            if periods.size:
+                self.period_sum += float(periods.sum())
+                self.period_min = min(self.period_min, float(periods.min()))
+                self.period_max = max(self.period_max, float(periods.max()))
+            self.crossings += up.size
+            self.last_crossing = float(times[-1])
+        self.last = (float(t[-1]), float(power[-1]), float(x[-1]))
+
+        # Прореженный ряд: наименьшие и наибольшие значения по группам узлов
+        index = np.arange(self.n - n_b, self.n) // self.group
+        starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+        groups = index[starts]
+        first = (np.arange(self.n - n_b, self.n) % self.group == 0)[starts]
+        self.series_t[groups[first]] = t[starts[first]]
+        for row, values in enumerate((ke, pe, e)):
+            np.minimum.at(self.series_min[row], groups, np.minimum.reduceat(values, starts))
+            np.maximum.at(self.series_max[row], groups, np.maximum.reduceat(values, starts))
+
+    def summary(self):
+        """
+        Возвращает словарь:
+        - steps, e_min, e_max, e_mean: число точек и статистика полной энергии
+        - dissipated_work: работа силы сопротивления
+        - drift_rate: наклон баланса E + W, Дж/с; relative_drift_rate - он же
+          в долях начальной энергии
+        - periods: число измеренных периодов, period_mean, period_min, period_max
+        """
+        drift = self.c_t_balance / self.m2_t if self.m2_t > 0 else 0.0
+        n_periods = max(self.crossings - 1, 0)
+        return {
+            "steps": self.n,
+            "e_min": self.e_min,
+            "e_max": self.e_max,
+            "e_mean": float(self.mean_e),
+            "dissipated_work": self.work,
+            "drift_rate": float(drift),
+            "relative_drift_rate": float(drift / self.e0) if self.e0 else np.nan,
+            "periods": n_periods,
+            "period_mean": self.period_sum / n_periods if n_periods else np.nan,
+            "period_min": self.period_min if n_periods else np.nan,
+            "period_max": self.period_max if n_periods else np.nan,
+        }
+
+    def series(self):
+        """
+        Возвращает:
+        - t: момент начала каждой группы
+        - lower, upper: массивы формы (3, n) - наименьшие и наибольшие
+          кинетическая, потенциальная и полная энергия в группах
+        """
+        filled = ~np.isnan(self.series_t)
+        return self.series_t[filled], self.series_min[:, filled], self.series_max[:, filled]
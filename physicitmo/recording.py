@@ -0,0 +1,167 @@
+"""
+Запись моделирования столкновений без графики и воспроизведение записи.
+
+Запись - каталог с файлами .npy по одному на поле (положения и скорости
+всех тел во всех кадрах, стороны и массы тел), которые открываются
+отображением в память, и файлом meta.json с параметрами расчета.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .collisions import Bodies, EventDrivenSimulation, step
+from .render import BodyRenderer
+
+META = "meta.json"
+MODES = ("events", "steps")
+
+
+# Расчет до заданного момента с записью кадров
+def record(bodies, W, H, t_end, directory, frame_dt=0.01, dt=0.01, mode="events", dtype=np.float32,
+           flush_every=1000):
+    """
+    Моделирует систему до t_end без графики и пишет состояние каждые
+    frame_dt секунд в заранее выделенные файлы pos.npy и vel.npy формы
+    (число кадров, N, 2). Файлы отображаются в память, поэтому в памяти
+    процесса нет всей траектории, а уже записанные кадры можно
+    воспроизводить, не дожидаясь конца расчета (число готовых кадров
+    обновляется в meta.json каждые flush_every кадров).
+
+    Параметры:
+    - bodies: Bodies (изменяется)
+    - W, H: размеры оболочки
+    - t_end: длительность расчета
+    - directory: каталог записи (создается)
+    - frame_dt: интервал между кадрами
+    - dt: шаг для mode="steps"; frame_dt должен быть кратен dt (в кадре
+      frame_dt / dt шагов), иначе кадры шли бы не через frame_dt
+    - mode: "events" - EventDrivenSimulation, "steps" - шаги collisions.step
+    - dtype: тип чисел в файлах (float32 вдвое компактнее float64)
+
+    Возвращает:
+    - Recording
+    """
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим расчета {mode!r}, допустимы: {', '.join(MODES)}.")
+    substeps = max(1, int(round(frame_dt / dt)))
+    if mode == "steps" and not np.isclose(substeps * dt, frame_dt, rtol=1e-9, atol=0):
+        raise ValueError(f"Интервал между кадрами frame_dt={frame_dt} должен быть кратен шагу dt={dt}.")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    n_frames = int(round(t_end / frame_dt)) + 1
+    n = len(bodies)
+    pos = np.lib.format.open_memmap(directory / "pos.npy", mode="w+", dtype=dtype, shape=(n_frames, n, 2))
+    vel = np.lib.format.open_memmap(directory / "vel.npy", mode="w+", dtype=dtype, shape=(n_frames, n, 2))
+    np.save(directory / "size.npy", bodies.size)
+    np.save(directory / "mass.npy", bodies.mass)
+    meta = {"W": W, "H": H, "frame_dt": frame_dt, "dt": dt, "mode": mode, "n_frames": n_frames,
+            "n_bodies": n, "dtype": np.dtype(dtype).str, "frames_written": 0}
+
+    def write_meta(frames_written):
+        pos.flush()
+        vel.flush()
+        meta["frames_written"] = frames_written
+        (directory / META).write_text(json.dumps(meta, indent=2))
+
+    simulation = EventDrivenSimulation(bodies, W, H) if mode == "events" else None
+    for frame in range(n_frames):
+        if frame:
+            if simulation is not None:
+                simulation.advance(frame * frame_dt)
+            else:
+                for _ in range(substeps):
+                    step(bodies, dt, W, H)
+        pos[frame] = bodies.pos
+        vel[frame] = bodies.vel
+        if (frame + 1) % flush_every == 0:
+            write_meta(frame + 1)
+    write_meta(n_frames)
+    del pos, vel
+    return Recording(directory)
+
+
+class Recording:
+    """
+    Запись, созданная record. Поля открываются только для чтения
+    отображением в память: открытие мгновенное, а переход к любому кадру
+    не требует ни пересчета, ни чтения предыдущих кадров.
+
+    Атрибуты:
+    - pos, vel: массивы формы (число кадров, N, 2)
+    - size, mass: стороны и массы тел
+    - W, H, frame_dt, meta: параметры записи
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / META).read_text())
+        self.W, self.H = self.meta["W"], self.meta["H"]
+        self.frame_dt = self.meta["frame_dt"]
+        written = self.meta["frames_written"]
+        self.pos = np.load(self.directory / "pos.npy", mmap_mode="r")[:written]
+        self.vel = np.load(self.directory / "vel.npy", mmap_mode="r")[:written]
+        self.size = np.load(self.directory / "size.npy")
+        self.mass = np.load(self.directory / "mass.npy")
+        self.frame = 0
+
+    def __len__(self):
+        return self.pos.shape[0]
+
+    @property
+    def times(self):
+        return np.arange(len(self)) * self.frame_dt
+
+    def seek(self, frame=None, t=None):
+        """
+        Переходит к кадру frame (или к ближайшему к моменту t).
+
+        Возвращает:
+        - pos, vel этого кадра (представления без копирования)
+        """
+        if t is not None:
+            frame = int(round(t / self.frame_dt))
+        self.frame = int(np.clip(frame, 0, len(self) - 1))
+        return self.pos[self.frame], self.vel[self.frame]
+
+    def bodies(self, frame=None):
+        """Bodies в состоянии кадра frame (по умолчанию текущего) - например, чтобы продолжить расчет."""
+        pos, vel = self.seek(self.frame if frame is None else frame)
+        return Bodies(pos, vel, self.size, self.mass)
+
+
+# Воспроизведение записи
+def animate_recording(recording, interval=10, skip=1):
+    """
+    Показывает запись без пересчета: каждый кадр анимации берет следующий
+    записанный кадр (через skip). Клавиши стрелок влево и вправо
+    перематывают на 10% записи, Home и End - в начало и в конец.
+
+    Возвращает:
+    - FuncAnimation (нужно сохранить ссылку, пока окно открыто)
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    fig, ax = plt.subplots()
+    ax.set_xlim(0, recording.W)
+    ax.set_ylim(0, recording.H)
+    pos, _ = recording.seek(0)
+    renderer = BodyRenderer(ax, pos, recording.size)
+    title = ax.set_title("")
+
+    def on_key(event):
+        jump = max(1, len(recording) // 10)
+        targets = {"right": recording.frame + jump, "left": recording.frame - jump,
+                   "home": 0, "end": len(recording) - 1}
+        if event.key in targets:
+            recording.seek(targets[event.key])
+
+    def update(_):
+        pos, _ = recording.seek((recording.frame + skip) % len(recording))
+        title.set_text(f"t = {recording.frame * recording.frame_dt:.2f} с")
+        return [renderer.update(pos), title]
+
+    fig.canvas.mpl_connect("key_press_event", on_key)
+    return FuncAnimation(fig, update, interval=interval, blit=False, cache_frame_data=False)
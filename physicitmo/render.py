@@ -0,0 +1,127 @@
+"""
+Отрисовка большого числа квадратных тел и анимация в реальном времени.
+
+matplotlib импортируется внутри функций и классов, чтобы расчетные модули
+пакета можно было использовать без графики.
+"""
+
+import time
+
+import numpy as np
+
+# Углы квадрата со стороной 1 с центром в начале координат
+_CORNERS = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+
+
+# Вершины квадратов всех тел
+def square_vertices(pos, size, out=None):
+    """
+    Возвращает:
+    - массив вершин формы (N, 4, 2) (записывается в out, если он задан)
+    """
+    if out is None:
+        out = np.empty((pos.shape[0], 4, 2))
+    np.multiply(_CORNERS, size[:, None, None], out=out)
+    out += pos[:, None, :]
+    return out
+
+
+class BodyRenderer:
+    """
+    Все тела рисуются одним объектом PolyCollection, и кадр обновляется
+    одним вызовом set_verts с массивом вершин, а не set_xy для каждого
+    прямоугольника.
+
+    Параметры:
+    - ax: оси matplotlib
+    - pos, size: начальные центры (N, 2) и стороны (N,) квадратов
+    - colors: цвет или список цветов (повторяется по кругу)
+    """
+
+    def __init__(self, ax, pos, size, colors="blue"):
+        from matplotlib.collections import PolyCollection
+
+        self.size = np.asarray(size, dtype=np.float64)
+        self._verts = np.empty((self.size.size, 4, 2))
+        if not isinstance(colors, str):
+            colors = [colors[n % len(colors)] for n in range(self.size.size)]
+        self.collection = PolyCollection(square_vertices(np.asarray(pos), self.size, self._verts),
+                                         facecolors=colors, edgecolors="none")
+        ax.add_collection(self.collection)
+
+    def update(self, pos):
+        """Перемещает все квадраты в центры pos, возвращает обновленный объект."""
+        self.collection.set_verts(square_vertices(np.asarray(pos), self.size, self._verts))
+        return self.collection
+
+
+class RealTimePlayer:
+    """
+    Анимация, идущая в темпе реального времени (умноженного на speed).
+
+    Перед каждым кадром физика продвигается шагами dt до момента,
+    соответствующего прошедшему времени на часах, так что на один
+    отображаемый кадр приходится несколько шагов, если расчет идет быстрее
+    отрисовки, и промежуточные кадры просто не рисуются. Число шагов за кадр
+    ограничено max_substeps: если физика не успевает за реальным временем,
+    отставание отбрасывается, и модель замедляется вместо того, чтобы
+    копить долг шагов.
+
+    Параметры:
+    - fig: фигура matplotlib
+    - renderer: объект с методом update(pos), возвращающим artist
+    - advance: функция advance(dt), продвигающая модель на dt
+    - positions: функция без аргументов, возвращающая текущие центры тел
+    - dt: шаг физики
+    - fps: желаемая частота кадров
+    - speed: во сколько раз модельное время идет быстрее реального
+    - max_substeps: наибольшее число шагов физики на кадр
+    - extra_artists: дополнительные artists для обновления (например, заголовок)
+
+    Атрибуты:
+    - sim_time, frames, steps: модельное время, число кадров и шагов
+    - animation: FuncAnimation (хранит ссылку, пока окно открыто)
+    """
+
+    def __init__(self, fig, renderer, advance, positions, dt, fps=60, speed=1.0, max_substeps=20,
+                 extra_artists=()):
+        from matplotlib.animation import FuncAnimation
+
+        self.renderer = renderer
+        self.advance = advance
+        self.positions = positions
+        self.dt = dt
+        self.speed = speed
+        self.max_substeps = max_substeps
+        self.extra_artists = list(extra_artists)
+        self.sim_time = 0.0
+        self.frames = 0
+        self.steps = 0
+        self._start = None
+        self._wall_start = None
+        self.animation = FuncAnimation(fig, self._frame, interval=1000 / fps, blit=True,
+                                       cache_frame_data=False)
+
+    def _frame(self, _):
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = self._wall_start = now
+        target = (now - self._start) * self.speed
+        substeps = int((target - self.sim_time) / self.dt)
+        if substeps > self.max_substeps:
+            # Физика не успевает: отбрасываем отставание
+            self._start += (substeps - self.max_substeps) * self.dt / self.speed
+            substeps = self.max_substeps
+        for _ in range(substeps):
+            self.advance(self.dt)
+            self.sim_time += self.dt
+        self.steps += substeps
+        self.frames += 1
+        return [self.renderer.update(self.positions())] + self.extra_artists
+
+    @property
+    def fps(self):
+        """Средняя частота отрисованных кадров с начала анимации."""
+        if self._wall_start is None or not self.frames:
+            return 0.0
+        return self.frames / max(time.perf_counter() - self._wall_start, 1e-9)
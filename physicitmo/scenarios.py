@@ -0,0 +1,183 @@
+"""
+Сценарии: входные данные моделей в файлах JSON или TOML вместо ввода с
+клавиатуры, и пакетный запуск сценариев без терминала на всех ядрах.
+
+Файл сценария:
+
+    model = "thrown"          # подкоманда из physicitmo.cli.MODELS
+    name = "steep"            # необязательно, по умолчанию имя файла
+    [params]
+    v0 = 20
+    angle = 60
+    h0 = 0
+    k = 0.1
+
+Скрипт модели загружается как модуль, и сценарий выполняет его функция
+scenario(params): она проверяет параметры теми же правилами
+physicitmo.validation, что и ввод с клавиатуры (имена параметров - из
+списка PARAMETERS скрипта), считает модель без графического окна и
+возвращает словарь результатов и построенные графики.
+
+Результаты сценария каталог/файл.toml записываются в
+<каталог результатов>/каталог/файл.json и файл_<номер>.png - по пути
+файла относительно каталога сценариев, а не по полю name, так что
+сценарии с одинаковыми name или в разных подкаталогах не затирают
+результаты друг друга.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .cli import MODELS, ROOT
+
+SUFFIXES = (".json", ".toml")
+SUMMARY = "summary.json"  # сводка пакета в каталоге результатов
+
+_modules = {}  # загруженные скрипты моделей (в каждом процессе пула - свои)
+
+
+class ScenarioError(ValueError):
+    """Ошибка в файле сценария."""
+
+
+# Скрипт модели как модуль (блок if __name__ == "__main__" не выполняется)
+def load_model(model):
+    if model not in MODELS:
+        raise ScenarioError(f"неизвестная модель {model!r}, доступны: {', '.join(MODELS)}")
+    if model not in _modules:
+        spec = importlib.util.spec_from_file_location(f"physicitmo_{model}", ROOT / MODELS[model][0])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[model] = module
+    return _modules[model]
+
+
+# Часть имени файла результата: только буквы, цифры, _ и - (без разделителей
+# каталогов и точек, так что запись не выходит за каталог результатов)
+def safe_name(text):
+    return re.sub(r"[^\w-]", "_", str(text)) or "_"
+
+
+# Путь результатов сценария без расширения относительно каталога результатов
+def output_stem(path, root):
+    parts = Path(path).relative_to(root).with_suffix("").parts
+    return Path(*map(safe_name, parts))
+
+
+# Результаты numpy -> JSON
+def _plain(value):
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} не сохраняется в JSON")
+
+
+# Чтение файла сценария
+def load_scenario(path):
+    """
+    Возвращает:
+    - словарь с ключами name, model, params
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    elif path.suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        raise ScenarioError(f"{path}: сценарий должен быть в формате .json или .toml")
+    if "model" not in data:
+        raise ScenarioError(f"{path}: не задана модель (model)")
+    return {"name": data.get("name", path.stem), "model": data["model"], "params": data.get("params", {})}
+
+
+# Выполнение одного сценария без терминала
+def run_scenario(path, out_dir, root=None):
+    """
+    Выполняет сценарий функцией scenario(params) скрипта модели с
+    графикой Agg: графики сохраняются в out_dir/<путь>_<номер>.png, а
+    результаты модели и сведения о запуске - в out_dir/<путь>.json, где
+    <путь> - путь файла сценария относительно root (по умолчанию - его
+    каталога) без расширения.
+
+    Возвращает:
+    - словарь с итогами (тот же, что записан в JSON); ошибка сценария или
+      модели не прерывает пакет, а записывается в поле error
+    """
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+
+    path, out_dir = Path(path), Path(out_dir)
+    stem = out_dir / output_stem(path, path.parent if root is None else root)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    result = {"scenario": str(path), "name": safe_name(path.stem), "figures": [], "results": None, "error": None}
+    start = time.perf_counter()
+    try:
+        scenario = load_scenario(path)
+        result.update(name=safe_name(scenario["name"]), model=scenario["model"], params=scenario["params"])
+        result["results"], figures = load_model(scenario["model"]).scenario(scenario["params"])
+        for number, figure in enumerate(figures, start=1):
+            figure_path = stem.parent / f"{stem.name}_{number}.png"
+            figure.savefig(figure_path)
+            result["figures"].append(figure_path.relative_to(out_dir).as_posix())
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        plt.close("all")
+    result["seconds"] = time.perf_counter() - start
+    stem.with_name(stem.name + ".json").write_text(json.dumps(result, ensure_ascii=False, indent=2, default=_plain),
+                                                    encoding="utf-8")
+    return result
+
+
+# Сценарии из файла или каталога
+def find_scenarios(source):
+    source = Path(source)
+    if source.is_file():
+        return [source]
+    return sorted(p for p in source.rglob("*") if p.suffix in SUFFIXES)
+
+
+# Пакетный запуск сценариев в пуле процессов
+def run_batch(source, out_dir, workers=None):
+    """
+    Выполняет все сценарии (*.json, *.toml) из каталога source в пуле из
+    workers процессов (по умолчанию по числу ядер) и пишет сводку
+    out_dir/summary.json.
+
+    Возвращает:
+    - список итогов run_scenario в порядке файлов
+
+    Исключения:
+    - ScenarioError, если у двух сценариев совпадают пути результатов
+      (например, a.json и a.toml в одном каталоге) или результат
+      сценария совпадает со сводкой
+    """
+    os.environ["MPLBACKEND"] = "Agg"  # наследуется процессами пула
+    paths = find_scenarios(source)
+    root = Path(source) if Path(source).is_dir() else Path(source).parent
+    stems = {Path(SUMMARY).with_suffix(""): SUMMARY}
+    for path in paths:
+        other = stems.setdefault(output_stem(path, root), path)
+        if other != path:
+            raise ScenarioError(f"{other} и {path}: совпадают имена файлов результатов")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        results = [run_scenario(path, out_dir, root) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            results = list(pool.map(run_scenario, paths, [out_dir] * len(paths), [root] * len(paths)))
+    summary = [{key: r.get(key) for key in ("scenario", "name", "model", "error", "seconds", "figures")}
+               for r in results]
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    (Path(out_dir) / SUMMARY).write_text(json.dumps(summary, ensure_ascii=False, indent=2),
+                                                encoding="utf-8")
+    return results
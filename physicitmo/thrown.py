@@ -0,0 +1,177 @@
+"""
+Движение тела, брошенного под углом к горизонту, с линейным сопротивлением
+воздуха (задание к лекциям 5-7). Состояние тела - (x, y, vx, vy).
+"""
+
+import numpy as np
+
+from .integrators import solve_dopri5
+
+g = 9.81  # ускорение свободного падения, м/с^2
+
+
+# Начальные состояния для набора бросков
+def initial_states(v0, theta, h0):
+    """
+    Параметры:
+    - v0: начальная скорость (м/с)
+    - theta: угол броска (в радианах)
+    - h0: начальная высота (м)
+    (скаляры или массивы, приводятся к общей форме (N,))
+
+    Возвращает:
+    - массив состояний формы (N, 4)
+    """
+    v0, theta, h0 = (np.ravel(a) for a in np.broadcast_arrays(v0, theta, h0))
+    state = np.empty((v0.size, 4))
+    state[:, 0] = 0
+    state[:, 1] = h0
+    state[:, 2] = v0 * np.cos(theta)
+    state[:, 3] = v0 * np.sin(theta)
+    return state
+
+
+# Правая часть системы уравнений сразу для всех бросков
+def drag_rhs(state, k, out):
+    """Записывает в out производные (vx, vy, -k*vx, -g - k*vy) для состояний формы (n, 4)."""
+    out[:, 0] = state[:, 2]
+    out[:, 1] = state[:, 3]
+    np.multiply(state[:, 2], k, out=out[:, 2])
+    np.negative(out[:, 2], out=out[:, 2])
+    np.multiply(state[:, 3], k, out=out[:, 3])
+    np.negative(out[:, 3], out=out[:, 3])
+    out[:, 3] -= g
+    return out
+
+
+# Метод Рунге-Кутты 4-го порядка для ансамбля бросков
+def ensemble_rk4(v0, theta, h0, k, dt=0.01, t_max=40.0):
+    """
+    Интегрирует N бросков одновременно, продвигая массив состояний (N, 4).
+
+    Все промежуточные массивы метода выделяются один раз. Бросок
+    выбывает из расчета на первом шаге, где y < 0 (как в runge_kutta_4th
+    из TheThrownObject.py), а активные броски уплотняются в начало
+    буферов, так что шаг стоит O(число еще летящих тел).
+
+    Параметры:
+    - v0, theta, h0, k: параметры бросков (скаляры или массивы, согласуются
+      по правилам broadcasting; theta в радианах, k - коэффициент сопротивления)
+    - dt: шаг времени
+    - t_max: предельное время расчета
+
+    Возвращает:
+    - t_land: время шага касания земли (np.nan, если тело не упало до t_max)
+    - state_land: состояние (x, y, vx, vy) на этом шаге (или на t_max)
+    - y_max: максимальная высота на траектории
+    """
+    try:
+        v0, theta, h0, k = np.broadcast_arrays(v0, theta, h0, k)
+    except ValueError:
+        raise ValueError("Параметры v0, theta, h0 и k должны иметь согласованную форму.") from None
+    state = initial_states(v0, theta, h0)
+    n = state.shape[0]
+    k = np.ravel(k).astype(np.float64)
+
+    t_land = np.full(n, np.nan)
+    state_land = np.empty((n, 4))
+    y_max = state[:, 1].copy()
+
+    ids = np.arange(n)  # номер броска в каждой активной позиции
+    kk = k.copy()
+    ymax_active = y_max.copy()
+    k1, k2, k3, k4, tmp = (np.empty_like(state) for _ in range(5))
+
+    n_steps = int(np.ceil(t_max / dt - 1e-9))
+    for step in range(1, n_steps + 1):
+        if not n:
+            break
+        s, kc = state[:n], kk[:n]
+        a, b, c, d, w = k1[:n], k2[:n], k3[:n], k4[:n], tmp[:n]
+
+        drag_rhs(s, kc, a)
+        np.multiply(a, dt / 2, out=w)
+        w += s
+        drag_rhs(w, kc, b)
+        np.multiply(b, dt / 2, out=w)
+        w += s
+        drag_rhs(w, kc, c)
+        np.multiply(c, dt, out=w)
+        w += s
+        drag_rhs(w, kc, d)
+
+        # y += dt/6 * (k1 + 2*k2 + 2*k3 + k4)
+        b += c
+        b *= 2
+        b += a
+        b += d
+        b *= dt / 6
+        s += b
+        np.maximum(ymax_active[:n], s[:, 1], out=ymax_active[:n])
+
+        landed = s[:, 1] < 0
+        if landed.any():
+            done = ids[:n][landed]
+            t_land[done] = step * dt
+            state_land[done] = s[landed]
+            y_max[done] = ymax_active[:n][landed]
+
+            keep = ~landed
+            m = int(keep.sum())
+            state[:m] = s[keep]
+            kk[:m] = kc[keep]
+            ids[:m] = ids[:n][keep]
+            ymax_active[:m] = ymax_active[:n][keep]
+            n = m
+
+    # Не упавшие до t_max
+    rest = ids[:n]
+    state_land[rest] = state[:n]
+    y_max[rest] = ymax_active[:n]
+    return t_land, state_land, y_max
+
+
+# Событие касания земли для solve_dopri5
+def ground_event(t, state):
+    """Высота тела: обращается в ноль при касании земли."""
+    return state[1]
+
+
+# Адаптивная замена runge_kutta_4th из TheThrownObject.py
+def dormand_prince(equations, y0, t, rtol=1e-8, atol=1e-10):
+    """
+    Тот же результат, что у runge_kutta_4th, но на заданной сетке t:
+    состояния в моменты t до падения на землю. Шаг выбирается автоматически
+    (метод Дормана-Принса 5(4)), состояния в моменты t берутся из плотной
+    выдачи, а последняя строка - точное состояние в момент касания земли
+    (y = 0), найденное поиском корня, а не первый шаг под землей.
+
+    Возвращает:
+    - массив состояний формы (n, 4)
+    """
+    t = np.asarray(t, dtype=np.float64)
+    sol = solve_dopri5(equations, (t[0], t[-1]), y0, rtol=rtol, atol=atol, event=ground_event)
+    if sol.t_event is None:
+        return sol(t)
+    return np.vstack((sol(t[t < sol.t_event]), sol.y_event))
+
+
+# Время полета и дальность одного броска
+def flight(v0, theta, h0, k, rtol=1e-8, atol=1e-10, t_max=1e4):
+    """
+    Интегрирует один бросок адаптивным методом до касания земли.
+
+    Возвращает:
+    - решение DenseSolution (t_event - время полета, y_event[0] - дальность)
+    """
+    def equations(t, y):
+        return [y[2], y[3], -k * y[2], -g - k * y[3]]
+
+    return solve_dopri5(equations, (0.0, t_max), initial_states(v0, theta, h0)[0],
+                        rtol=rtol, atol=atol, event=ground_event)
+
+
+# Условие остановки для rk4_chunks: первый шаг под землей
+def below_ground(t, state):
+    return state[1] < 0
+
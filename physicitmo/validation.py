@@ -0,0 +1,174 @@
+"""
+Правила проверки входных данных моделей, общие для ввода с клавиатуры
+в скриптах и для файлов сценариев (physicitmo.scenarios).
+
+Проверка - функция, которая принимает значение, возвращает его
+приведенным к нужному типу или бросает ValueError с текстом для
+пользователя. Скрипт описывает свои параметры списком PARAMETERS из
+троек (имя, приглашение, проверка): при интерактивном запуске значения
+запрашиваются функцией ask, в сценарии проверяются validate_params.
+
+numpy загружается только в проверках, которые его используют, чтобы
+скрипты без numpy (CartesianOrPolar.py) запускались без него.
+"""
+
+import math
+import numbers
+
+
+# Конечное число (bool в Python тоже int, но числом здесь не считается)
+def number(value):
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        raise ValueError("Нужно числовое значение.")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError("Нужно конечное числовое значение.")
+    return value
+
+
+def positive(value):
+    value = number(value)
+    if value <= 0:
+        raise ValueError("Значение должно быть положительным.")
+    return value
+
+
+def non_negative(value):
+    value = number(value)
+    if value < 0:
+        raise ValueError("Значение не может быть отрицательным.")
+    return value
+
+
+# Угол броска в градусах
+def angle(value):
+    value = number(value)
+    if value < 0 or value > 90:
+        raise ValueError("Угол должен быть между 0 и 90 градусами.")
+    return value
+
+
+def integer(value):
+    if float(number(value)) != int(value):
+        raise ValueError("Нужно целое число.")
+    return int(value)
+
+
+# Проверка выбора одного из вариантов
+def choice(*options):
+    def check(value):
+        if value not in options:
+            raise ValueError(f"Допустимые значения: {', '.join(map(str, options))}.")
+        return value
+
+    return check
+
+
+# Точка [x, y]
+def point(value):
+    import numpy as np
+
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError("Нужна пара чисел [x, y].")
+    return np.array([number(v) for v in value])
+
+
+def positive_integer(value):
+    value = integer(value)
+    if value <= 0:
+        raise ValueError("Нужно целое положительное число.")
+    return value
+
+
+def charge_count(value):
+    value = integer(value)
+    if value <= 0:
+        raise ValueError("Количество зарядов должно быть больше нуля.")
+    return value
+
+
+# Список зарядов [{q, x, y}, ...] -> [(q, (x, y)), ...], как в get_user_input скриптов
+def charges(value):
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("Нужен список зарядов {q, x, y}.")
+    charge_count(len(value))
+    result = []
+    for charge in value:
+        if not isinstance(charge, dict) or set(charge) != {"q", "x", "y"}:
+            raise ValueError(f"Заряд {charge!r} должен содержать ровно q, x, y.")
+        result.append((number(charge["q"]), (number(charge["x"]), number(charge["y"]))))
+    return result
+
+
+# Начальные положения двух квадратов в оболочке W x H
+def positions(pos1, pos2, s1, s2, W, H):
+    """
+    Квадраты должны целиком лежать внутри оболочки и не пересекаться
+    (расстояние между центрами не меньше суммы половин сторон).
+    """
+    def within_bounds(pos, s):
+        return (s / 2 <= pos[0] <= W - s / 2) and (s / 2 <= pos[1] <= H - s / 2)
+
+    if not within_bounds(pos1, s1):
+        raise ValueError(f"Позиция первого квадрата выходит за границы оболочки! {pos1}")
+    if not within_bounds(pos2, s2):
+        raise ValueError(f"Позиция второго квадрата выходит за границы оболочки! {pos2}")
+    if math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1]) < s1 / 2 + s2 / 2:
+        raise ValueError("Квадраты пересекаются!")
+
+
+# Запрос значения с клавиатуры до тех пор, пока оно не пройдет проверку
+def ask(prompt, check=number):
+    while True:
+        try:
+            value = float(input(prompt))
+        except ValueError:
+            print("Пожалуйста, введите числовое значение.")
+            continue
+        try:
+            return check(value)
+        except ValueError as e:
+            print(e)
+
+
+# Запрос всех параметров из списка PARAMETERS скрипта
+def ask_params(parameters):
+    return {name: ask(prompt, check) for name, prompt, check in parameters}
+
+
+# Проверка параметров из сценария
+def validate_params(parameters, params, optional=()):
+    """
+    Проверяет словарь params по списку PARAMETERS скрипта теми же
+    функциями, что и ввод с клавиатуры, и собирает все ошибки сразу.
+
+    Параметры:
+    - parameters: список (имя, приглашение, проверка)
+    - params: значения из сценария
+    - optional: необязательные параметры (имя, проверка, значение по умолчанию),
+      которых нет среди вопросов скрипта
+
+    Возвращает:
+    - словарь проверенных значений
+
+    Исключения:
+    - ValueError со списком ошибок в виде "имя: текст; имя: текст"
+    """
+    checked, errors = {}, []
+    checks = [(name, check, None, True) for name, _, check in parameters]
+    checks += [(name, check, default, False) for name, check, default in optional]
+    for name, check, default, required in checks:
+        if name not in params:
+            if required:
+                errors.append(f"{name}: параметр не задан")
+            else:
+                checked[name] = default
+            continue
+        try:
+            checked[name] = check(params[name])
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+    errors += [f"{name}: неизвестный параметр" for name in sorted(set(params) - {c[0] for c in checks})]
+    if errors:
+        raise ValueError("; ".join(errors))
+    return checked
@@ -0,0 +1,21 @@
+import pytest
+
+from physicitmo.oscillator import SOLVERS, auto_dt, energy_drift, simulate
+
+CASES = [(1.0, 4.0, 0.0), (2.0, 1.0, 0.1), (1.0, 4.0, 0.2), (0.5, 10.0, 1.0), (1.0, 1.0, 0.0)]
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("m, k, b", CASES)
+@pytest.mark.parametrize("tol", [1e-3, 1e-2])
+def test_auto_dt_keeps_energy_error_within_tol(solver, m, k, b, tol):
+    t_end = 5.0
+    dt = auto_dt(m, k, b, solver, tol=tol, t_end=t_end)
+    t, x, v = simulate(m, k, b, 1.0, 0.5, t_end, dt, solver=solver)
+    assert energy_drift(m, k, b, 1.0, 0.5, t, x, v)["max_rel_error"] <= tol
+
+
+@pytest.mark.parametrize("solver", ["euler", "recurrence"])
+def test_auto_dt_euler_needs_t_end(solver):
+    with pytest.raises(ValueError):
+        auto_dt(1.0, 4.0, 0.0, solver)
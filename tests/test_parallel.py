@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from physicitmo.electrostatics import charge_grid, field_and_potential, parallel_field
+
+
+@pytest.fixture(scope="module")
+def charges():
+    rng = np.random.default_rng(1)
+    return rng.normal(size=300), rng.random(300) * 5, rng.random(300) * 5
+
+
+@pytest.mark.parametrize("tile_points", [1 << 18, 10000, 4096, 1])
+@pytest.mark.parametrize("resolution", [97, 150])
+def test_parallel_matches_serial_bitwise(charges, tile_points, resolution):
+    q, cx, cy = charges
+    X, Y = charge_grid(cx, cy, resolution=resolution)
+    expected = field_and_potential(q, cx, cy, X, Y)
+    result = parallel_field(q, cx, cy, X, Y, workers=2, tile_points=tile_points)
+    for a, b in zip(expected, result):
+        assert np.array_equal(a, b)
+
+
+def test_parallel_out_is_checked(charges):
+    q, cx, cy = charges
+    X, Y = charge_grid(cx, cy, resolution=50)
+    with pytest.raises(ValueError):
+        parallel_field(q, cx, cy, X, Y, workers=1, out=tuple(np.zeros(X.shape, np.float32) for _ in range(3)))
+    out = tuple(np.zeros(X.shape) for _ in range(3))
+    assert parallel_field(q, cx, cy, X, Y, workers=1, out=out)[0] is out[0]
@@ -0,0 +1,36 @@
+import builtins
+
+import pytest
+
+from physicitmo import validation
+
+NON_FINITE = ["inf", "-inf", "nan", "1e400"]
+
+
+@pytest.mark.parametrize("text", NON_FINITE)
+@pytest.mark.parametrize("check", [validation.number, validation.integer, validation.charge_count,
+                                   validation.positive_integer])
+def test_non_finite_rejected(text, check):
+    with pytest.raises(ValueError, match="конечное"):
+        check(float(text))
+
+
+@pytest.mark.parametrize("text", NON_FINITE)
+def test_ask_repeats_on_non_finite(monkeypatch, capsys, text):
+    replies = iter([text, "3"])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(replies))
+    assert validation.ask("n: ", validation.charge_count) == 3
+    assert "Нужно конечное числовое значение." in capsys.readouterr().out
+
+
+def test_validate_params_reports_non_finite():
+    parameters = [("precision", "", validation.integer), ("x", "", validation.number)]
+    with pytest.raises(ValueError) as error:
+        validation.validate_params(parameters, {"precision": float("inf"), "x": float("nan")})
+    assert str(error.value) == "precision: Нужно конечное числовое значение.; x: Нужно конечное числовое значение."
+
+
+def test_number_rejects_bool_and_strings():
+    for value in (True, "1", None):
+        with pytest.raises(ValueError):
+            validation.number(value)